@@ -0,0 +1,266 @@
+"""
+Request analytics for the admin dashboard.
+
+``HitRecordingMiddleware`` counts public API requests, and the page-view
+beacon (``POST /api/analytics/hit/``) counts frontend page views. Neither
+writes to the database on the request path: a hit is one ``Counter``
+increment under a lock in this process (``hit_buffer``).
+
+A daemon thread per gunicorn worker (``hit_buffer.start()``, called from
+the ``post_worker_init`` hook) flushes the buffer into ``DailyHits`` rollup
+rows every ``ANALYTICS_FLUSH_INTERVAL`` seconds, or sooner once
+``ANALYTICS_FLUSH_THRESHOLD`` hits are waiting. Each flush costs three
+queries, however many hits it carries:
+
+    1. ``bulk_create(ignore_conflicts=True)`` creates missing rows with 0 hits
+    2. one SELECT fetches the rows of the flushed keys
+    3. ``bulk_update`` adds the counts as ``hits = hits + n``
+
+Because step 3 adds to the stored value instead of replacing it, workers
+flushing the same day's rows concurrently never lose each other's counts.
+A failed flush puts its counts back into the buffer for the next attempt;
+the ``worker_exit`` hook flushes the buffer when the worker exits. Other
+processes (tests, management commands, ``runserver``) only buffer their hits
+unless they call ``hit_buffer.start()`` themselves.
+
+``AnalyticsView`` reads the monthly and daily trends from the rollups
+(``visit_trends``). Hits still buffered in a worker show up after its next
+flush.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import DailyHits
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 30)
+FLUSH_THRESHOLD = getattr(settings, 'ANALYTICS_FLUSH_THRESHOLD', 1000)
+
+# Rows per bulk_create/bulk_update statement.
+BATCH_SIZE = 500
+
+
+# =============================================================================
+# HIT BUFFER
+# =============================================================================
+
+class HitBuffer:
+    """Per-process hit counts waiting to be written to ``DailyHits``."""
+
+    def __init__(self):
+        self._counts = Counter()  # (day, kind, name) -> hits
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None  # process that runs the flusher
+        self._day = None
+        self._day_ends = 0.0  # epoch time of the next local midnight
+
+    def record(self, kind, name):
+        """Count one hit. Costs a dictionary update; the flusher does the writes."""
+        key = (self._today(), kind, name)
+        with self._lock:
+            self._counts[key] += 1
+            self._pending += 1
+            pending = self._pending
+        if pending >= FLUSH_THRESHOLD:
+            self._wake.set()
+
+    def _today(self):
+        # timezone.localdate() takes ~10 µs (time zone conversion); the day
+        # only changes at midnight.
+        if time.time() >= self._day_ends:
+            now = timezone.localtime()
+            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            self._day, self._day_ends = now.date(), midnight.timestamp()
+        return self._day
+
+    def drain(self):
+        """Take the buffered counts (``{(day, kind, name): hits}``), leaving the buffer empty."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pending = 0
+        return counts
+
+    def flush(self):
+        """Write the buffered counts to the rollups. Returns the number of hits written."""
+        counts = self.drain()
+        if not counts:
+            return 0
+        try:
+            write_rollups(counts)
+        except Exception:
+            logger.exception("Flushing %d analytics rows failed; will retry", len(counts))
+            with self._lock:
+                self._counts.update(counts)
+                self._pending += sum(counts.values())
+            return 0
+        return sum(counts.values())
+
+    def start(self):
+        """Start this process's flusher thread (once per process)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='analytics-flusher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+
+hit_buffer = HitBuffer()
+
+
+def write_rollups(counts):
+    """
+    Add ``{(day, kind, name): hits}`` to the ``DailyHits`` rows, in three queries.
+
+    See the module docstring for why the counts are added in the database.
+    """
+    with transaction.atomic():
+        DailyHits.objects.bulk_create(
+            [DailyHits(day=day, kind=kind, name=name) for day, kind, name in counts],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+        rows = DailyHits.objects.filter(
+            day__in={day for day, _, _ in counts},
+            kind__in={kind for _, kind, _ in counts},
+            name__in={name for _, _, name in counts},
+        ).only('day', 'kind', 'name')
+        updated = []
+        for row in rows:
+            hits = counts.get((row.day, row.kind, row.name))
+            if hits:
+                row.hits = F('hits') + hits
+                updated.append(row)
+        DailyHits.objects.bulk_update(updated, ['hits'], batch_size=BATCH_SIZE)
+
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+class HitRecordingMiddleware:
+    """
+    Count successful anonymous GET/HEAD requests to the API, per URL name.
+
+    Requests with an ``Authorization`` header (staff using the admin panel),
+    URLs outside ``api/`` (Django admin, static files) and the live status
+    event stream (a connection, not a page view) are not counted.
+
+    Works as sync and as async middleware, so under ASGI it does not make
+    Django switch threads around it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    # URL names that are not counted.
+    IGNORED_URL_NAMES = {'livestream_events'}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.count(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.count(request, response)
+        return response
+
+    def count(self, request, response):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or response.status_code >= 400
+            or 'HTTP_AUTHORIZATION' in request.META
+        ):
+            return
+        match = request.resolver_match
+        if (
+            match is not None and match.url_name and match.route.startswith('api/')
+            and match.url_name not in self.IGNORED_URL_NAMES
+        ):
+            hit_buffer.record(DailyHits.ENDPOINT, match.url_name)
+
+
+# =============================================================================
+# TRENDS
+# =============================================================================
+
+def visit_trends(months=6, days=30):
+    """
+    Monthly and daily traffic from the rollups, in one query.
+
+    Every month and day of the range is listed, with zeros where nothing was
+    recorded.
+
+    Args:
+        months: Calendar months to include, the current one last
+        days: Days to include, today last
+
+    Returns:
+        ``(monthly, daily)`` lists of
+        ``{'name': label, 'visits': page views, 'requests': API requests}``;
+        daily entries also carry the ISO ``date``
+    """
+    today = timezone.localdate()
+    first_month = today.replace(day=1)
+    for _ in range(months - 1):
+        first_month = (first_month - timedelta(days=1)).replace(day=1)
+    first_day = today - timedelta(days=days - 1)
+
+    totals = Counter()
+    rows = (DailyHits.objects.filter(day__gte=min(first_month, first_day), day__lte=today)
+            .order_by().values_list('day', 'kind').annotate(total=Sum('hits')))
+    for day, kind, total in rows:
+        totals[day, kind] = total
+
+    month_totals = Counter()
+    for (day, kind), total in totals.items():
+        if day >= first_month:
+            month_totals[day.year, day.month, kind] += total
+    monthly = []
+    month = first_month
+    while month <= today:
+        monthly.append({
+            'name': month.strftime('%b'),
+            'visits': month_totals[month.year, month.month, DailyHits.PAGE],
+            'requests': month_totals[month.year, month.month, DailyHits.ENDPOINT],
+        })
+        month = (month + timedelta(days=32)).replace(day=1)
+
+    daily = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        daily.append({
+            'name': day.strftime('%b %d'),
+            'date': day.isoformat(),
+            'visits': totals[day, DailyHits.PAGE],
+            'requests': totals[day, DailyHits.ENDPOINT],
+        })
+    return monthly, daily
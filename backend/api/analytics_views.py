@@ -1,41 +1,77 @@
+import re
+
+from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .models import Event, Sermon, Ministry, Leadership, ContactMessage
-import random
-from datetime import datetime, timedelta
+from .analytics import hit_buffer, visit_trends
+from .counters import counter_values, period_changes
+from .models import DailyHits
+from .views import PageViewRateThrottle
+
+# Page paths accepted by the page-view beacon (bounds the rollup table).
+_page_path_re = re.compile(r'^/[a-z0-9/_-]{0,99}$')
+
+
+class PageViewView(APIView):
+    """
+    Page-view beacon for the frontend router.
+
+    POST /api/analytics/hit/ {"path": "/sermons"} -> 204
+
+    The view is only counted in memory (``api/analytics.py``); nothing is
+    written to the database on this request.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [PageViewRateThrottle]
+
+    def post(self, request):
+        path = str(request.data.get('path', '')).split('?')[0].split('#')[0].lower()
+        if path != '/':
+            path = path.rstrip('/')
+        if not _page_path_re.match(path):
+            return Response({'path': 'Invalid page path.'}, status=status.HTTP_400_BAD_REQUEST)
+        hit_buffer.record(DailyHits.PAGE, path)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-import traceback
-import sys
 
 class AnalyticsView(APIView):
+    """
+    Admin dashboard data.
+
+    Counts come from the incrementally maintained counters
+    (``api/counters.py``, one query) and ``change`` compares them with the
+    snapshot from 30 days ago; trends come from the request rollups
+    (``api/analytics.py``). Staff only. The request only reads:
+    ``reconcile_counters`` stores the daily snapshots.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
     def get(self, request):
-        # Real statistics
-        total_events = Event.objects.count()
-        total_sermons = Sermon.objects.count()
-        total_ministries = Ministry.objects.count()
-        total_leadership = Leadership.objects.count()
-        total_inquiries = ContactMessage.objects.count()
-        unread_inquiries = ContactMessage.objects.filter(is_read=False).count()
-
-        # Simulated trend data (for demonstration)
-        months = []
-        for i in range(5, -1, -1):
-            date = datetime.now() - timedelta(days=i*30)
-            months.append(date.strftime('%b'))
-
-        visitor_trends = [
-            {'name': month, 'visits': random.randint(1500, 3000)}
-            for month in months
-        ]
+        counts = counter_values()
+        changes = period_changes(counts)
+        total_events = counts['events']
+        total_sermons = counts['sermons']
+        total_ministries = counts['ministries']
+        total_inquiries = counts['inquiries'] + counts['archived_inquiries']  # inbox and archive
+        unread_inquiries = counts['unread_inquiries']
+
+        # Page views and API requests from the daily rollups
+        visitor_trends, daily_trends = visit_trends()
+
+        def stat(label, name, kind):
+            change, positive = changes[name]
+            return {'label': label, 'value': str(counts[name]), 'change': change, 'isPositive': positive, 'type': kind}
 
         data = {
             'stats': [
-                { 'label': 'Total Events', 'value': str(total_events), 'change': '+2%', 'isPositive': True, 'type': 'event' },
-                { 'label': 'Total Sermons', 'value': str(total_sermons), 'change': '+5%', 'isPositive': True, 'type': 'sermon' },
-                { 'label': 'Ministries', 'value': str(total_ministries), 'change': '0%', 'isPositive': True, 'type': 'ministry' },
+                stat('Total Events', 'events', 'event'),
+                stat('Total Sermons', 'sermons', 'sermon'),
+                stat('Ministries', 'ministries', 'ministry'),
                 { 'label': 'New Inquiries', 'value': str(unread_inquiries), 'change': f'/{total_inquiries} total', 'isPositive': unread_inquiries > 0, 'type': 'message' },
             ],
             'visitorTrends': visitor_trends,
+            'dailyTrends': daily_trends,
             'contentDistribution': [
                 {'name': 'Events', 'value': total_events},
                 {'name': 'Sermons', 'value': total_sermons},
@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        # Connect cache invalidation handlers
+        from . import signals
+        signals.connect_signals()
+        # Keep the dashboard's content counters current
+        from .counters import connect_signals
+        connect_signals()
+        # Restore full-text triggers that SQLite table rebuilds drop
+        from .search import install_search_indexes
+        post_migrate.connect(install_search_indexes, sender=self)
@@ -0,0 +1,156 @@
+"""
+Archival of old contact messages (hot/cold split of the inbox).
+
+Staff work on recent messages, but ``ContactMessage`` only grows, and the
+inbox query and the table's four indexes grow with it. Read messages older
+than ``CONTACT_ARCHIVE_AFTER_DAYS`` are therefore moved into
+``ArchivedContactMessage``, which has the same columns and one index. This
+keeps the hot table about the size of the working set. Each batch is one
+transaction:
+
+    1. SELECT up to BATCH_SIZE messages, oldest first (FOR UPDATE)
+    2. INSERT them into the archive with one multi-row INSERT
+    3. DELETE them from ContactMessage by id, with one statement
+    4. move them from the inbox counters to ``archived_inquiries``, counted
+       from the rows selected in step 1
+
+A message is therefore always in exactly one of the two tables, and a batch
+only holds its locks briefly. Run ``python manage.py
+archive_contact_messages`` from cron. When ``CONTACT_ARCHIVE_RETENTION_DAYS``
+is set, the command also deletes archived messages older than that
+(``prune``), also with one DELETE per batch. Staff can archive a selection at once with the ``archive``
+bulk action (``api/inbox.py``).
+
+The inbox lists archived messages only when asked with
+``?include_archived=true`` (``merged_inbox``): one UNION ALL of the two
+filtered tables. The ``ContactMessage`` content version covers both tables,
+so every archive operation bumps it.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, Value
+from django.utils import timezone
+
+from .counters import adjust, counted_rows
+from .models import ArchivedContactMessage, ContactMessage
+
+# Read messages are archived this many days after they were sent.
+ARCHIVE_AFTER_DAYS = getattr(settings, 'CONTACT_ARCHIVE_AFTER_DAYS', 180)
+# Archived messages are deleted this many days after they were sent (0: never).
+RETENTION_DAYS = getattr(settings, 'CONTACT_ARCHIVE_RETENTION_DAYS', 0)
+
+# Messages per transaction.
+BATCH_SIZE = 500
+
+# Columns copied into the archive: every ContactMessage column.
+FIELDS = [field.attname for field in ContactMessage._meta.concrete_fields]
+
+
+def _invalidate():
+    # Not at module level: signals imports the serializers, which import the inbox.
+    from .signals import invalidate
+
+    invalidate(ContactMessage)
+
+
+def archivable(days=ARCHIVE_AFTER_DAYS):
+    """Read messages sent more than ``days`` days ago."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return ContactMessage.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def expired_archive(days=RETENTION_DAYS):
+    """Archived messages sent more than ``days`` days ago."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return ArchivedContactMessage.objects.filter(created_at__lt=cutoff)
+
+
+# =============================================================================
+# ARCHIVING
+# =============================================================================
+
+def move_batch(queryset, limit=BATCH_SIZE):
+    """
+    Move up to ``limit`` messages of ``queryset``, oldest first, into the archive.
+
+    Runs in the caller's transaction.
+
+    Returns:
+        Number of messages moved
+    """
+    rows = list(queryset.order_by('created_at', 'id').select_for_update().values(*FIELDS)[:limit])
+    if not rows:
+        return 0
+    now = timezone.now()
+    ArchivedContactMessage.objects.bulk_create([ArchivedContactMessage(archived_at=now, **row) for row in rows])
+    # Not QuerySet.delete(): the counter handlers' post_delete would make it
+    # load and delete the messages one by one. Neither statement sends signals.
+    ContactMessage.objects.filter(pk__in=[row['id'] for row in rows])._raw_delete(queryset.db)
+    deltas = {name: -count for name, count in counted_rows(ContactMessage, rows).items()}
+    adjust({**deltas, **counted_rows(ArchivedContactMessage, rows)})
+    return len(rows)
+
+
+def archive(queryset, batch_size=BATCH_SIZE):
+    """
+    Move every message of ``queryset`` into the archive, one transaction per batch.
+
+    Returns:
+        Number of messages moved
+    """
+    moved = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            count = move_batch(queryset, batch_size)
+            if count:
+                transaction.on_commit(_invalidate, using=queryset.db)
+        moved += count
+        if count < batch_size:
+            return moved
+
+
+def prune(days=RETENTION_DAYS, batch_size=BATCH_SIZE):
+    """
+    Delete archived messages sent more than ``days`` days ago, one transaction per batch.
+
+    Returns:
+        Number of messages deleted
+    """
+    expired = expired_archive(days).order_by('created_at', 'id')
+    deleted = 0
+    while True:
+        with transaction.atomic(using=expired.db):
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            count = ArchivedContactMessage.objects.filter(pk__in=ids)._raw_delete(expired.db) if ids else 0
+            if count:
+                adjust({'archived_inquiries': -count})
+                transaction.on_commit(_invalidate, using=expired.db)
+        deleted += count
+        if len(ids) < batch_size:
+            return deleted
+
+
+# =============================================================================
+# READS
+# =============================================================================
+
+def merged_inbox(messages, archived):
+    """
+    Filtered inbox and archive querysets as one list, with UNION ALL.
+
+    The union is ordered like ``messages`` (``?ordering=`` or the model
+    ordering), with the id as tiebreaker. Rows are dicts with the
+    ``ArchivedContactMessage`` fields; ``archived_at`` is None for messages
+    still in the inbox.
+    """
+    ordering = list(messages.query.order_by or ContactMessage._meta.ordering)
+    if not {'id', '-id', 'pk', '-pk'}.intersection(ordering):
+        ordering.append('-id')
+    hot = messages.order_by().annotate(
+        archived_at=Value(None, output_field=DateTimeField())
+    ).values(*FIELDS, 'archived_at')
+    cold = archived.order_by().values(*FIELDS, 'archived_at')
+    return hot.union(cold, all=True).order_by(*ordering)
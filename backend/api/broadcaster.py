@@ -0,0 +1,143 @@
+"""
+In-process broadcaster for live stream status (Server-Sent Events).
+
+Every open Live page used to poll ``/api/livestream/``. With the event
+stream (see ``api/stream_views.py``) each ASGI worker process runs a single
+watcher task that checks the LiveStream content version (one shared-cache
+lookup per ``POLL_INTERVAL``) and re-renders the status only when it has
+changed. The rendered payload is fanned out to every connected client of
+that process, so the number of cache lookups and queries does not depend on
+the number of open tabs.
+
+Saves in the same process wake the watcher immediately (``notify()`` is
+called from ``api/signals.py``). Saves in other processes are picked up by
+the version check at the next poll.
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from .cache import get_versions
+from .models import LiveStream
+from .renderers import FastJSONRenderer
+from .serializers import LiveStreamSerializer
+from .singletons import live_streams
+
+logger = logging.getLogger(__name__)
+
+# Seconds between content-version checks while clients are connected.
+POLL_INTERVAL = 2.0
+# Seconds of silence after which subscribers get a keep-alive tick.
+KEEPALIVE_INTERVAL = 15.0
+
+
+def render_live_streams():
+    """Serialize all stream configurations exactly like ``/api/livestream/`` results."""
+    try:
+        data = LiveStreamSerializer(live_streams.get(), many=True).data
+        return FastJSONRenderer().render(data).decode()
+    finally:
+        close_old_connections()
+
+
+class LiveStreamBroadcaster:
+    """
+    Fans out live stream status changes to all subscribers of this process.
+
+    The watcher task only runs while at least one client is subscribed.
+    All state is owned by the event loop, and ``notify()`` is the only
+    method that may be called from other threads.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL, keepalive_interval=KEEPALIVE_INTERVAL):
+        self.poll_interval = poll_interval
+        self.keepalive_interval = keepalive_interval
+        self.payload = None
+        self.sequence = 0
+        self._version = None
+        self._subscribers = 0
+        self._loop = None
+        self._task = None
+        self._changed = None
+        self._wake = None
+
+    @property
+    def subscriber_count(self):
+        return self._subscribers
+
+    def notify(self):
+        """Wake the watcher now (thread-safe; no-op when nobody is subscribed)."""
+        loop = self._loop
+        if self._subscribers and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+    async def subscribe(self):
+        """
+        Yield the current status payload, then every change.
+
+        Yields ``None`` after ``keepalive_interval`` seconds without a change
+        so the caller can send a keep-alive and notice closed connections.
+        """
+        self._subscribers += 1
+        self._ensure_watcher()
+        seen = 0
+        try:
+            while True:
+                payload = None
+                async with self._changed:
+                    try:
+                        async with asyncio.timeout(self.keepalive_interval):
+                            await self._changed.wait_for(
+                                lambda: self.payload is not None and self.sequence != seen
+                            )
+                        seen, payload = self.sequence, self.payload
+                    except TimeoutError:
+                        pass
+                yield payload
+        finally:
+            self._subscribers -= 1
+
+    def _ensure_watcher(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._changed = asyncio.Condition()
+            self._wake = asyncio.Event()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._watch())
+
+    async def _watch(self):
+        while self._subscribers:
+            try:
+                await self._refresh()
+            except Exception:
+                logger.exception("Live stream status refresh failed")
+            try:
+                async with asyncio.timeout(self.poll_interval):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+            self._wake.clear()
+        # Nobody is listening: the payload goes stale from here on, so the
+        # next subscriber waits for a fresh render instead of receiving it.
+        self.payload = None
+        self._version = None
+
+    async def _refresh(self):
+        (version,) = await sync_to_async(get_versions)(LiveStream)
+        if version == self._version and self.payload is not None:
+            return
+        payload = await sync_to_async(render_live_streams)()
+        self._version = version
+        if payload != self.payload:
+            async with self._changed:
+                self.payload = payload
+                self.sequence += 1
+                self._changed.notify_all()
+
+
+broadcaster = LiveStreamBroadcaster()
@@ -0,0 +1,122 @@
+"""
+Page bundle endpoints for the New Gate Chapel API.
+
+Each public page used to fan out into several parallel API calls (the Home
+page alone fetched live stream, church info, home features and events).
+A bundle view returns everything a page needs in one response, built from
+the existing serializers, so each visit pays for one request, one throttle
+check and one cache lookup instead of four.
+
+Bundles are cached in the content-version namespace of all their member
+models, so a change to any member invalidates the bundle. Church info and
+live stream rows come from the in-process singleton caches
+(``api/singletons.py``), so rebuilding a bundle only queries the lists.
+
+API Endpoints:
+    /api/bundles/home/ - Live stream, church info, home features, latest events
+    /api/bundles/about/ - Values, leadership, church info
+    /api/bundles/giving/ - Giving options, church info
+"""
+
+from collections import namedtuple
+
+from django.utils.decorators import method_decorator
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import cache_response, conditional_get
+from .models import ChurchInfo, Event, GivingOption, HomeFeature, LiveStream, Leadership, Value
+from .singletons import church_info, live_streams
+from .serializers import (
+    ChurchInfoSerializer, EventSerializer, GivingOptionSerializer, HomeFeatureSerializer,
+    LeadershipSerializer, LiveStreamSerializer, ValueSerializer
+)
+
+
+BundleMember = namedtuple('BundleMember', ['key', 'queryset', 'serializer_class', 'limit'])
+BundleMember.__new__.__defaults__ = (None,)
+
+# Shared by every page that shows the hero, footer or giving copy.
+CHURCH_INFO = BundleMember('church_info', ChurchInfo.objects.all(), ChurchInfoSerializer)
+
+
+# Members served from process memory instead of their queryset.
+SINGLETON_SOURCES = {
+    ChurchInfo: lambda: [church_info.get()],
+    LiveStream: lambda: list(live_streams.get()),
+}
+
+
+def bundle_models(members):
+    """Return the distinct models a bundle is built from, in member order."""
+    return tuple(dict.fromkeys(member.queryset.model for member in members))
+
+
+class PageBundleView(APIView):
+    """
+    Base view that serializes a fixed set of resources into one response.
+
+    Subclasses declare ``members`` and decorate ``get`` with the caching
+    decorators for ``bundle_models(members)``. Every member is returned as
+    a plain list, matching the unpaginated shape the pages already handle.
+    """
+    permission_classes = [permissions.AllowAny]
+    members = ()
+
+    def get_member_data(self, member):
+        """Serialize one bundle member."""
+        source = SINGLETON_SOURCES.get(member.queryset.model)
+        objects = source() if source is not None else member.queryset.all()
+        if member.limit is not None:
+            objects = objects[:member.limit]
+        serializer = member.serializer_class(objects, many=True, context={'request': self.request})
+        return serializer.data
+
+    def get(self, request, *args, **kwargs):
+        return Response({member.key: self.get_member_data(member) for member in self.members})
+
+
+class HomeBundleView(PageBundleView):
+    """Everything the Home page renders: live banner, hero, features, latest 3 events."""
+    members = (
+        BundleMember('livestream', LiveStream.objects.all(), LiveStreamSerializer),
+        CHURCH_INFO,
+        BundleMember('home_features', HomeFeature.objects.all(), HomeFeatureSerializer),
+        BundleMember('events', Event.objects.all(), EventSerializer, limit=3),
+    )
+    models = bundle_models(members)
+
+    @method_decorator(conditional_get(*models))
+    @method_decorator(cache_response(60 * 60 * 6, *models))  # Cache for 6 hours
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class AboutBundleView(PageBundleView):
+    """Everything the About page renders: core values, leadership, church story."""
+    members = (
+        BundleMember('values', Value.objects.all(), ValueSerializer),
+        BundleMember('leadership', Leadership.objects.all(), LeadershipSerializer),
+        CHURCH_INFO,
+    )
+    models = bundle_models(members)
+
+    @method_decorator(conditional_get(*models))
+    @method_decorator(cache_response(60 * 60 * 24, *models))  # Cache for 24 hours
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class GivingBundleView(PageBundleView):
+    """Everything the Giving page renders: giving options and giving copy."""
+    members = (
+        BundleMember('giving_options', GivingOption.objects.all(), GivingOptionSerializer),
+        CHURCH_INFO,
+    )
+    models = bundle_models(members)
+
+    @method_decorator(conditional_get(*models))
+    @method_decorator(cache_response(60 * 60 * 24, *models))  # Cache for 24 hours
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,480 @@
+"""
+Response caching helpers for the New Gate Chapel API.
+
+Cached API responses are namespaced by a per-model *content version*. Every
+save or delete of a model bumps its version (see ``api/signals.py``), which
+moves all cached responses built from that model into a fresh key namespace.
+Old entries are never read again and simply age out of the cache, so TTLs
+can be long without staff edits going stale.
+
+Versions are millisecond timestamps rather than plain counters: if a version
+key is evicted, it is re-initialised to "now", which is always newer than any
+version a cached response could have been stored under.
+
+Within a version, entries have a soft and a hard TTL (stale-while-revalidate):
+after the soft TTL the stale body is still served instantly while a single
+background refresh re-renders it; only after the hard TTL is it dropped.
+
+Entries store the rendered body together with gzip/brotli variants (see
+``api/compression.py``), so a hit costs neither JSON encoding nor
+compression: the variant matching ``Accept-Encoding`` is sent as is.
+
+The same versions drive conditional GET: ``conditional_get`` derives an
+ETag and a Last-Modified date from them, so ``If-None-Match`` and
+``If-Modified-Since`` can be answered with 304 before any query or
+serialization runs. This also covers models without ``updated_at`` fields.
+
+Paginated list counts are cached under the same versions (``cached_count``),
+keyed by the SQL of the filtered queryset.
+
+Usage:
+    @method_decorator(conditional_get(Event))
+    @method_decorator(cache_response(60 * 60 * 6, Event))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+"""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+
+from .compression import apply_encoding, compress_variants
+
+
+KEY_PREFIX = getattr(settings, 'CACHE_MIDDLEWARE_KEY_PREFIX', 'newgate')
+
+# Part of every response key; bump when the layout of cached entries changes
+# so a deploy never reads entries written by the previous release.
+RESPONSE_FORMAT = 3
+
+# WSGI environ flag marking an internal stale-while-revalidate refresh.
+# Not an HTTP_* key, so clients cannot set it.
+REFRESH_FLAG = 'newgate.cache_refresh'
+
+# Response headers worth replaying on a cache hit. Everything else (Vary,
+# Allow, CORS, ...) is re-added by DRF and the middleware stack.
+CACHED_HEADERS = ('Content-Type', 'Content-Language')
+
+
+# =============================================================================
+# CONTENT VERSIONS
+# =============================================================================
+
+def _version_key(model):
+    """Cache key holding the content version of ``model``."""
+    return f"{KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def get_versions(*models):
+    """
+    Return the current content versions of ``models`` as a list of ints.
+
+    Missing versions are initialised to the current time so that the
+    namespace can only ever move forward.
+    """
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _now_ms()
+            # add() keeps a value another worker may have set concurrently.
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+def request_versions(request, models):
+    """
+    Return the content versions of ``models``, memoized on ``request``.
+
+    ``conditional_get`` and ``cache_response`` both need the versions, so a
+    stacked pair only reads them from the cache once.
+    """
+    memo = request.__dict__.setdefault('_content_versions', {})
+    missing = [model for model in models if model not in memo]
+    if missing:
+        memo.update(zip(missing, get_versions(*missing)))
+    return [memo[model] for model in models]
+
+
+def bump_version(model):
+    """
+    Move ``model`` to a new content version.
+
+    Invalidates every cached response that was built from ``model``.
+    """
+    key = _version_key(model)
+    current = cache.get(key) or 0
+    version = max(_now_ms(), current + 1)
+    cache.set(key, version, None)
+    return version
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+def response_cache_key(request, models, vary=None):
+    """
+    Build the cache key for ``request`` within the namespace of ``models``.
+
+    The absolute URI is hashed (not just the path) because serializers embed
+    absolute image URLs built from the request host. ``vary`` is an optional
+    callable returning an extra key part for the request.
+    """
+    versions = '.'.join(str(version) for version in request_versions(request, models))
+    uri = request.build_absolute_uri()
+    if vary is not None:
+        uri = f"{uri}#{vary(request)}"
+    url = hashlib.md5(uri.encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}:response{RESPONSE_FORMAT}:{request.method}:{versions}:{url}"
+
+
+def _freeze(response):
+    """Reduce a rendered response to a picklable tuple, with compressed variants."""
+    headers = {
+        header: response[header]
+        for header in CACHED_HEADERS
+        if response.has_header(header)
+    }
+    content = response.content
+    return (response.status_code, content, headers, compress_variants(content))
+
+
+def _thaw(frozen, request):
+    """Rebuild an ``HttpResponse`` from a frozen tuple, encoded for ``request``."""
+    status, content, headers, variants = frozen
+    response = HttpResponse(content, status=status)
+    for header, value in headers.items():
+        response[header] = value
+    return apply_encoding(response, request, variants)
+
+
+def cache_response(timeout, *models, stale_timeout=None, vary=None):
+    """
+    Cache successful GET/HEAD responses in the content-version namespace of ``models``.
+
+    A drop-in replacement for ``cache_page`` on viewset actions. The cached
+    entry is invalidated as soon as any of ``models`` is saved or deleted.
+
+    Misses are single-flight: the first request takes the rebuild lock and
+    renders the response, concurrent requests (in any worker) wait for its
+    result instead of running the same queries. The lock is released once
+    the response has been rendered and stored.
+
+    Entries are fresh for ``timeout`` seconds, then served stale for up to
+    ``stale_timeout`` more while one background refresh re-renders them, so
+    TTL expiry never puts a rebuild on a visitor's request path.
+
+    Args:
+        timeout: Soft TTL in seconds
+        *models: Models whose content the response is built from
+        stale_timeout: Seconds a stale entry may still be served
+            (default: ``timeout``)
+        vary: Callable returning an extra cache key part for a request, for
+            responses that depend on more than the URL (e.g. today's date,
+            ``api.filters.date_cache_key``)
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = response_cache_key(request, models, vary)
+            refreshing = request.META.get(REFRESH_FLAG, False)
+            lock = None
+            if not refreshing:
+                entry = cache.get(key)
+                if entry is not None:
+                    frozen, fresh_until = entry
+                    if time.time() >= fresh_until:
+                        _refresh_stale(request, key)
+                    return _thaw(frozen, request)
+
+                lock = acquire_rebuild_lock(key)
+                if lock is None:
+                    entry = wait_for_rebuild(key)
+                    if entry is not None:
+                        return _thaw(entry[0], request)
+
+            try:
+                response = view_func(request, *args, **kwargs)
+            except BaseException:
+                release_rebuild_lock(lock)
+                raise
+            if response.status_code != 200 or response.streaming:
+                release_rebuild_lock(lock)
+                return response
+
+            def _store(rendered):
+                frozen = _freeze(rendered)
+                cache.set(key, (frozen, time.time() + timeout), timeout + stale_timeout)
+                release_rebuild_lock(lock)
+                # Send the freshly compressed variant on this response too.
+                apply_encoding(rendered, request, frozen[3])
+
+            if callable(getattr(response, 'render', None)) and not response.is_rendered:
+                response.add_post_render_callback(_store)
+            else:
+                _store(response)
+            return response
+        return _wrapped_view
+    return decorator
+
+
+def _refresh_stale(request, key):
+    """
+    Start a background re-render of a stale entry, unless one is running.
+
+    The refresh holds the entry's rebuild lock until it finishes, so each
+    stale entry is refreshed once no matter how many requests hit it.
+    """
+    from .warming import refresh_in_background
+
+    lock = acquire_rebuild_lock(key)
+    if lock is None:
+        return
+    refresh_in_background(
+        request.get_full_path(),
+        host=request.get_host(),
+        secure=request.is_secure(),
+        meta={REFRESH_FLAG: True},
+        on_done=lambda: release_rebuild_lock(lock),
+    )
+
+
+# =============================================================================
+# SINGLE-FLIGHT REBUILDS
+# =============================================================================
+
+# Longest a rebuild may hold its lock before others may take over.
+REBUILD_LOCK_TIMEOUT = 30
+# How long a request waits for another request's rebuild before doing its own.
+REBUILD_WAIT = 2.0
+REBUILD_POLL_INTERVAL = 0.025
+
+
+def acquire_rebuild_lock(key):
+    """
+    Try to become the single request that rebuilds ``key``.
+
+    Uses ``cache.add``, which is atomic in the shared cache, so exactly one
+    request across all workers wins. Returns the lock key, or None if
+    another request is already rebuilding.
+    """
+    lock = f"{key}:lock"
+    return lock if cache.add(lock, 1, REBUILD_LOCK_TIMEOUT) else None
+
+
+def release_rebuild_lock(lock):
+    if lock is not None:
+        cache.delete(lock)
+
+
+def wait_for_rebuild(key, wait=REBUILD_WAIT):
+    """
+    Poll for ``key`` while another request rebuilds it.
+
+    Returns the value, or None if the rebuild did not finish within ``wait``
+    seconds (the caller then builds the value itself).
+    """
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def get_or_build(key, build, timeout):
+    """
+    Single-flight ``cache.get_or_set`` for values that are not responses.
+
+    Used by fragment and bundle-style caches: only one caller runs
+    ``build()`` on a miss, the others wait for its result.
+
+    Args:
+        key: Cache key
+        build: Zero-argument callable producing the value (must not be None)
+        timeout: Cache lifetime in seconds
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock = acquire_rebuild_lock(key)
+    if lock is None:
+        value = wait_for_rebuild(key)
+        if value is not None:
+            return value
+    try:
+        value = build()
+        cache.set(key, value, timeout)
+        return value
+    finally:
+        release_rebuild_lock(lock)
+
+
+# =============================================================================
+# COUNT CACHE
+# =============================================================================
+
+# Counts are invalidated by version bumps, so the TTL only bounds how long
+# unused filter combinations stay in the cache.
+COUNT_TIMEOUT = 60 * 60 * 6
+
+
+def count_key(queryset, versions):
+    """
+    Cache key of ``queryset.count()``.
+
+    The filter signature is a hash of the query's SQL and parameters with
+    the ordering and selected columns removed, so every ``?search=``
+    combination has its own count while ``?ordering=`` and ``?fields=``
+    variants share one.
+    """
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    signature = hashlib.md5(f"{queryset.db}|{sql}|{params!r}".encode('utf-8')).hexdigest()
+    versions = '-'.join(str(version) for version in versions)
+    return f"{KEY_PREFIX}:count:{queryset.model._meta.label_lower}:{versions}:{signature}"
+
+
+def cached_count(queryset, models=None):
+    """
+    ``queryset.count()``, cached until one of ``models`` changes.
+
+    Args:
+        queryset: Filtered queryset to count
+        models: Models the count depends on (default: the queryset's model)
+    """
+    versions = get_versions(*(models or (queryset.model,)))
+    try:
+        key = count_key(queryset, versions)
+    except EmptyResultSet:
+        return 0
+    return get_or_build(key, queryset.count, COUNT_TIMEOUT)
+
+
+# =============================================================================
+# FRAGMENT CACHE
+# =============================================================================
+
+# Fragments are immutable per (pk, updated_at), so they only need a TTL to
+# let rows that are no longer requested fall out of the cache.
+FRAGMENT_TIMEOUT = 60 * 60 * 24 * 7
+
+FRAGMENT_STATS_KEYS = {
+    'hits': f"{KEY_PREFIX}:fragment-stats:hits",
+    'misses': f"{KEY_PREFIX}:fragment-stats:misses",
+}
+
+
+def fragment_key(instance, variant):
+    """
+    Cache key of one object's serialized representation.
+
+    Includes ``updated_at`` (so any save produces a new key) and ``variant``,
+    a hash of everything else the representation depends on: the request's
+    base URL (image URLs are absolute) and the field selection.
+    """
+    updated = instance.updated_at.timestamp()
+    return f"{KEY_PREFIX}:fragment:{instance._meta.label_lower}:{instance.pk}:{updated}:{variant}"
+
+
+def record_fragment_stats(hits, misses):
+    """Add one list render's fragment hits/misses to the cumulative counters."""
+    for name, count in (('hits', hits), ('misses', misses)):
+        if not count:
+            continue
+        key = FRAGMENT_STATS_KEYS[name]
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            # Evicted between add() and incr(); losing one sample is fine.
+            pass
+
+
+def fragment_stats():
+    """Return cumulative fragment cache ``{'hits': n, 'misses': n}``."""
+    found = cache.get_many(list(FRAGMENT_STATS_KEYS.values()))
+    return {name: found.get(key, 0) for name, key in FRAGMENT_STATS_KEYS.items()}
+
+
+# =============================================================================
+# CONDITIONAL GET
+# =============================================================================
+
+def conditional_get(*models, vary=None):
+    """
+    Answer ``If-None-Match``/``If-Modified-Since`` from content versions.
+
+    Sets a strong ETag (hash of the versions and the absolute URI) and a
+    Last-Modified date (the newest version timestamp, once its second has
+    passed) on GET/HEAD responses, and short-circuits with 304 Not Modified
+    when the client's copy is still current. Stack it above ``cache_response`` so revalidation never touches
+    the cache entry or the database. Like ``GZipMiddleware``, the ETag is
+    made weak when the body is sent compressed, on cache hits here and on
+    misses in ``api.compression.apply_encoding``.
+
+    When ``vary`` returns a non-empty part for a request, it is hashed into
+    the ETag and no Last-Modified date is sent: the versions alone cannot
+    tell whether such a response changed.
+
+    Args:
+        *models: Models whose content the response is built from
+        vary: Callable returning an extra ETag part for a request (see
+            ``cache_response``)
+    """
+    def etag_func(request, *args, **kwargs):
+        versions = '.'.join(str(version) for version in request_versions(request, models))
+        uri = request.build_absolute_uri()
+        extra = vary(request) if vary is not None else ''
+        return hashlib.md5(f"{versions}:{uri}:{extra}".encode('utf-8')).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        if vary is not None and vary(request):
+            return None
+        newest = max(request_versions(request, models)) // 1000
+        # HTTP dates have whole seconds. A change later in the version's own
+        # second would get the same date, so If-Modified-Since would answer 304
+        # for it; until that second is over, only the ETag validates.
+        if newest >= int(time.time()):
+            return None
+        return datetime.fromtimestamp(newest, tz=timezone.utc)
+
+    conditional = condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+    def decorator(view_func):
+        view = conditional(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            # Cache hits arrive compressed already; misses are compressed
+            # after rendering, and apply_encoding weakens their ETag then.
+            etag = response.get('ETag')
+            if etag and etag.startswith('"') and response.has_header('Content-Encoding'):
+                response['ETag'] = 'W/' + etag
+            return response
+        return _wrapped_view
+    return decorator
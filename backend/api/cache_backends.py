@@ -0,0 +1,315 @@
+"""
+Shared cache backend for running several gunicorn workers without Redis.
+
+``LocMemCache`` is private to each worker process: with three workers every
+cached page is rendered and stored three times, and a content-version bump
+(see ``api/cache.py``) only reaches the worker that handled the write.
+``SQLiteCache`` keeps entries in one SQLite database in WAL mode, so every
+worker on the host reads and writes the same entries. WAL lets readers
+proceed while a writer commits, and lookups are primary-key reads.
+
+Eviction is an approximate LRU: each entry records when it was last read
+(refreshed at most every ``ACCESS_RESOLUTION`` seconds to keep reads from
+turning into writes), and culling removes expired entries first, then the
+least recently used ones.
+
+The cache is never the source of truth, so SQLite errors (a locked or
+unwritable file, a full disk) are logged and answered like a miss or a
+failed write instead of failing the request: reads return nothing, writes
+are dropped (``add`` returns False), and ``incr`` raises ``ValueError`` as
+if the key were missing.
+
+Configuration:
+    CACHES = {
+        'default': {
+            'BACKEND': 'api.cache_backends.SQLiteCache',
+            'LOCATION': '/tmp/newgate-cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 4},
+        }
+    }
+
+The interface is Django's standard cache API, so ``django.core.cache.backends.
+redis.RedisCache`` can be swapped in through settings when Redis is available.
+"""
+
+import functools
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+def _fail_soft(fallback=None):
+    """
+    Log ``sqlite3.OperationalError`` from a cache call and return ``fallback``.
+
+    Args:
+        fallback: Value returned in place of the failed call's result
+
+    Returns:
+        Decorator for ``SQLiteCache`` methods
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as error:
+                logger.warning("Cache %s failed on %s: %s", method.__name__, self._path, error)
+                return fallback() if callable(fallback) else fallback
+        return wrapper
+    return decorator
+
+
+class SQLiteCache(BaseCache):
+    """Django cache backend storing pickled values in a shared SQLite (WAL) file."""
+
+    # Seconds between refreshes of an entry's last-access time.
+    ACCESS_RESOLUTION = 30
+    # Check the entry count (and cull) once every N writes per process.
+    CULL_CHECK_INTERVAL = 100
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = os.path.abspath(location)
+        self._local = threading.local()
+        self._writes = 0
+
+    # -------------------------------------------------------------------------
+    # Connection handling
+    # -------------------------------------------------------------------------
+
+    @property
+    def _connection(self):
+        """
+        Per-thread, per-process connection.
+
+        Connections are re-opened after a fork (gunicorn preloading) because
+        SQLite handles must not be shared across processes.
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = self._connect()
+            local.pid = os.getpid()
+        return local.connection
+
+    def _connect(self):
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entry ('
+            ' key TEXT PRIMARY KEY,'
+            ' value BLOB NOT NULL,'
+            ' expires REAL,'
+            ' accessed REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)')
+        return connection
+
+    def close(self, **kwargs):
+        # Connections are long-lived and reused across requests.
+        pass
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def _expiry(self, timeout):
+        """Absolute expiry timestamp for ``timeout`` (None = never expires)."""
+        return self.get_backend_timeout(timeout)
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _touch_accessed(self, keys, now):
+        self._connection.executemany(
+            'UPDATE cache_entry SET accessed = ? WHERE key = ?',
+            [(now, key) for key in keys],
+        )
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % self.CULL_CHECK_INTERVAL == 0:
+            self._cull()
+
+    def _cull(self):
+        """Drop expired entries, then the least recently used beyond MAX_ENTRIES."""
+        connection = self._connection
+        now = time.time()
+        connection.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        (count,) = connection.execute('SELECT COUNT(*) FROM cache_entry').fetchone()
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            connection.execute('DELETE FROM cache_entry')
+            return
+        excess = count - self._max_entries + count // self._cull_frequency
+        connection.execute(
+            'DELETE FROM cache_entry WHERE key IN ('
+            ' SELECT key FROM cache_entry ORDER BY accessed LIMIT ?'
+            ')',
+            (excess,),
+        )
+
+    # -------------------------------------------------------------------------
+    # Cache API
+    # -------------------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    @_fail_soft(dict)
+    def get_many(self, keys, version=None):
+        if not keys:
+            return {}
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        now = time.time()
+        placeholders = ','.join('?' * len(key_map))
+        rows = self._connection.execute(
+            f'SELECT key, value, expires, accessed FROM cache_entry WHERE key IN ({placeholders})',
+            list(key_map),
+        ).fetchall()
+
+        found, stale, expired = {}, [], []
+        for db_key, value, expires, accessed in rows:
+            if expires is not None and expires <= now:
+                expired.append(db_key)
+                continue
+            found[key_map[db_key]] = pickle.loads(value)
+            if now - accessed > self.ACCESS_RESOLUTION:
+                stale.append(db_key)
+        if expired:
+            self._delete_expired(expired, now)
+        if stale:
+            self._touch_accessed(stale, now)
+        return found
+
+    @_fail_soft()
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._connection.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+            (key, self._dumps(value), self._expiry(timeout), time.time()),
+        )
+        self._after_write()
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires, now = self._expiry(timeout), time.time()
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._dumps(value), expires, now)
+            for key, value in data.items()
+        ]
+        try:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                rows,
+            )
+            self._after_write()
+        except sqlite3.OperationalError as error:
+            logger.warning("Cache set_many failed on %s: %s", self._path, error)
+            return list(data)
+        return []
+
+    @_fail_soft(False)
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Store ``value`` only if ``key`` is absent or expired; atomic across workers."""
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection.execute(
+            'INSERT INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET'
+            ' value = excluded.value, expires = excluded.expires, accessed = excluded.accessed '
+            'WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?',
+            (key, self._dumps(value), self._expiry(timeout), now, now),
+        )
+        added = cursor.rowcount == 1
+        if added:
+            self._after_write()
+        return added
+
+    @_fail_soft(False)
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection.execute(
+            'UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expiry(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        """Atomically add ``delta`` to an integer value; raises ValueError if missing."""
+        db_key = self.make_and_validate_key(key, version=version)
+        connection = None
+        try:
+            connection = self._connection
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute(
+                'SELECT value, expires FROM cache_entry WHERE key = ?', (db_key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            connection.execute(
+                'UPDATE cache_entry SET value = ? WHERE key = ?', (self._dumps(value), db_key)
+            )
+            connection.execute('COMMIT')
+        except BaseException as error:
+            if connection is not None and connection.in_transaction:
+                connection.execute('ROLLBACK')
+            if isinstance(error, sqlite3.OperationalError):
+                logger.warning("Cache incr failed on %s: %s", self._path, error)
+                raise ValueError("Key '%s' not found" % key) from error
+            raise
+        return value
+
+    @_fail_soft(False)
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection.execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    @_fail_soft(False)
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._delete_keys([key]) > 0
+
+    @_fail_soft()
+    def delete_many(self, keys, version=None):
+        self._delete_keys([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def _delete_keys(self, db_keys):
+        if not db_keys:
+            return 0
+        placeholders = ','.join('?' * len(db_keys))
+        cursor = self._connection.execute(
+            f'DELETE FROM cache_entry WHERE key IN ({placeholders})', db_keys
+        )
+        return cursor.rowcount
+
+    def _delete_expired(self, db_keys, now):
+        # Re-check the expiry: another worker may have stored a fresh value
+        # (or taken a rebuild lock with add()) since the SELECT.
+        placeholders = ','.join('?' * len(db_keys))
+        self._connection.execute(
+            f'DELETE FROM cache_entry WHERE key IN ({placeholders}) AND expires IS NOT NULL AND expires <= ?',
+            [*db_keys, now],
+        )
+
+    @_fail_soft()
+    def clear(self):
+        self._connection.execute('DELETE FROM cache_entry')
@@ -0,0 +1,115 @@
+"""
+Precompressed response bodies for the response cache.
+
+``GZipMiddleware`` compresses every response on the way out, including the
+ones ``cache_response`` serves from the cache, so each hit paid for gzip
+again. Instead, cached entries carry ready-to-send gzip and brotli variants
+of their body, compressed once when the entry is stored. Hits only pick the
+variant the client accepts; responses that already have a
+``Content-Encoding`` are left alone by ``GZipMiddleware``.
+
+Brotli is used when the ``brotli`` package is installed; gzip is always
+available.
+"""
+
+import gzip
+import re
+
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+
+# Smaller bodies are not worth compressing (same threshold as GZipMiddleware).
+MIN_LENGTH = 200
+
+# Compression runs once per cache fill, so favour size over speed (brotli
+# quality 11 is ~10x slower than 9 for a marginal gain on JSON).
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Preferred first.
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+_coding_re = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def _compress(encoding, content):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_variants(content):
+    """
+    Return ``{encoding: body}`` for every encoding that makes ``content`` smaller.
+
+    Empty for bodies below ``MIN_LENGTH``.
+    """
+    if len(content) < MIN_LENGTH:
+        return {}
+    variants = {}
+    for encoding in ENCODINGS:
+        body = _compress(encoding, content)
+        if len(body) < len(content):
+            variants[encoding] = body
+    return variants
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (``q=0`` entries excluded)."""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        match = _coding_re.match(part)
+        if not match:
+            continue
+        coding, quality = match.group(1).lower(), match.group(2)
+        try:
+            if quality is not None and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        if coding == '*':
+            accepted.update(ENCODINGS)
+        else:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(request, variants):
+    """The preferred encoding among ``variants`` that the client accepts, or None."""
+    if not variants:
+        return None
+    accepted = accepted_encodings(request)
+    for encoding in ENCODINGS:
+        if encoding in variants and encoding in accepted:
+            return encoding
+    return None
+
+
+def apply_encoding(response, request, variants):
+    """
+    Replace the body of ``response`` with the best of ``variants`` for ``request``.
+
+    Always adds ``Vary: Accept-Encoding`` when variants exist, since the
+    body then depends on the request's Accept-Encoding. Like
+    ``GZipMiddleware``, makes a strong ETag weak when it sends a compressed
+    body: on a cache miss this runs after rendering, when ``conditional_get``
+    has already set the ETag.
+    """
+    if not variants:
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = choose_encoding(request, variants)
+    if encoding is None:
+        return response
+    response.content = variants[encoding]
+    response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(response.content))
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
@@ -0,0 +1,260 @@
+"""
+Incrementally maintained row counts for the admin dashboard.
+
+``AnalyticsView`` used to run six ``COUNT(*)`` queries on every refresh.
+The counts now live in ``ContentCounter`` rows, read with one query
+(``counter_values``), and are kept current without counting:
+
+- Saves and deletes adjust them from model signals (``track_save``,
+  ``track_delete``). ``Model.delete()`` runs its signals in the delete's
+  transaction, so the two commit or roll back together. ``Model.save()``
+  does not open one: under autocommit the row is committed first and the
+  adjustment is a separate statement, so a failure between them leaves the
+  counter off by one until the next ``reconcile``. Saves made inside
+  ``transaction.atomic()`` roll back with their adjustment.
+  ``unread_inquiries`` follows ``is_read`` changes; the value loaded from
+  the database is kept on the instance for that (``post_init``).
+- Code that bypasses signals (``QuerySet.update()``, raw SQL, bulk actions)
+  calls ``adjust()`` with the row counts it changed; ``counted_in`` and
+  ``counted_rows`` tell how many rows of a set each counter counts.
+- ``python manage.py reconcile_counters`` recounts every counter exactly
+  (``reconcile``). Concurrent per-object edits of the same message can make
+  ``unread_inquiries`` drift; run it from cron to correct that.
+
+``reconcile_counters`` also copies the counters into the day's
+``CounterSnapshot`` rows (``snapshot``); run it daily from cron. The
+dashboard's ``change`` figures compare the current values with the snapshot
+from ``CHANGE_PERIOD_DAYS`` ago (``period_changes``).
+"""
+
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Subquery
+from django.utils import timezone
+
+from .models import ContentCounter, CounterSnapshot
+
+
+# Counter name -> (model label, filter). A model with a filtered counter
+# keeps the loaded values of the filter fields on its instances.
+COUNTERS = {
+    'events': ('api.Event', {}),
+    'sermons': ('api.Sermon', {}),
+    'ministries': ('api.Ministry', {}),
+    'leadership': ('api.Leadership', {}),
+    'inquiries': ('api.ContactMessage', {}),
+    'unread_inquiries': ('api.ContactMessage', {'is_read': False}),
+    'archived_inquiries': ('api.ArchivedContactMessage', {}),
+}
+
+# Dashboard ``change`` figures compare with the snapshot this many days old.
+CHANGE_PERIOD_DAYS = 30
+
+# Instance attribute holding the filter field values loaded from the database.
+_LOADED = '_counter_loaded'
+
+
+def counters_for(model):
+    """``{name: filter}`` of the counters counting rows of ``model``."""
+    label = model._meta.label
+    return {name: lookup for name, (counted, lookup) in COUNTERS.items() if counted == label}
+
+
+def _tracked_fields(model):
+    return sorted({field for lookup in counters_for(model).values() for field in lookup})
+
+
+# =============================================================================
+# UPDATES
+# =============================================================================
+
+def adjust(deltas):
+    """
+    Add ``{name: delta}`` to the counters, one UPDATE per changed counter.
+
+    Runs in the caller's transaction. A counter without a row yet is
+    recounted instead.
+    """
+    missing = []
+    for name, delta in deltas.items():
+        if delta and not ContentCounter.objects.filter(name=name).update(value=F('value') + delta,
+                                                                         updated_at=timezone.now()):
+            missing.append(name)
+    if missing:
+        reconcile(missing)
+
+
+def counted_in(queryset):
+    """
+    ``{name: rows}`` each counter of the queryset's model counts in ``queryset``.
+
+    One aggregate query, for set-based deletes that send no signals.
+    """
+    counters = counters_for(queryset.model)
+    if not counters:
+        return {}
+    return queryset.order_by().aggregate(**{
+        name: Count('pk', filter=Q(**lookup) if lookup else None) for name, lookup in counters.items()
+    })
+
+
+def counted_rows(model, rows):
+    """``{name: rows}`` each counter of ``model`` counts among ``rows`` (``.values()`` dicts)."""
+    return {
+        name: sum(_matches(row, lookup) for row in rows) for name, lookup in counters_for(model).items()
+    }
+
+
+def _matches(values, lookup):
+    return all(values.get(field) == value for field, value in lookup.items())
+
+
+def _current(instance, fields):
+    return {field: getattr(instance, field) for field in fields}
+
+
+def remember_loaded(sender, instance, **kwargs):
+    """``post_init`` handler: keep the tracked field values the instance was loaded with."""
+    if instance._state.adding:
+        return
+    deferred = instance.get_deferred_fields()
+    fields = _tracked_fields(sender)
+    # Unknown for deferred fields (their counters are recounted on save).
+    instance.__dict__[_LOADED] = None if deferred.intersection(fields) else _current(instance, fields)
+
+
+def track_save(sender, instance, created, **kwargs):
+    """``post_save`` handler: count a new row, or a row moving in or out of a filter."""
+    counters = counters_for(sender)
+    if not counters:
+        return
+    fields = _tracked_fields(sender)
+    now = _current(instance, fields)
+    if created:
+        adjust({name: 1 for name, lookup in counters.items() if _matches(now, lookup)})
+    else:
+        loaded = instance.__dict__.get(_LOADED)
+        filtered = [name for name, lookup in counters.items() if lookup]
+        if loaded is None:
+            reconcile(filtered)
+        else:
+            adjust({
+                name: _matches(now, counters[name]) - _matches(loaded, counters[name])
+                for name in filtered
+            })
+    if fields:
+        instance.__dict__[_LOADED] = now
+
+
+def track_delete(sender, instance, **kwargs):
+    """``post_delete`` handler: uncount the row (as it was loaded)."""
+    counters = counters_for(sender)
+    if not counters:
+        return
+    values = instance.__dict__.get(_LOADED) or _current(instance, _tracked_fields(sender))
+    adjust({name: -1 for name, lookup in counters.items() if _matches(values, lookup)})
+
+
+def connect_signals():
+    """Connect the tracking handlers for every counted model (``ApiConfig.ready()``)."""
+    from django.db.models.signals import post_delete, post_init, post_save
+
+    for label in {label for label, _ in COUNTERS.values()}:
+        model = global_apps.get_model(label)
+        uid = f"api_counters_{model._meta.model_name}"
+        post_save.connect(track_save, sender=model, dispatch_uid=f"{uid}_save")
+        post_delete.connect(track_delete, sender=model, dispatch_uid=f"{uid}_delete")
+        if _tracked_fields(model):
+            post_init.connect(remember_loaded, sender=model, dispatch_uid=f"{uid}_init")
+
+
+# =============================================================================
+# RECONCILIATION
+# =============================================================================
+
+def exact_counts(names=None):
+    """Count the rows of each counter (``names``, or all) with ``COUNT(*)``."""
+    counts = {}
+    for name in names or COUNTERS:
+        label, lookup = COUNTERS[name]
+        counts[name] = global_apps.get_model(label).objects.filter(**lookup).count()
+    return counts
+
+
+def reconcile(names=None):
+    """
+    Overwrite counters (``names``, or all) with exact counts.
+
+    Returns:
+        ``{name: (stored value or None, exact value)}``
+    """
+    with transaction.atomic():
+        stored = dict(ContentCounter.objects.select_for_update()
+                      .filter(name__in=list(names or COUNTERS)).values_list('name', 'value'))
+        counts = exact_counts(names)
+        now = timezone.now()
+        ContentCounter.objects.bulk_create(
+            [ContentCounter(name=name, value=value, updated_at=now) for name, value in counts.items()],
+            update_conflicts=True, unique_fields=['name'], update_fields=['value', 'updated_at'],
+        )
+    return {name: (stored.get(name), value) for name, value in counts.items()}
+
+
+# =============================================================================
+# READS AND SNAPSHOTS
+# =============================================================================
+
+def counter_values():
+    """All counters as ``{name: value}``, in one query (missing ones are recounted)."""
+    values = dict(ContentCounter.objects.values_list('name', 'value'))
+    missing = [name for name in COUNTERS if name not in values]
+    if missing:
+        values.update((name, value) for name, (_, value) in reconcile(missing).items())
+    return values
+
+
+def snapshot(values, day=None):
+    """Store ``values`` as the snapshot of ``day`` (today), replacing an earlier one."""
+    day = day or timezone.localdate()
+    CounterSnapshot.objects.bulk_create(
+        [CounterSnapshot(day=day, name=name, value=value) for name, value in values.items()],
+        update_conflicts=True, unique_fields=['day', 'name'], update_fields=['value'],
+    )
+
+
+def period_changes(values, days=CHANGE_PERIOD_DAYS):
+    """
+    Change of each counter since the snapshot ``days`` ago, in one query.
+
+    Uses the newest snapshot at least ``days`` old, or the oldest one while
+    there is no snapshot that old yet.
+
+    Returns:
+        ``{name: (change label, is positive)}``, e.g. ``('+12%', True)``
+    """
+    cutoff = timezone.localdate() - timedelta(days=days)
+    snapshots = CounterSnapshot.objects.order_by()
+    baseline_day = Subquery(
+        snapshots.filter(day__lte=cutoff).order_by('-day').values('day')[:1]
+    )
+    oldest_day = Subquery(snapshots.order_by('day').values('day')[:1])
+    # Newest day <= cutoff if there is one, else the oldest day.
+    # The oldest day is never after the baseline day, so the later one wins.
+    rows = snapshots.filter(day__in=[baseline_day, oldest_day]).order_by('day')
+    baseline = dict(rows.values_list('name', 'value'))
+
+    changes = {}
+    for name, value in values.items():
+        previous = baseline.get(name, value)
+        changes[name] = (_change_label(previous, value), value >= previous)
+    return changes
+
+
+def _change_label(previous, current):
+    if previous == current:
+        return '0%'
+    if not previous:
+        return f"+{current}"
+    return f"{(current - previous) * 100 / previous:+.0f}%"
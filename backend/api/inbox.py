@@ -0,0 +1,116 @@
+"""
+Set-based operations on the contact message inbox.
+
+``POST /api/contact-messages/bulk/`` applies one action to many messages,
+chosen by id or by criteria, with set-based statements instead of one
+PATCH/DELETE round trip (and serializer pass) per message:
+
+    mark_read    UPDATE ... SET is_read = true  WHERE <selection> AND NOT is_read
+    mark_unread  UPDATE ... SET is_read = false WHERE <selection> AND is_read
+    delete       DELETE FROM ... WHERE <selection>
+    archive      move the selection into ArchivedContactMessage (api/archive.py)
+
+Restricting each UPDATE to the rows it actually changes makes its row count
+the exact change of the unread counter. ``delete`` counts the selection with
+one aggregate (``counters.counted_in``) and then deletes it with one
+statement: ``QuerySet.delete()`` would load every message and send
+``post_delete`` for each, since the counter handlers listen for it. None of
+these statements send model signals, so ``run_bulk_action`` does what the
+signal handlers would: it adjusts the dashboard counters
+(``api/counters.py``) once, in the same transaction, and bumps the
+ContactMessage content version once on commit, which invalidates cached
+list counts.
+"""
+
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .archive import archive
+from .counters import adjust, counted_in
+from .models import ContactMessage
+
+# Most ids accepted in one request (keeps the IN list within database limits).
+MAX_BULK_IDS = 1000
+
+
+def select_messages(ids=None, criteria=None):
+    """
+    Messages chosen by ``ids`` or by ``criteria``.
+
+    Args:
+        ids: Message ids
+        criteria: Dict with any of ``is_read``, ``email``, ``created_after``
+            (date, inclusive) and ``created_before`` (date, exclusive)
+    """
+    queryset = ContactMessage.objects.order_by()
+    if ids is not None:
+        return queryset.filter(pk__in=ids)
+    criteria = dict(criteria or {})
+    lookups = {}
+    if 'is_read' in criteria:
+        lookups['is_read'] = criteria['is_read']
+    if 'email' in criteria:
+        lookups['email'] = criteria['email']  # exact: served by the (email, -created_at) index
+    # Compare with local midnights rather than created_at__date, so the
+    # created_at indexes still apply.
+    if 'created_after' in criteria:
+        lookups['created_at__gte'] = _start_of(criteria['created_after'])
+    if 'created_before' in criteria:
+        lookups['created_at__lt'] = _start_of(criteria['created_before'])
+    return queryset.filter(**lookups)
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+# =============================================================================
+# ACTIONS
+# =============================================================================
+
+def mark_read(queryset):
+    changed = queryset.filter(is_read=False).update(is_read=True)
+    adjust({'unread_inquiries': -changed})
+    return changed
+
+
+def mark_unread(queryset):
+    changed = queryset.filter(is_read=True).update(is_read=False)
+    adjust({'unread_inquiries': changed})
+    return changed
+
+
+def delete(queryset):
+    counts = counted_in(queryset)
+    # Nothing references ContactMessage, so no cascades are skipped.
+    deleted = queryset._raw_delete(queryset.db)
+    adjust({name: -count for name, count in counts.items()})
+    return deleted
+
+
+# Action name -> function(queryset) returning the number of messages changed.
+ACTIONS = {
+    'mark_read': mark_read,
+    'mark_unread': mark_unread,
+    'delete': delete,
+    'archive': archive,  # read or not: staff chose these messages
+}
+
+
+def run_bulk_action(action, queryset):
+    """
+    Apply ``ACTIONS[action]`` to ``queryset`` in one transaction.
+
+    Returns:
+        Number of messages changed
+    """
+    # Not at module level: signals imports the serializers, which import this module.
+    from .signals import invalidate
+
+    with transaction.atomic(using=queryset.db):
+        affected = ACTIONS[action](queryset)
+        if affected:
+            transaction.on_commit(lambda: invalidate(ContactMessage), using=queryset.db)
+    return affected
@@ -0,0 +1,217 @@
+"""
+Write-behind ingestion of contact form submissions.
+
+With ``CONTACT_INGEST_MODE = 'journal'``, ``POST /api/contact-messages/``
+validates the submission, appends it to a local journal and answers
+``202 Accepted``. Nothing is written to the main database on the request
+path, so a burst of submissions (after a prayer-request announcement) does
+not contend with reads for the ``ContactMessage`` table and its indexes.
+
+The journal is a SQLite file (``CONTACT_JOURNAL_PATH``) in WAL mode with
+``synchronous=FULL``: an append is on disk when it returns, and a crash
+cannot lose or tear it. Worker processes on the same host share the file.
+
+A daemon thread per process (``journal_flusher``) moves the entries into
+``ContactMessage`` in batches of ``BATCH_SIZE``, one transaction each:
+
+    1. lock this journal's ``JournalCheckpoint`` row (``last_seq``)
+    2. read the journal entries after ``last_seq``
+    3. insert them with ``bulk_create`` (one multi-row INSERT)
+    4. advance ``last_seq`` and adjust the dashboard counters
+    5. commit, then remove the delivered entries from the journal
+
+Entries are only ever delivered together with the checkpoint that marks them
+delivered, so each is inserted exactly once: a crash before step 5 commits
+neither, and a crash after it leaves entries the next flush skips. Journal
+sequence numbers are never reused (``AUTOINCREMENT``), and a new journal
+file gets a new id, hence a new checkpoint.
+
+Entries keep their submission time as ``created_at``, even when they are
+delivered later (e.g. after a restart). ``python manage.py
+flush_contact_journal`` delivers pending entries by hand.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .counters import adjust
+from .models import ContactMessage, JournalCheckpoint
+from .signals import invalidate
+
+logger = logging.getLogger(__name__)
+
+# Entries per delivery transaction (one INSERT statement).
+BATCH_SIZE = 200
+
+# Seconds the flusher waits after a submission, to deliver bursts in batches.
+FLUSH_DELAY = getattr(settings, 'CONTACT_JOURNAL_FLUSH_DELAY', 1.0)
+# Seconds between flushes when nothing wakes the flusher (retries, recovery).
+FLUSH_INTERVAL = 30
+
+
+def journal_enabled():
+    return getattr(settings, 'CONTACT_INGEST_MODE', 'direct') == 'journal'
+
+
+# =============================================================================
+# JOURNAL
+# =============================================================================
+
+class SubmissionJournal:
+    """Durable, append-only queue of submissions in a local SQLite file."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._id = None
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'seq INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, submitted_at TEXT NOT NULL)'
+            )
+            connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            connection.execute("INSERT OR IGNORE INTO meta VALUES ('id', ?)", [str(uuid.uuid4())])
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @property
+    def id(self):
+        """Id of this journal file (the key of its ``JournalCheckpoint``)."""
+        if self._id is None:
+            (self._id,) = self._connection().execute("SELECT value FROM meta WHERE key = 'id'").fetchone()
+        return self._id
+
+    def append(self, payload):
+        """Durably store one submission (a JSON-serializable dict). Returns its sequence number."""
+        submitted_at = datetime.now(dt_timezone.utc).isoformat()
+        cursor = self._connection().execute(
+            'INSERT INTO entries (payload, submitted_at) VALUES (?, ?)',
+            [json.dumps(payload), submitted_at],
+        )
+        return cursor.lastrowid
+
+    def read_after(self, seq, limit):
+        """Up to ``limit`` entries after ``seq``, as ``(seq, payload, submitted_at)``."""
+        rows = self._connection().execute(
+            'SELECT seq, payload, submitted_at FROM entries WHERE seq > ? ORDER BY seq LIMIT ?', [seq, limit],
+        )
+        return [(seq, json.loads(payload), datetime.fromisoformat(at)) for seq, payload, at in rows]
+
+    def discard_through(self, seq):
+        """Remove the entries up to ``seq`` (already delivered)."""
+        self._connection().execute('DELETE FROM entries WHERE seq <= ?', [seq])
+
+    def pending(self):
+        (count,) = self._connection().execute('SELECT COUNT(*) FROM entries').fetchone()
+        return count
+
+
+contact_journal = SubmissionJournal(
+    getattr(settings, 'CONTACT_JOURNAL_PATH', os.path.join(settings.BASE_DIR, 'contact_journal.sqlite3'))
+)
+
+
+# =============================================================================
+# DELIVERY
+# =============================================================================
+
+def deliver(journal=contact_journal, limit=BATCH_SIZE):
+    """
+    Move up to ``limit`` journal entries into ``ContactMessage``, exactly once.
+
+    Returns:
+        Number of messages inserted
+    """
+    with transaction.atomic():
+        JournalCheckpoint.objects.bulk_create([JournalCheckpoint(journal_id=journal.id)], ignore_conflicts=True)
+        checkpoint = JournalCheckpoint.objects.select_for_update().get(journal_id=journal.id)
+        entries = journal.read_after(checkpoint.last_seq, limit)
+        if not entries:
+            # Drop entries delivered just before a crash, if any.
+            journal.discard_through(checkpoint.last_seq)
+            return 0
+        messages = [
+            ContactMessage(created_at=submitted_at, **payload) for _, payload, submitted_at in entries
+        ]
+        ContactMessage.objects.bulk_create(messages)
+        last_seq = entries[-1][0]
+        JournalCheckpoint.objects.filter(journal_id=journal.id).update(last_seq=last_seq)
+        adjust({
+            'inquiries': len(messages),
+            'unread_inquiries': sum(not message.is_read for message in messages),
+        })
+        transaction.on_commit(lambda: invalidate(ContactMessage))
+        # After the commit: a rolled-back delivery leaves its entries pending.
+        transaction.on_commit(lambda: journal.discard_through(last_seq))
+    return len(messages)
+
+
+def flush(journal=contact_journal):
+    """Deliver every pending entry. Returns the number of messages inserted."""
+    total = 0
+    while True:
+        delivered = deliver(journal)
+        total += delivered
+        if delivered < BATCH_SIZE:
+            return total
+
+
+class JournalFlusher:
+    """Per-process daemon thread running ``flush()`` shortly after submissions."""
+
+    def __init__(self, journal):
+        self.journal = journal
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='contact-journal', daemon=True).start()
+
+    def notify(self):
+        """A submission was journaled: flush soon."""
+        if self._pid != os.getpid():
+            self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            if self._wake.wait(FLUSH_INTERVAL):
+                time.sleep(FLUSH_DELAY)  # let a burst accumulate
+            self._wake.clear()
+            try:
+                flush(self.journal)
+            except Exception:
+                logger.exception("Delivering journaled contact messages failed; will retry")
+            finally:
+                close_old_connections()
+
+
+journal_flusher = JournalFlusher(contact_journal)
+
+
+def submit(payload):
+    """Journal a validated submission and schedule its delivery."""
+    seq = contact_journal.append(payload)
+    journal_flusher.notify()
+    return seq
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.archive import (
+    ARCHIVE_AFTER_DAYS, BATCH_SIZE, RETENTION_DAYS, archivable, archive, expired_archive, prune,
+)
+from api.counters import counter_values
+
+
+class Command(BaseCommand):
+    help = 'Moves old read contact messages into the archive table and prunes expired archived messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=ARCHIVE_AFTER_DAYS, metavar='DAYS',
+                            help=f'Archive read messages sent more than DAYS days ago (default {ARCHIVE_AFTER_DAYS})')
+        parser.add_argument('--retention', type=int, default=RETENTION_DAYS, metavar='DAYS',
+                            help='Delete archived messages sent more than DAYS days ago; 0 keeps them '
+                                 f'(default {RETENTION_DAYS})')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Messages per transaction (default {BATCH_SIZE})')
+        parser.add_argument('--dry-run', action='store_true', help='Count the messages without moving or deleting them')
+
+    def handle(self, *args, **options):
+        days, retention, batch_size = options['older_than'], options['retention'], options['batch_size']
+        if days < 0 or retention < 0 or batch_size < 1:
+            raise CommandError('--older-than and --retention must be >= 0, and --batch-size >= 1.')
+        if retention and retention < days:
+            raise CommandError('--retention must not be shorter than --older-than.')
+
+        if options['dry_run']:
+            archived = archivable(days).count()
+            # Messages archived by this run can already be past the retention.
+            pruned = expired_archive(retention).count() + archivable(retention).count() if retention else 0
+        else:
+            archived = archive(archivable(days), batch_size)
+            pruned = prune(retention, batch_size) if retention else 0
+
+        suffix = ' (dry run)' if options['dry_run'] else ''
+        self.stdout.write(f"Archived {archived} read messages older than {days} days{suffix}.")
+        if retention:
+            self.stdout.write(f"Pruned {pruned} archived messages older than {retention} days{suffix}.")
+        counts = counter_values()
+        self.stdout.write(f"Inbox: {counts['inquiries']:,} messages; archive: {counts['archived_inquiries']:,}.")
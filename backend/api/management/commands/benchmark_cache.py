@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'benchmark'),
+    'sqlite': ('api.cache_backends.SQLiteCache', None),  # LOCATION filled in per run
+    'redis': ('django.core.cache.backends.redis.RedisCache', None),  # LOCATION = REDIS_URL
+}
+
+
+def run_worker(backend_path, location, options, seed):
+    """
+    Simulate one gunicorn worker serving cached pages.
+
+    Page popularity follows a Zipf-like distribution (a few hot pages, a long
+    tail). A miss "renders" the page by sleeping ``miss_cost_ms`` and stores
+    it, like ``cache_response`` does.
+    """
+    cache = import_string(backend_path)(location, {
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': options['keys'] * 2},
+    })
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, options['keys'] + 1)]
+    keys = [f"page:{rank}" for rank in range(options['keys'])]
+    payload = os.urandom(options['payload_bytes'])
+    miss_cost = options['miss_cost_ms'] / 1000
+
+    hits = misses = 0
+    latencies = []
+    started = time.perf_counter()
+    for key in rng.choices(keys, weights=weights, k=options['requests']):
+        t0 = time.perf_counter()
+        value = cache.get(key)
+        latencies.append(time.perf_counter() - t0)
+        if value is None:
+            misses += 1
+            time.sleep(miss_cost)
+            cache.set(key, payload)
+        else:
+            hits += 1
+    return hits, misses, latencies, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Compares hit rate and latency of cache backends under several worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', action='append', dest='backends', choices=sorted(BACKENDS),
+                            help='Backend to benchmark (repeatable). Default: locmem and sqlite (+redis if REDIS_URL).')
+        parser.add_argument('--workers', type=int, default=3, help='Worker processes (default: 3, as in gunicorn)')
+        parser.add_argument('--requests', type=int, default=5000, help='Requests per worker (default: 5000)')
+        parser.add_argument('--keys', type=int, default=300, help='Distinct cached pages (default: 300)')
+        parser.add_argument('--payload-bytes', type=int, default=8192, help='Size of a cached page (default: 8KB)')
+        parser.add_argument('--miss-cost-ms', type=float, default=5.0,
+                            help='Simulated render time of a miss (default: 5ms)')
+
+    def handle(self, *args, **options):
+        backends = options['backends'] or ['locmem', 'sqlite'] + (['redis'] if settings.REDIS_URL else [])
+        self.stdout.write(
+            f"{options['workers']} workers x {options['requests']} requests, "
+            f"{options['keys']} pages, {options['miss_cost_ms']}ms per miss\n"
+        )
+        self.stdout.write(f"{'backend':<8} {'hit rate':>9} {'get p50':>10} {'get p99':>10} {'req mean':>10} {'wall':>8}")
+        for name in backends:
+            self.stdout.write(self.format_row(name, self.run(name, options)))
+
+    def run(self, name, options):
+        backend_path, location = BACKENDS[name]
+        with tempfile.TemporaryDirectory() as directory:
+            if name == 'sqlite':
+                location = os.path.join(directory, 'benchmark.sqlite3')
+            elif name == 'redis':
+                location = settings.REDIS_URL
+                import_string(backend_path)(location, {}).clear()
+            args = [(backend_path, location, options, seed) for seed in range(options['workers'])]
+            started = time.perf_counter()
+            with multiprocessing.get_context('fork').Pool(options['workers']) as pool:
+                results = pool.starmap(run_worker, args)
+            wall = time.perf_counter() - started
+        return results, wall
+
+    def format_row(self, name, run):
+        results, wall = run
+        hits = sum(result[0] for result in results)
+        total = hits + sum(result[1] for result in results)
+        latencies = sorted(latency for result in results for latency in result[2])
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        mean_request = statistics.mean(result[3] / len(result[2]) for result in results) * 1000
+        return (
+            f"{name:<8} {hits / total:>8.1%} {p50:>8.1f}us {p99:>8.1f}us "
+            f"{mean_request:>8.3f}ms {wall:>7.2f}s"
+        )
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from api.compression import ENCODINGS, choose_encoding, compress_variants
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import EventSerializer, SermonSerializer, values_serializer
+
+from .benchmark_serializers import Command as SerializerBenchmark
+
+
+PAYLOADS = {
+    'events': EventSerializer,
+    'sermons': SermonSerializer,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares CPU time per request of JSON encoding and response compression, before and after'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resource', choices=sorted(PAYLOADS), default='events',
+                            help='Payload to render (default: events)')
+        parser.add_argument('--rows', type=int, default=100,
+                            help='Rows in the payload; existing rows are cloned in a rolled-back transaction (default: 100)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario (default: 200)')
+
+    def handle(self, *args, **options):
+        serializer_class = PAYLOADS[options['resource']]
+        model = serializer_class.Meta.model
+        request = Request(RequestFactory().get('/api/', HTTP_HOST='localhost:8000', HTTP_ACCEPT_ENCODING='gzip, br'))
+        fast = values_serializer(serializer_class)
+        with transaction.atomic():
+            rows = SerializerBenchmark().fill(model, options['rows'])
+            data = fast.serialize(model.objects.values(*fast.sources)[:rows], {'request': request})
+            transaction.set_rollback(True)
+        if not data:
+            self.stdout.write('No rows to clone; create some content first.')
+            return
+
+        body = JSONRenderer().render(data)
+        variants = compress_variants(body)
+        self.stdout.write(
+            f"{options['resource']}: {len(data)} rows, {len(body):,} bytes JSON, "
+            + ', '.join(f"{encoding} {len(variants[encoding]):,}" for encoding in variants)
+            + f" (orjson: {'yes' if orjson else 'not installed'}, encodings: {', '.join(ENCODINGS)})"
+        )
+        if FastJSONRenderer().render(data) != body:
+            self.stderr.write('FastJSONRenderer output differs from JSONRenderer!')
+
+        scenarios = [
+            ('encode: JSONRenderer', lambda: JSONRenderer().render(data)),
+            ('encode: FastJSONRenderer', lambda: FastJSONRenderer().render(data)),
+            ('cache fill: precompress variants', lambda: compress_variants(body)),
+            ('cache hit: gzip per request (before)', lambda: compress_string(body)),
+            ('cache hit: stored variant (after)', lambda: variants.get(choose_encoding(request, variants), body)),
+        ]
+        self.stdout.write(f"{'scenario':<38} {'CPU us/request':>15}")
+        for label, run in scenarios:
+            self.stdout.write(f"{label:<38} {self.cpu_per_request(run, options['requests']):>15,.1f}")
+
+    def cpu_per_request(self, run, requests):
+        """Process CPU time per call of ``run`` in microseconds."""
+        run()
+        started = time.process_time()
+        for _ in range(requests):
+            run()
+        return (time.process_time() - started) / requests * 1e6
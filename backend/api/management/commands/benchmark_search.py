@@ -0,0 +1,94 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework import filters
+from rest_framework.request import Request
+
+from api.models import Sermon
+from api.search import FullTextIndex, FullTextSearchFilter, RankedOrderingFilter
+from api.views import SermonViewSet
+
+
+THEMES = [
+    'faith', 'hope', 'grace', 'love', 'mercy', 'prayer', 'worship', 'redemption', 'forgiveness',
+    'salvation', 'kingdom', 'spirit', 'covenant', 'wisdom', 'peace', 'joy', 'righteousness',
+    'discipleship', 'healing', 'praise', 'promise', 'glory', 'truth', 'light', 'shepherd',
+]
+SPEAKERS = [f"{title} {name}" for title in ('Pastor', 'Elder', 'Deacon', 'Rev.')
+            for name in ('John', 'Mary', 'Peter', 'Ruth', 'Samuel', 'Grace', 'David', 'Esther',
+                         'Joseph', 'Naomi', 'Paul', 'Lydia')]
+QUERIES = ['faith', 'grace love', 'redemption covenant', 'pastor jo', 'discipleship healing praise', 'zzzz']
+
+
+class Command(BaseCommand):
+    help = 'Compares icontains search with the full-text index on a synthetic sermon archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000,
+                            help='Synthetic sermons, inserted in a rolled-back transaction (default: 100000)')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per query, best is reported (default: 3)')
+        parser.add_argument('--query', action='append', dest='queries', help='Search string (repeatable)')
+
+    def handle(self, *args, **options):
+        if not FullTextIndex.supports(connection):
+            raise CommandError(f"No full-text index on {connection.vendor}.")
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.fill(options['rows'])
+            self.stdout.write(f"Inserted {options['rows']:,} sermons (index maintained by the database) "
+                              f"in {time.perf_counter() - started:.1f}s")
+            self.stdout.write(f"{'query':<30} {'matches':>8} {'icontains ms':>13} {'full-text ms':>13} {'speedup':>8}")
+            for query in options['queries'] or QUERIES:
+                before_ms, before_count = self.best(filters.SearchFilter(), filters.OrderingFilter(),
+                                                    query, options['repeat'])
+                after_ms, after_count = self.best(FullTextSearchFilter(), RankedOrderingFilter(),
+                                                  query, options['repeat'])
+                self.stdout.write(
+                    f"{query:<30} {after_count:>8,} {before_ms:>13.1f} {after_ms:>13.1f} "
+                    f"{before_ms / after_ms:>7.1f}x" + ('' if before_count == after_count else f"  (icontains: {before_count:,})")
+                )
+            transaction.set_rollback(True)
+
+    def fill(self, rows):
+        rng = random.Random(42)
+        vocabulary = [''.join(rng.choice('abcdefghijklmnoprstuvw') for _ in range(rng.randint(3, 9)))
+                      for _ in range(5000)]
+
+        def words(count):
+            return ' '.join(rng.choice(THEMES) if rng.random() < 0.08 else rng.choice(vocabulary)
+                            for _ in range(count))
+
+        series = [f"{rng.choice(THEMES).title()} {rng.choice(vocabulary).title()}" for _ in range(300)]
+        start = datetime.date(1990, 1, 7)
+        batch = []
+        for i in range(rows):
+            batch.append(Sermon(
+                title=words(rng.randint(3, 6)).title(),
+                date=start + datetime.timedelta(days=i % 12000),
+                speaker=rng.choice(SPEAKERS),
+                description=words(rng.randint(40, 120)),
+                series=rng.choice(series) if rng.random() < 0.6 else None,
+                category=rng.choice(THEMES),
+            ))
+            if len(batch) == 2000:
+                Sermon.objects.bulk_create(batch)
+                batch = []
+        Sermon.objects.bulk_create(batch)
+
+    def best(self, search_filter, ordering_filter, query, repeat):
+        """Best ms for what a search list request runs: count + first page (+ snippets)."""
+        request = Request(RequestFactory().get('/api/sermons/', {'search': query}))
+        view = SermonViewSet(request=request, format_kwarg=None)
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = search_filter.filter_queryset(request, Sermon.objects.all(), view)
+            queryset = ordering_filter.filter_queryset(request, queryset, view)
+            count = queryset.count()
+            list(queryset[:20])
+            best = min(best, (time.perf_counter() - started) * 1000)
+        return best, count
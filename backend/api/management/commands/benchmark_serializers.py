@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from api.serializers import (
+    EventSerializer, SermonSerializer, MinistrySerializer, LeadershipSerializer,
+    ServiceScheduleSerializer, GivingOptionSerializer, ValueSerializer, HomeFeatureSerializer,
+    values_serializer,
+)
+
+
+SERIALIZERS = {
+    'events': EventSerializer,
+    'sermons': SermonSerializer,
+    'ministries': MinistrySerializer,
+    'leadership': LeadershipSerializer,
+    'schedule': ServiceScheduleSerializer,
+    'giving-options': GivingOptionSerializer,
+    'values': ValueSerializer,
+    'home-features': HomeFeatureSerializer,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares rows/second of a plain ModelSerializer list and the compiled .values() serializer. '
+        'This is the list path of schedule, giving options, values, leadership and home features. '
+        'Events, sermons and ministries list through the fragment cache instead (see cache_stats); '
+        'for them the figures apply to retrieve and to fragment-cache misses only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resource', action='append', dest='resources', choices=sorted(SERIALIZERS),
+                            help='Resource to benchmark (repeatable). Default: all.')
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Rows per run; existing rows are cloned in a rolled-back transaction (default: 1000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer, best is reported (default: 5)')
+
+    def handle(self, *args, **options):
+        context = {'request': Request(RequestFactory().get('/api/', HTTP_HOST='localhost:8000'))}
+        self.stdout.write(f"{'resource':<15} {'rows':>6} {'before rows/s':>14} {'after rows/s':>13} {'speedup':>8}  identical")
+        for name in options['resources'] or SERIALIZERS:
+            serializer_class = SERIALIZERS[name]
+            with transaction.atomic():
+                rows = self.fill(serializer_class.Meta.model, options['rows'])
+                if rows:
+                    self.stdout.write(self.run(name, serializer_class, rows, context, options['repeat']))
+                else:
+                    self.stdout.write(f"{name:<15} {'-':>6}  skipped (no rows to clone)")
+                transaction.set_rollback(True)
+
+    def fill(self, model, rows):
+        """Clone existing rows until the table holds ``rows``; return the count used."""
+        templates = list(model.objects.all()[:50])
+        if not templates:
+            return 0
+        columns = [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+        missing = rows - model.objects.count()
+        clones = [
+            model(**{column: getattr(templates[i % len(templates)], column) for column in columns})
+            for i in range(max(missing, 0))
+        ]
+        model.objects.bulk_create(clones, batch_size=500)
+        return rows
+
+    def run(self, name, serializer_class, rows, context, repeat):
+        model = serializer_class.Meta.model
+        fast = values_serializer(serializer_class)
+        render = JSONRenderer().render
+
+        def before():
+            # Plain ListSerializer: the fragment cache is benchmarked separately (cache_stats).
+            serializer = serializers.ListSerializer(child=serializer_class(), context=context)
+            return render(serializer.to_representation(model.objects.all()[:rows]))
+
+        def after():
+            return render(fast.serialize(model.objects.values(*fast.sources)[:rows], context))
+
+        before_rate, before_body = self.best_rate(before, rows, repeat)
+        after_rate, after_body = self.best_rate(after, rows, repeat)
+        return (
+            f"{name:<15} {rows:>6} {before_rate:>14,.0f} {after_rate:>13,.0f} "
+            f"{after_rate / before_rate:>7.1f}x  {'yes' if before_body == after_body else 'NO'}"
+        )
+
+    def best_rate(self, render, rows, repeat):
+        """Best rows/second over ``repeat`` runs (query + serialization + JSON)."""
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = render()
+            best = min(best, time.perf_counter() - started)
+        return rows / best, body
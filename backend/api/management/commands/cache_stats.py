@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import fragment_stats
+
+
+class Command(BaseCommand):
+    help = 'Reports cumulative hit/miss counts of the per-object fragment cache'
+
+    def handle(self, *args, **options):
+        stats = fragment_stats()
+        total = stats['hits'] + stats['misses']
+        rate = stats['hits'] / total if total else 0
+        self.stdout.write(f"Fragment cache: {stats['hits']} hits, {stats['misses']} misses ({rate:.1%} hit rate)")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.journal import contact_journal, flush
+
+
+class Command(BaseCommand):
+    help = 'Delivers journaled contact submissions into the ContactMessage table (exactly once)'
+
+    def handle(self, *args, **options):
+        pending = contact_journal.pending()
+        delivered = flush(contact_journal)
+        self.stdout.write(f"{contact_journal.path}: {pending} pending, {delivered} delivered, "
+                          f"{contact_journal.pending()} left")
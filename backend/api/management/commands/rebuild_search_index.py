@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from api.search import FULL_TEXT_INDEXES, FullTextIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search indexes (re-creating missing SQLite FTS tables/triggers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--table', action='append', dest='tables', choices=sorted(FULL_TEXT_INDEXES),
+                            help='Table whose index to rebuild (repeatable). Default: all.')
+        parser.add_argument('--database', default='default', help='Database alias (default: default)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not FullTextIndex.supports(connection):
+            raise CommandError(f"Full-text search is not supported on {connection.vendor}; ?search= uses icontains there.")
+        for table in options['tables'] or FULL_TEXT_INDEXES:
+            index = FULL_TEXT_INDEXES[table]
+            started = time.perf_counter()
+            with transaction.atomic(using=options['database']):
+                created = index.install(connection)
+                if not created:
+                    index.rebuild(connection)
+            note = ' (re-created missing index objects)' if created else ''
+            self.stdout.write(f"{table}: rebuilt in {time.perf_counter() - started:.2f}s{note}")
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import COUNTERS, exact_counts, reconcile, snapshot
+from api.models import ContentCounter
+
+
+class Command(BaseCommand):
+    help = "Recounts the admin dashboard's content counters exactly and stores today's snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--counter', action='append', dest='counters', choices=sorted(COUNTERS),
+                            help='Counter to recount (repeatable). Default: all.')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without changing anything')
+
+    def handle(self, *args, **options):
+        names = options['counters']
+        if options['dry_run']:
+            stored = dict(ContentCounter.objects.values_list('name', 'value'))
+            results = {name: (stored.get(name), value) for name, value in exact_counts(names).items()}
+        else:
+            results = reconcile(names)
+        drifted = 0
+        for name, (stored, exact) in results.items():
+            if stored == exact:
+                self.stdout.write(f"{name:<20} {exact:>10,}")
+            else:
+                drifted += 1
+                was = 'missing' if stored is None else f"{stored:,}"
+                self.stdout.write(self.style.WARNING(f"{name:<20} {exact:>10,}  (was {was})"))
+        if not options['dry_run'] and not names:
+            snapshot({name: exact for name, (_, exact) in results.items()})
+        verb = 'would be corrected' if options['dry_run'] else 'corrected'
+        self.stdout.write(f"{drifted} of {len(results)} counters {verb}.")
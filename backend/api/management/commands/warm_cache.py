@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.warming import default_hosts, default_scheme, warm_endpoints
+
+
+class Command(BaseCommand):
+    help = 'Pre-renders every public list endpoint and page bundle into the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', action='append', dest='hosts',
+                            help='Host to warm for (repeatable). Defaults to CACHE_WARM_HOSTS / ALLOWED_HOSTS.')
+        parser.add_argument('--scheme', choices=['http', 'https'],
+                            help='Request scheme. Defaults to https when SECURE_SSL_REDIRECT is on.')
+        parser.add_argument('--pages', type=int, default=2,
+                            help='Pages to warm per page size (default: 2)')
+        parser.add_argument('--page-size', type=int, action='append', dest='page_sizes', default=[],
+                            help='Extra page_size to warm besides the default (repeatable), e.g. 100')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Re-warm every N seconds instead of exiting (for schedulers/sidecars)')
+
+    def handle(self, *args, **options):
+        hosts = options['hosts'] or default_hosts()
+        scheme = options['scheme'] or default_scheme()
+        while True:
+            self.warm(hosts, scheme, options['pages'], options['page_sizes'])
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def warm(self, hosts, scheme, pages, page_sizes):
+        self.stdout.write(f"Warming cache for {', '.join(hosts)} ({scheme}); times are uncached renders")
+        started = time.perf_counter()
+        count = 0
+        for result in warm_endpoints(hosts, scheme, pages, page_sizes, refresh=True):
+            count += 1
+            line = f"  {result.status}  {result.elapsed_ms:8.1f} ms  {result.host}{result.path}"
+            if result.status == 200:
+                self.stdout.write(line)
+            else:
+                self.stdout.write(self.style.WARNING(line))
+        total = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Warmed {count} responses in {total:.2f}s'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_alter_event_date_alter_event_time_alter_sermon_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', '-id'], name='api_contact_created_a1b7a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', '-id'], name='api_event_date_e524c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sermon',
+            index=models.Index(fields=['-date', '-id'], name='api_sermon_date_b2a20c_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# Indexes as of this migration: table -> ((column, weight), ...). Frozen
+# here, so later changes to api.search do not change this migration.
+# (api.search.install_search_indexes re-creates missing triggers from the
+# current definitions after every migrate.)
+INDEXES = {
+    'api_sermon': (('title', 'A'), ('speaker', 'B'), ('series', 'B'), ('description', 'C')),
+    'api_event': (('title', 'A'), ('category', 'B'), ('location', 'B'), ('description', 'C')),
+}
+
+
+def sqlite_install(table, columns):
+    fts = f"{table}_fts"
+    names = ', '.join(column for column, _ in columns)
+    new = ', '.join(f"new.{column}" for column, _ in columns)
+    old = ', '.join(f"old.{column}" for column, _ in columns)
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        f"INSERT INTO {fts}({fts}) VALUES ('optimize')",
+    ]
+
+
+def sqlite_uninstall(table, columns):
+    fts = f"{table}_fts"
+    return [
+        *(f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ('ai', 'ad', 'au')),
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+
+def postgresql_install(table, columns):
+    vector = ' || '.join(
+        f"setweight(to_tsvector('english'::regconfig, coalesce(\"{column}\", '')), '{weight}')"
+        for column, weight in columns
+    )
+    return [f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (({vector}))"]
+
+
+def postgresql_uninstall(table, columns):
+    return [f"DROP INDEX IF EXISTS {table}_search_gin"]
+
+
+INSTALL = {'sqlite': sqlite_install, 'postgresql': postgresql_install}
+UNINSTALL = {'sqlite': sqlite_uninstall, 'postgresql': postgresql_uninstall}
+
+
+def run(statements_for):
+    def operation(apps, schema_editor):
+        build = statements_for.get(schema_editor.connection.vendor)
+        if build is None:
+            return
+        for table, columns in INDEXES.items():
+            for statement in build(table, columns):
+                schema_editor.execute(statement, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """FTS5 tables + triggers on SQLite, GIN tsvector indexes on PostgreSQL (see api/search.py)."""
+
+    dependencies = [
+        ('api', '0012_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(INSTALL), run(UNINSTALL)),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyHits',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('kind', models.CharField(choices=[('page', 'Page view'), ('api', 'API request')], max_length=4)),
+                ('name', models.CharField(max_length=100)),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'daily hits',
+                'ordering': ['-day', 'kind', 'name'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'kind', 'name'), name='api_dailyhits_day_kind_name_uniq')],
+            },
+        ),
+    ]
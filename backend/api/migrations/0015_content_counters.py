@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:47
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Counters as of this migration: name -> (model label, filter). Frozen here,
+# so later changes to api.counters.COUNTERS do not change this migration.
+COUNTERS = {
+    'events': ('api.Event', {}),
+    'sermons': ('api.Sermon', {}),
+    'ministries': ('api.Ministry', {}),
+    'leadership': ('api.Leadership', {}),
+    'inquiries': ('api.ContactMessage', {}),
+    'unread_inquiries': ('api.ContactMessage', {'is_read': False}),
+}
+
+
+def initialize_counters(apps, schema_editor):
+    counter_model = apps.get_model('api', 'ContentCounter')
+    now = timezone.now()
+    counter_model.objects.bulk_create([
+        counter_model(name=name, value=apps.get_model(label).objects.filter(**lookup).count(), updated_at=now)
+        for name, (label, lookup) in COUNTERS.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_daily_hits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CounterSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('name', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField()),
+            ],
+            options={
+                'ordering': ['-day', 'name'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'name'), name='api_countersnapshot_day_name_uniq')],
+            },
+        ),
+        migrations.RunPython(initialize_counters, migrations.RunPython.noop),
+    ]
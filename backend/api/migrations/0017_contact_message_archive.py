@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:54
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def initialize_counter(apps, schema_editor):
+    # The archive starts empty; the row is created so the counter exists.
+    counter_model = apps.get_model('api', 'ContentCounter')
+    counter_model.objects.bulk_create(
+        [counter_model(name='archived_inquiries', value=0, updated_at=timezone.now())], ignore_conflicts=True,
+    )
+
+
+def remove_counter(apps, schema_editor):
+    apps.get_model('api', 'ContentCounter').objects.filter(name='archived_inquiries').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_journal_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContactMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('is_read', models.BooleanField(default=True)),
+                ('reply_text', models.TextField(blank=True, null=True)),
+                ('replied_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='api_archive_created_925c6d_idx')],
+            },
+        ),
+        migrations.RunPython(initialize_counter, remove_counter),
+    ]
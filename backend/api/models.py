@@ -4,13 +4,15 @@ Django models for the New Gate Chapel church management system.
 This module defines all database models including:
 - Content models (Events, Sermons, Ministries)
 - Configuration models (ChurchInfo, LiveStream, ServiceSchedule)
-- User interaction models (ContactMessage, GivingOption)
+- User interaction models (ContactMessage, ArchivedContactMessage, GivingOption)
 - Static content models (Values, Leadership, HomeFeature)
+- Analytics rollups (DailyHits, ContentCounter, CounterSnapshot)
 
 All models include optimized database indexes for improved query performance.
 """
 
 from django.db import models
+from django.utils import timezone
 
 
 # =============================================================================
@@ -49,6 +51,7 @@ class Event(models.Model):
         ordering = ['-date']
         indexes = [
             models.Index(fields=['-date', 'category']),
+            models.Index(fields=['-date', '-id']),  # keyset pagination
             models.Index(fields=['title']),
         ]
 
@@ -88,6 +91,7 @@ class Sermon(models.Model):
         indexes = [
             models.Index(fields=['-date', 'speaker']),
             models.Index(fields=['series', '-date']),
+            models.Index(fields=['-date', '-id']),  # keyset pagination
         ]
 
     def __str__(self):
@@ -395,7 +399,8 @@ class ContactMessage(models.Model):
         email: Sender's email (indexed)
         subject: Message subject
         message: Message content
-        created_at: Submission timestamp (indexed)
+        created_at: Submission timestamp (indexed; kept when journaled
+            submissions are inserted later)
         is_read: Whether admin has read the message (indexed)
         reply_text: Optional admin reply
         replied_at: Reply timestamp
@@ -404,7 +409,8 @@ class ContactMessage(models.Model):
     email = models.EmailField(db_index=True)
     subject = models.CharField(max_length=200)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Not auto_now_add, which would overwrite the time of journaled submissions.
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     is_read = models.BooleanField(default=False, db_index=True)
     reply_text = models.TextField(blank=True, null=True)
     replied_at = models.DateTimeField(blank=True, null=True)
@@ -414,7 +420,147 @@ class ContactMessage(models.Model):
         indexes = [
             models.Index(fields=['-created_at', 'is_read']),
             models.Index(fields=['email', '-created_at']),
+            models.Index(fields=['-created_at', '-id']),  # keyset pagination
         ]
 
     def __str__(self):
         return f"{self.subject} - {self.name}"
+
+
+class ArchivedContactMessage(models.Model):
+    """
+    Contact messages moved out of the inbox by ``api/archive.py``.
+
+    Old read messages are moved here in batches, so ``ContactMessage`` and
+    its four indexes only hold the messages staff still work on. Rows keep
+    their ``ContactMessage`` id. The inbox lists them only with
+    ``?include_archived=true``, so this table has a single index beyond the
+    primary key, serving that ordering and pruning by age.
+
+    Fields:
+        id: Id the message had in ``ContactMessage``
+        name, email, subject, message, created_at, is_read, reply_text,
+        replied_at: As in ``ContactMessage``
+        archived_at: When the message was moved here
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    is_read = models.BooleanField(default=True)
+    reply_text = models.TextField(blank=True, null=True)
+    replied_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} - {self.name}"
+
+
+class JournalCheckpoint(models.Model):
+    """
+    Last submission-journal entry delivered into ``ContactMessage``.
+
+    Advanced in the same transaction as the inserted messages, so each entry
+    is delivered exactly once (see ``api/journal.py``).
+
+    Fields:
+        journal_id: Id of the journal file
+        last_seq: Highest delivered entry
+        updated_at: Last delivery
+    """
+    journal_id = models.CharField(max_length=36, primary_key=True)
+    last_seq = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.journal_id}: {self.last_seq}"
+
+
+# =============================================================================
+# ANALYTICS MODELS - Traffic rollups
+# =============================================================================
+
+class DailyHits(models.Model):
+    """
+    Request counts per day, written in batches by ``api/analytics.py``.
+
+    Requests are counted in process memory and added to these rows every few
+    seconds, so there is one row per (day, kind, name), never one per request.
+
+    Fields:
+        day: Local date of the requests
+        kind: ``page`` (a page view reported by the frontend) or ``api``
+            (a public API request)
+        name: Page path (``/sermons``) or API URL name (``sermon-list``)
+        hits: Number of requests
+    """
+    PAGE = 'page'
+    ENDPOINT = 'api'
+    KIND_CHOICES = [
+        (PAGE, 'Page view'),
+        (ENDPOINT, 'API request'),
+    ]
+
+    day = models.DateField()
+    kind = models.CharField(max_length=4, choices=KIND_CHOICES)
+    name = models.CharField(max_length=100)
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day', 'kind', 'name']
+        verbose_name_plural = 'daily hits'
+        constraints = [
+            # Also the index for trend queries (day range, then kind).
+            models.UniqueConstraint(fields=['day', 'kind', 'name'], name='api_dailyhits_day_kind_name_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.kind} {self.name}: {self.hits}"
+
+
+class ContentCounter(models.Model):
+    """
+    Row counts shown on the admin dashboard, maintained by ``api/counters.py``.
+
+    Fields:
+        name: Counter name (``events``, ``unread_inquiries``, ...)
+        value: Current count
+        updated_at: Last change
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class CounterSnapshot(models.Model):
+    """
+    Daily copy of each ``ContentCounter``, for period-over-period changes.
+
+    Fields:
+        day: Local date of the snapshot
+        name: Counter name
+        value: Count on that day
+    """
+    day = models.DateField()
+    name = models.CharField(max_length=50)
+    value = models.BigIntegerField()
+
+    class Meta:
+        ordering = ['-day', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'name'], name='api_countersnapshot_day_name_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.name}: {self.value}"
@@ -0,0 +1,263 @@
+"""
+Pagination helpers: cached counts and keyset (cursor) pagination.
+
+``CachedCountPaginator`` is the Django paginator behind
+``StandardResultsSetPagination``. Its total comes from the count cache
+(``api.cache.cached_count``), which is keyed by the filtered query and
+invalidated by the same content versions as the cached responses. On
+PostgreSQL, unfiltered lists of tables larger than
+``PAGINATION_ESTIMATE_COUNT_ABOVE`` rows can report the planner's row
+estimate instead; ``count_exact`` tells which one a response carries.
+
+Keyset (cursor) pagination is meant for large, append-mostly lists.
+
+Page-number pagination runs ``COUNT(*)`` for every page and skips rows with
+``OFFSET``, so deep pages of the sermon archive or the contact inbox get
+slower as the tables grow. ``KeysetPagination`` instead remembers the sort
+key of the last row it returned (an opaque ``cursor``) and asks for the rows
+after it::
+
+    WHERE date <= '2024-03-10' AND (date < '2024-03-10' OR id < 812)
+    ORDER BY date DESC, id DESC
+    LIMIT 21
+
+With an index on the key columns every page costs the same, and no count
+query runs. The key must be unique, so it always ends with the primary key.
+
+Responses look like DRF's ``CursorPagination``::
+
+    {"next": "...?cursor=...", "previous": "...?cursor=...", "results": [...]}
+"""
+
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import cached_count
+
+
+# =============================================================================
+# COUNTS
+# =============================================================================
+
+def estimated_count(queryset):
+    """
+    Planner row estimate for an unfiltered PostgreSQL ``queryset``.
+
+    None when estimates are disabled, the database is not PostgreSQL, the
+    queryset is filtered, or the table is estimated below
+    ``PAGINATION_ESTIMATE_COUNT_ABOVE`` rows (or was never analyzed).
+    """
+    threshold = getattr(settings, 'PAGINATION_ESTIMATE_COUNT_ABOVE', 0)
+    connection = connections[queryset.db]
+    if not threshold or connection.vendor != 'postgresql' or queryset.query.has_filters() or queryset.query.distinct:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    estimate = int(row[0]) if row else -1
+    return estimate if estimate >= threshold else None
+
+
+class EstimatedPage(Page):
+    """Page of a paginator with an estimated count; knows on its own whether more rows follow."""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    def end_index(self):
+        return self.start_index() + len(self) - 1 if len(self) else 0
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Django paginator with a cached (or estimated) ``count``.
+
+    With an estimated count, pages are not checked against ``num_pages``:
+    each page fetches one extra row to know whether another page follows,
+    so a low estimate never hides rows.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return len(queryset)
+        estimate = estimated_count(queryset)
+        if estimate is not None:
+            self._count_exact = False
+            return estimate
+        self._count_exact = True
+        return cached_count(queryset)
+
+    @property
+    def count_exact(self):
+        """Whether ``count`` is exact (False for planner estimates)."""
+        self.count
+        return getattr(self, '_count_exact', True)
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return EstimatedPage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+# =============================================================================
+# KEYSET PAGINATION
+# =============================================================================
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate by a unique sort key instead of page numbers.
+
+    Args:
+        ordering: Key as ``order_by()`` names, e.g. ``('-date', '-id')``;
+            the last one must be the primary key
+        page_size: Rows per page
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering, page_size):
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering if not reverse else tuple(self._flip(name) for name in self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+        rows = list(queryset[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        # Coming from a cursor means there are rows on the side we came from.
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        self.first_key = self.key(rows[0]) if rows else None
+        self.last_key = self.key(rows[-1]) if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_key, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_key, reverse=True)
+
+    # -------------------------------------------------------------------------
+    # Keys and cursors
+    # -------------------------------------------------------------------------
+
+    def key(self, row):
+        """Sort key of a model instance or ``.values()`` row."""
+        if isinstance(row, dict):
+            return tuple(row[name] for name in self.fields)
+        return tuple(getattr(row, name) for name in self.fields)
+
+    def encode_cursor(self, key, reverse):
+        """Link to the rows after (or, with ``reverse``, before) ``key``."""
+        if key is None:
+            # Empty page (the rows around the cursor were deleted): start over.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = [value.isoformat() if hasattr(value, 'isoformat') else value for value in key]
+        payload = json.dumps({'k': position, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """Return ``(position, reverse)`` from the request's cursor (``(None, False)`` on the first page)."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            position, reverse = payload['k'], bool(payload.get('r'))
+            if len(position) != len(self.fields):
+                raise ValueError
+            position = tuple(
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, position)
+            )
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def _flip(name):
+        return name[1:] if name.startswith('-') else '-' + name
+
+    def _after(self, ordering, position):
+        """Filter for the rows that come after ``position`` in ``ordering``."""
+        lookups = [(name.lstrip('-'), 'lt' if name.startswith('-') else 'gt') for name in ordering]
+        after = Q()
+        for i, (name, lookup) in enumerate(lookups):
+            ties = {prior: value for (prior, _), value in zip(lookups[:i], position)}
+            after |= Q(**ties, **{f'{name}__{lookup}': position[i]})
+        # Redundant bound on the leading column, so the database can range-scan the index.
+        first, lookup = lookups[0]
+        return Q(**{f'{first}__{lookup}e': position[0]}) & after
@@ -0,0 +1,53 @@
+"""
+JSON renderer for the New Gate Chapel API.
+
+``FastJSONRenderer`` is a drop-in replacement for DRF's ``JSONRenderer``
+that encodes with ``orjson`` when it is installed, falling back to DRF's
+stdlib-json encoding otherwise (or for anything orjson cannot handle).
+
+The output matches DRF's compact, UTF-8 rendering for API payloads:
+same separators, no ASCII escaping, U+2028/U+2029 escaped, and types JSON
+has no native form for (datetimes, decimals, lazy strings...) are converted
+by DRF's own ``JSONEncoder``. ``?indent``/``Accept: ...; indent=N``
+requests are rendered by DRF. Only floats can differ (``1e-7`` instead of
+``1e-07``, NaN as ``null``); no API field is a float.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+if orjson is not None:
+    # Datetimes, dataclasses and str/int/dict subclasses go through DRF's
+    # encoder (``default``), like they do with stdlib json.
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson when available (see module docstring)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib encoder decide.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same as DRF: keep the output valid inside JavaScript string literals.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
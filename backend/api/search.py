@@ -0,0 +1,313 @@
+"""
+Full-text search for sermons and events.
+
+DRF's ``SearchFilter`` turned ``?search=`` into OR'ed ``icontains`` lookups
+over several columns, a full table scan no index can serve.
+``FullTextSearchFilter`` queries a real full-text index instead:
+
+- SQLite: an FTS5 table per model (``api_sermon_fts``) using the model's
+  table as external content, kept in sync by triggers.
+- PostgreSQL: a GIN index on a weighted ``tsvector`` expression over the
+  searched columns (``api_sermon_search_gin``).
+
+Both are created by migration ``0013`` and maintained by the database on
+every insert, update and delete, including ``bulk_create()`` and
+``QuerySet.update()``. ``python manage.py rebuild_search_index`` rebuilds
+them (and re-creates the SQLite triggers if a table rebuild dropped them).
+
+Every search term must match, as a word prefix, in any of the indexed
+columns. Results are ranked by relevance (BM25 on SQLite, ``ts_rank`` on
+PostgreSQL; title matches weigh most) unless ``?ordering=`` is given, and
+carry a ``snippet`` with the matches wrapped in ``<mark>``. On other
+databases the filter falls back to ``SearchFilter``.
+
+``facet_counts`` counts a (searched, filtered) queryset per value of several
+columns at once, for filter sidebars (``/api/sermons/facets/``).
+"""
+
+import re
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast, ExtractYear, Substr
+from rest_framework import filters
+
+
+# Relative weight of each column class, as BM25 column weights (SQLite) and
+# setweight() labels (PostgreSQL).
+BM25_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 1.0}
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+# Words per snippet (SQLite counts tokens, PostgreSQL words).
+SNIPPET_WORDS = 24
+
+# Extra select names added to searched querysets.
+RANK = 'search_rank'
+SNIPPET = 'search_snippet'
+
+# Further terms are ignored; they would only make the query slower.
+MAX_TERMS = 8
+
+_term_re = re.compile(r'\w+')
+
+
+def search_terms(text):
+    """Words of a search string (lowercased, at most ``MAX_TERMS``)."""
+    return _term_re.findall(text.lower())[:MAX_TERMS]
+
+
+class FullTextIndex:
+    """
+    Full-text index over some text columns of one table.
+
+    Args:
+        table: Database table of the model
+        columns: ``(column, weight)`` pairs; weight is ``'A'`` (highest),
+            ``'B'`` or ``'C'``
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = tuple(columns)
+        self.names = tuple(column for column, _ in self.columns)
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+    @property
+    def gin_index(self):
+        return f"{self.table}_search_gin"
+
+    @staticmethod
+    def supports(connection):
+        return connection.vendor in ('sqlite', 'postgresql')
+
+    # -------------------------------------------------------------------------
+    # Schema
+    # -------------------------------------------------------------------------
+
+    def _sqlite_triggers(self):
+        names = ', '.join(self.names)
+        new = ', '.join(f"new.{name}" for name in self.names)
+        old = ', '.join(f"old.{name}" for name in self.names)
+        insert = f"INSERT INTO {self.fts_table}(rowid, {names}) VALUES (new.id, {new});"
+        delete = (
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {names}) "
+            f"VALUES ('delete', old.id, {old});"
+        )
+        return {
+            f"{self.fts_table}_ai": f"AFTER INSERT ON {self.table} BEGIN {insert} END",
+            f"{self.fts_table}_ad": f"AFTER DELETE ON {self.table} BEGIN {delete} END",
+            f"{self.fts_table}_au": f"AFTER UPDATE OF {names} ON {self.table} BEGIN {delete} {insert} END",
+        }
+
+    def vector_sql(self):
+        """The indexed PostgreSQL ``tsvector`` expression (queries must repeat it verbatim)."""
+        return ' || '.join(
+            f"setweight(to_tsvector('english'::regconfig, coalesce(\"{column}\", '')), '{weight}')"
+            for column, weight in self.columns
+        )
+
+    def install(self, connection):
+        """Create the index (idempotent). Returns True if anything had to be created."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE %s", [f"{self.fts_table}%"])
+                existing = {name for (name,) in cursor.fetchall()}
+                missing = [name for name in (self.fts_table, *self._sqlite_triggers()) if name not in existing]
+                if self.fts_table in missing:
+                    cursor.execute(
+                        f"CREATE VIRTUAL TABLE {self.fts_table} USING fts5({', '.join(self.names)}, "
+                        f"content='{self.table}', content_rowid='id', "
+                        f"tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+                    )
+                for name, body in self._sqlite_triggers().items():
+                    if name in missing:
+                        cursor.execute(f"CREATE TRIGGER {name} {body}")
+                if missing:
+                    self.rebuild(connection)
+                return bool(missing)
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT to_regclass(%s)", [self.gin_index])
+                if cursor.fetchone()[0] is not None:
+                    return False
+                cursor.execute(f"CREATE INDEX {self.gin_index} ON {self.table} USING gin (({self.vector_sql()}))")
+                return True
+        return False
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                for name in self._sqlite_triggers():
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(f"DROP TABLE IF EXISTS {self.fts_table}")
+            elif connection.vendor == 'postgresql':
+                cursor.execute(f"DROP INDEX IF EXISTS {self.gin_index}")
+
+    def rebuild(self, connection):
+        """Rebuild the index contents from the table."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+                cursor.execute(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('optimize')")
+            elif connection.vendor == 'postgresql':
+                cursor.execute(f"REINDEX INDEX {self.gin_index}")
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def search(self, queryset, terms):
+        """
+        Restrict ``queryset`` to rows matching every term (as a word prefix).
+
+        Adds the extra selects ``search_rank`` (higher is better) and
+        ``search_snippet``.
+        """
+        vendor = connections[queryset.db].vendor
+        if vendor == 'sqlite':
+            weights = ', '.join(str(BM25_WEIGHTS[weight]) for _, weight in self.columns)
+            return queryset.extra(
+                tables=[self.fts_table],
+                where=[f"{self.fts_table}.rowid = {self.table}.id", f"{self.fts_table} MATCH %s"],
+                params=[' '.join(f'"{term}"*' for term in terms)],
+                select={
+                    # bm25() is lower for better matches.
+                    RANK: f"-bm25({self.fts_table}, {weights})",
+                    SNIPPET: (
+                        f"snippet({self.fts_table}, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', {SNIPPET_WORDS})"
+                    ),
+                },
+            )
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        query = "to_tsquery('english'::regconfig, %s)"
+        document = ', '.join(f'"{name}"' for name in self.names)
+        options = f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords={SNIPPET_WORDS}, MinWords=8"
+        return queryset.extra(
+            where=[f"({self.vector_sql()}) @@ {query}"],
+            params=[tsquery],
+            select={
+                RANK: f"ts_rank({self.vector_sql()}, {query})",
+                SNIPPET: f"ts_headline('english'::regconfig, concat_ws(' ', {document}), {query}, '{options}')",
+            },
+            select_params=[tsquery, tsquery],
+        )
+
+
+SERMON_INDEX = FullTextIndex('api_sermon', [
+    ('title', 'A'), ('speaker', 'B'), ('series', 'B'), ('description', 'C'),
+])
+EVENT_INDEX = FullTextIndex('api_event', [
+    ('title', 'A'), ('category', 'B'), ('location', 'B'), ('description', 'C'),
+])
+
+FULL_TEXT_INDEXES = {index.table: index for index in (SERMON_INDEX, EVENT_INDEX)}
+
+# The migration that first creates the indexes.
+SEARCH_MIGRATION = ('api', '0013_full_text_search')
+
+
+def install_search_indexes(using='default', **kwargs):
+    """
+    ``post_migrate`` handler: (re)create missing indexes or triggers.
+
+    Django rebuilds SQLite tables (dropping their triggers) for some schema
+    changes; this puts the triggers back and re-indexes that table. Does
+    nothing while migration ``0013`` is not applied (e.g. after migrating
+    back past it).
+    """
+    connection = connections[using]
+    if not FullTextIndex.supports(connection):
+        return
+    if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return
+    tables = set(connection.introspection.table_names())
+    for index in FULL_TEXT_INDEXES.values():
+        if index.table in tables:
+            index.install(connection)
+
+
+def search_snippet(row):
+    """The ``snippet`` of a searched model instance or ``.values()`` row (None otherwise)."""
+    if isinstance(row, dict):
+        return row.get(SNIPPET)
+    return getattr(row, SNIPPET, None)
+
+
+# =============================================================================
+# FACETS
+# =============================================================================
+
+def year_of(field, connection):
+    """Expression for the year of DateField ``field``, as text."""
+    if connection.vendor == 'sqlite':
+        # Dates are stored as ISO text; Django's ExtractYear is a Python
+        # function on SQLite, and several times slower than this.
+        return Substr(Cast(field, CharField()), 1, 4)
+    return Cast(ExtractYear(field), CharField())
+
+
+def facet_counts(queryset, facets):
+    """
+    Count ``queryset`` rows per value of several columns in one query.
+
+    The per-facet ``GROUP BY`` queries are combined with ``UNION ALL``, so
+    each one can be served by its column's index and the database is only
+    visited once. Empty values are left out.
+
+    Args:
+        queryset: Filtered queryset (its ordering is ignored)
+        facets: ``{name: field name or expression}``
+
+    Returns:
+        ``{name: {value: count}}``
+    """
+    queryset = queryset.order_by()
+    parts = [
+        queryset.annotate(facet=Value(name), value=F(field) if isinstance(field, str) else field)
+        .values('facet', 'value').annotate(count=Count('pk')).values_list('facet', 'value', 'count')
+        for name, field in facets.items()
+    ]
+    counts = {name: {} for name in facets}
+    for name, value, count in parts[0].union(*parts[1:], all=True):
+        if value not in (None, ''):
+            counts[name][value] = count
+    return counts
+
+
+# =============================================================================
+# FILTER BACKENDS
+# =============================================================================
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the model's full-text index.
+
+    Falls back to ``SearchFilter`` (``search_fields``) for models without a
+    full-text index or on databases other than SQLite and PostgreSQL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = FULL_TEXT_INDEXES.get(queryset.model._meta.db_table)
+        if index is None or not FullTextIndex.supports(connections[queryset.db]):
+            return super().filter_queryset(request, queryset, view)
+        terms = search_terms(request.query_params.get(self.search_param, ''))
+        if not terms:
+            return queryset
+        return index.search(queryset, terms)
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """``OrderingFilter`` that orders search results by relevance unless ``?ordering=`` is given."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if RANK not in queryset.query.extra_select:
+            return ordering
+        params = request.query_params.get(self.ordering_param, '')
+        if self.remove_invalid_fields(queryset, [param.strip() for param in params.split(',')], view, request):
+            return ordering
+        return ['-' + RANK, *(ordering or ())]
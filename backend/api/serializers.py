@@ -6,23 +6,271 @@ and vice versa. All serializers with image fields include automatic
 absolute URL resolution for proper frontend display.
 
 URL Resolution:
-    Image URLs are converted to absolute URLs using the request context.
-    Falls back to localhost:8000 for development if request unavailable.
+    Serializers with image fields extend MediaModelSerializer, whose image
+    fields render absolute URLs through the per-request MediaURLResolver
+    (``api/media.py``): the media base is computed once, from the
+    ``MEDIA_ORIGIN`` setting or the request, and each URL is a string join.
+
+Fragment Caching:
+    Serializers of models with ``updated_at`` use FragmentCachedListSerializer,
+    which caches each object's representation under (pk, updated_at) so list
+    renders only re-serialize rows that changed.
+
+Read-Optimized Serialization:
+    ``values_serializer(SerializerClass)`` compiles a ModelSerializer into
+    per-field converters that work on ``.values()`` rows, skipping model
+    instantiation and the per-row field graph. Public retrieve actions, the
+    lists of viewsets without fragment caching, and fragment-cache misses
+    use it (see ``ValuesReadMixin`` and ``ValuesRetrieveMixin`` in views);
+    its output renders to the same JSON bytes as the ModelSerializer.
 """
 
+import copy
+import functools
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+from .cache import FRAGMENT_TIMEOUT, fragment_key, record_fragment_stats
+from .inbox import ACTIONS as INBOX_ACTIONS, MAX_BULK_IDS
+from .media import media_resolver
 from .models import (
     Event, Sermon, Ministry, LiveStream, ServiceSchedule,
     GivingOption, Value, Leadership, ChurchInfo, HomeFeature,
-    ContactMessage
+    ContactMessage, ArchivedContactMessage
 )
 
 
+# =============================================================================
+# IMAGE FIELDS
+# =============================================================================
+
+class AbsoluteImageField(serializers.ImageField):
+    """ImageField rendering the absolute URL of the stored image."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return self.represent_name(value.storage, value.name, self.context.get('request'))
+
+    def represent_name(self, storage, name, request):
+        """Representation of the stored file ``name`` (also used for ``.values()`` rows)."""
+        return media_resolver(request).url(storage, name)
+
+
+class MediaModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer whose model ImageFields render absolute URLs."""
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: AbsoluteImageField,
+    }
+
+
+# =============================================================================
+# READ-OPTIMIZED SERIALIZATION
+# =============================================================================
+
+def _iso_datetime(value, tz, fallback):
+    """ISO 8601 rendering of an aware datetime, as DRF's DateTimeField does."""
+    if value.tzinfo is None:
+        return fallback(value)
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer compiled from a ModelSerializer for ``.values()`` rows.
+
+    Each readable field becomes a ``(name, source, converter)`` triple. Plain
+    types (text, integers, booleans, ISO dates and datetimes) use a direct
+    converter; image fields render the stored name through their
+    ``represent_name`` (see IMAGE FIELDS); everything else (choices, JSON,
+    custom formats) calls the DRF field's own ``to_representation`` on the
+    raw value. Custom serializer ``to_representation`` overrides are not
+    reproduced, so only compile serializers without them.
+
+    Args:
+        serializer_class: ModelSerializer subclass whose fields all map to
+            concrete columns of its model
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        columns = {field.name: field for field in self.model._meta.concrete_fields}
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source not in columns:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} does not map to a column of "
+                    f"{self.model.__name__}; it cannot be serialized from .values() rows."
+                )
+            self.fields.append((name, field.source, self._compile(field, columns[field.source])))
+        self.pk_name = self.model._meta.pk.attname
+        self.sources = self._sources(self.fields)
+        self._narrowed = {}
+
+    def _sources(self, fields):
+        """Columns to select: the primary key plus every field's source."""
+        return tuple(dict.fromkeys([self.pk_name, *(source for _, source, _ in fields)]))
+
+    @property
+    def field_names(self):
+        return [name for name, _, _ in self.fields]
+
+    def narrow(self, names):
+        """
+        Copy limited to the fields in ``names`` (kept in serializer order).
+
+        Its ``sources`` only list the selected columns, so ``.values()``
+        queries skip the others.
+        """
+        key = frozenset(names)
+        if key not in self._narrowed:
+            narrowed = copy.copy(self)
+            narrowed.fields = [field for field in self.fields if field[0] in key]
+            narrowed.sources = self._sources(narrowed.fields)
+            narrowed._narrowed = {}
+            self._narrowed[key] = narrowed
+        return self._narrowed[key]
+
+    @staticmethod
+    def _compile(field, model_field):
+        """Return ``converter(value, request)`` reproducing ``field.to_representation``."""
+        if hasattr(field, 'represent_name'):
+            storage = model_field.storage
+            return lambda value, request: field.represent_name(storage, value, request) if value else None
+        if isinstance(field, serializers.FileField):
+            # DRF's FileField: absolute with a request, storage URL without.
+            storage = model_field.storage
+            return lambda value, request: None if not value else (
+                request.build_absolute_uri(storage.url(value)) if request is not None else storage.url(value)
+            )
+        if isinstance(field, serializers.ChoiceField):
+            convert = field.to_representation
+        elif isinstance(field, serializers.BooleanField):
+            convert = bool
+        elif isinstance(field, serializers.IntegerField):
+            convert = int
+        elif isinstance(field, serializers.CharField):
+            convert = str
+        elif (isinstance(field, serializers.DateField)
+                and getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601):
+            convert = lambda value: value if isinstance(value, str) else value.isoformat()
+        elif (isinstance(field, serializers.DateTimeField)
+                and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+                and field.default_timezone() is not None):
+            fixed_tz = getattr(field, 'timezone', None)
+            fallback = field.to_representation
+            convert = lambda value: value if isinstance(value, str) else _iso_datetime(
+                value, fixed_tz or field.default_timezone(), fallback
+            )
+        else:
+            convert = field.to_representation
+        return lambda value, request: None if value is None else convert(value)
+
+    def to_representation(self, row, request=None):
+        """Serialize one ``.values()`` row (a dict keyed by column name)."""
+        return {name: convert(row[source], request) for name, source, convert in self.fields}
+
+    def serialize(self, rows, context=None):
+        """Serialize an iterable of ``.values()`` rows."""
+        request = (context or {}).get('request')
+        fields = self.fields
+        return [
+            {name: convert(row[source], request) for name, source, convert in fields}
+            for row in rows
+        ]
+
+
+@functools.cache
+def values_serializer(serializer_class):
+    """Compiled ``ValuesSerializer`` for ``serializer_class`` (built once per class)."""
+    return ValuesSerializer(serializer_class)
+
+
+# =============================================================================
+# FRAGMENT CACHING
+# =============================================================================
+
+class FragmentCachedListSerializer(serializers.ListSerializer):
+    """
+    List serializer that caches each row's representation by (pk, updated_at).
+
+    Accepts fully loaded instances or instances deferred down to
+    ``id``/``updated_at`` (see ``FragmentCacheMixin`` in views). Cached rows
+    are fetched with one multi-get; deferred misses are loaded as
+    ``.values()`` rows in one query and serialized by ``values_serializer``.
+    Fresh fragments are stored with one multi-set.
+
+    A field selection in ``context['fields']`` (see ``SparseFieldsetMixin``
+    in views) narrows the output and the columns loaded for misses; it is
+    part of the fragment key.
+
+    After ``data`` is accessed, ``fragment_hits``/``fragment_misses`` hold
+    the counts for this render.
+    """
+    fragment_hits = 0
+    fragment_misses = 0
+
+    def to_representation(self, data):
+        instances = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        selection = self.context.get('fields')
+        variant = request.build_absolute_uri('/') if request else ''
+        if selection is not None:
+            variant += '|' + ','.join(sorted(selection))
+        variant = hashlib.md5(variant.encode('utf-8')).hexdigest()[:12]
+
+        keys = [fragment_key(instance, variant) for instance in instances]
+        found = cache.get_many(keys)
+        representations = {
+            instance.pk: found[key] for instance, key in zip(instances, keys) if key in found
+        }
+        missing = [instance for instance in instances if instance.pk not in representations]
+
+        if missing:
+            if any(instance.get_deferred_fields() for instance in missing):
+                fast = values_serializer(type(self.child))
+                if selection is not None:
+                    fast = fast.narrow(selection)
+                rows = fast.model._default_manager.filter(
+                    pk__in=[instance.pk for instance in missing]
+                ).values(*fast.sources)
+                fresh_by_pk = {row[fast.pk_name]: fast.to_representation(row, request) for row in rows}
+            else:
+                fresh_by_pk = {instance.pk: self.child.to_representation(instance) for instance in missing}
+                if selection is not None:
+                    fresh_by_pk = {
+                        pk: {name: value for name, value in representation.items() if name in selection}
+                        for pk, representation in fresh_by_pk.items()
+                    }
+            fresh = {}
+            for instance in missing:
+                if instance.pk in fresh_by_pk:
+                    representations[instance.pk] = fresh_by_pk[instance.pk]
+                    fresh[fragment_key(instance, variant)] = fresh_by_pk[instance.pk]
+            cache.set_many(fresh, FRAGMENT_TIMEOUT)
+
+        self.fragment_hits = len(instances) - len(missing)
+        self.fragment_misses = len(missing)
+        record_fragment_stats(self.fragment_hits, self.fragment_misses)
+        return [representations[instance.pk] for instance in instances if instance.pk in representations]
+
+
 # =============================================================================
 # CONTENT SERIALIZERS - Events, Sermons, Ministries
 # =============================================================================
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(MediaModelSerializer):
     """
     Serializer for Event model.
     
@@ -31,21 +279,10 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
-
-    def to_representation(self, instance):
-        """Convert image path to absolute URL if image exists."""
-        ret = super().to_representation(instance)
-        if instance.image:
-            request = self.context.get('request')
-            if request:
-                ret['image'] = request.build_absolute_uri(instance.image.url)
-            else:
-                # Fallback for development when request context missing
-                ret['image'] = f"http://localhost:8000{instance.image.url}"
-        return ret
+        list_serializer_class = FragmentCachedListSerializer
 
 
-class SermonSerializer(serializers.ModelSerializer):
+class SermonSerializer(MediaModelSerializer):
     """
     Serializer for Sermon model.
     
@@ -54,20 +291,10 @@ class SermonSerializer(serializers.ModelSerializer):
     class Meta:
         model = Sermon
         fields = '__all__'
+        list_serializer_class = FragmentCachedListSerializer
 
-    def to_representation(self, instance):
-        """Convert image path to absolute URL if image exists."""
-        ret = super().to_representation(instance)
-        if instance.image:
-            request = self.context.get('request')
-            if request:
-                ret['image'] = request.build_absolute_uri(instance.image.url)
-            else:
-                ret['image'] = f"http://localhost:8000{instance.image.url}"
-        return ret
 
-
-class MinistrySerializer(serializers.ModelSerializer):
+class MinistrySerializer(MediaModelSerializer):
     """
     Serializer for Ministry model.
     
@@ -76,17 +303,7 @@ class MinistrySerializer(serializers.ModelSerializer):
     class Meta:
         model = Ministry
         fields = '__all__'
-
-    def to_representation(self, instance):
-        """Convert image path to absolute URL if image exists."""
-        ret = super().to_representation(instance)
-        if instance.image:
-            request = self.context.get('request')
-            if request:
-                ret['image'] = request.build_absolute_uri(instance.image.url)
-            else:
-                ret['image'] = f"http://localhost:8000{instance.image.url}"
-        return ret
+        list_serializer_class = FragmentCachedListSerializer
 
 
 # =============================================================================
@@ -121,7 +338,7 @@ class ValueSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class LeadershipSerializer(serializers.ModelSerializer):
+class LeadershipSerializer(MediaModelSerializer):
     """
     Serializer for Leadership model.
     
@@ -131,18 +348,6 @@ class LeadershipSerializer(serializers.ModelSerializer):
     class Meta:
         model = Leadership
         fields = '__all__'
-    
-    def to_representation(self, instance):
-        """Convert image path to absolute URL if image exists."""
-        ret = super().to_representation(instance)
-        if instance.image:
-            request = self.context.get('request')
-            if request:
-                ret['image'] = request.build_absolute_uri(instance.image.url)
-            else:
-                # Fallback for development if request context is missing
-                ret['image'] = f"http://localhost:8000{instance.image.url}"
-        return ret
 
 
 # =============================================================================
@@ -184,3 +389,46 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         model = ContactMessage
         fields = '__all__'
         read_only_fields = ('created_at', 'replied_at')
+
+
+class ArchivedContactMessageSerializer(serializers.ModelSerializer):
+    """
+    Serializer for inbox lists that include archived messages.
+
+    Reads the rows of ``api.archive.merged_inbox`` (dicts); ``archived_at``
+    is null for messages still in the inbox.
+    """
+    class Meta:
+        model = ArchivedContactMessage
+        fields = '__all__'
+
+
+class ContactMessageCriteriaSerializer(serializers.Serializer):
+    """Messages to select for a bulk action (all given criteria must match)."""
+    is_read = serializers.BooleanField(required=False)
+    email = serializers.EmailField(required=False)
+    created_after = serializers.DateField(required=False, help_text='On or after this date')
+    created_before = serializers.DateField(required=False, help_text='Before this date')
+
+
+class ContactMessageBulkSerializer(serializers.Serializer):
+    """
+    Input of ``POST /api/contact-messages/bulk/``.
+
+    Exactly one of ``ids`` and ``filter`` selects the messages:
+        {"action": "mark_read", "ids": [4, 8, 15]}
+        {"action": "delete", "filter": {"is_read": true, "created_before": "2024-01-01"}}
+    """
+    action = serializers.ChoiceField(choices=sorted(INBOX_ACTIONS))
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False,
+        max_length=MAX_BULK_IDS, required=False,
+    )
+    filter = ContactMessageCriteriaSerializer(required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Give either "ids" or "filter".')
+        if 'filter' in attrs and not attrs['filter']:
+            raise serializers.ValidationError({'filter': 'Give at least one criterion.'})
+        return attrs
@@ -0,0 +1,61 @@
+"""
+Model signal handlers for the New Gate Chapel API.
+
+Keeps cached API responses consistent with the database: every save or
+delete of a model in ``VERSIONED_MODELS`` bumps that model's content version
+(see ``api/cache.py``), which invalidates all responses built from it. With
+``CACHE_WARM_AFTER_INVALIDATION`` enabled, the affected endpoints are then
+re-rendered in the background (see ``api/warming.py``). Live stream changes
+also wake this process's event-stream broadcaster (see ``api/broadcaster.py``).
+
+Handlers are connected per model in ``ApiConfig.ready()``
+(``connect_signals``). A receiver without a sender would run for every model
+of every app, and would stop Django from deleting any of them without
+loading the rows first.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .broadcaster import broadcaster
+from .cache import bump_version
+from .models import (
+    Event, Sermon, Ministry, LiveStream, ServiceSchedule,
+    GivingOption, Value, Leadership, ChurchInfo, HomeFeature, ContactMessage
+)
+from .warming import warm_in_background
+
+# Models cached responses and cached list counts are built from. The archive
+# and bookkeeping models are not: archive.py bumps ContactMessage itself.
+VERSIONED_MODELS = (
+    Event, Sermon, Ministry, LiveStream, ServiceSchedule,
+    GivingOption, Value, Leadership, ChurchInfo, HomeFeature, ContactMessage,
+)
+
+
+def bump_content_version(sender, **kwargs):
+    """
+    Invalidate cached responses for the changed model.
+
+    The bump is deferred until the surrounding transaction commits so a
+    concurrent request cannot cache pre-commit data under the new version.
+    """
+    transaction.on_commit(lambda: invalidate(sender))
+
+
+def connect_signals():
+    """Connect ``bump_content_version`` for each of ``VERSIONED_MODELS``."""
+    for model in VERSIONED_MODELS:
+        uid = f"api_bump_version_{model._meta.model_name}"
+        post_save.connect(bump_content_version, sender=model, dispatch_uid=f"{uid}_save")
+        post_delete.connect(bump_content_version, sender=model, dispatch_uid=f"{uid}_delete")
+
+
+def invalidate(model):
+    """Bump the content version of ``model``, push live status, optionally re-warm."""
+    bump_version(model)
+    if model is LiveStream:
+        broadcaster.notify()
+    if getattr(settings, 'CACHE_WARM_AFTER_INVALIDATION', False):
+        warm_in_background([model])
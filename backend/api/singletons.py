@@ -0,0 +1,76 @@
+"""
+In-process caches for single-row configuration tables.
+
+``ChurchInfo`` and ``LiveStream`` are read on almost every page but change a
+handful of times a week. Each worker keeps the loaded rows in memory and
+revalidates them with one lookup of the model's content version (see
+``api/cache.py``) in the shared cache. The database is only queried after a
+save or delete has bumped the version.
+
+Usage:
+    from .singletons import church_info, live_streams
+
+    info = church_info.get()        # ChurchInfo instance (created if missing)
+    streams = live_streams.get()    # tuple of LiveStream instances
+"""
+
+import threading
+
+from .cache import get_versions
+from .models import ChurchInfo, LiveStream
+
+
+class SingletonCache:
+    """
+    Process-local copy of a small table, revalidated by content version.
+
+    Args:
+        model: Model whose content version guards the copy
+        load: Callable returning the value to cache (runs on version change)
+    """
+
+    def __init__(self, model, load):
+        self.model = model
+        self.load = load
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+
+    def get(self):
+        """Return the cached value, reloading it if the model has changed."""
+        (version,) = get_versions(self.model)
+        if version == self._version:
+            return self._value
+        with self._lock:
+            if version != self._version:
+                # Version is read before loading: if the row changes while we
+                # load, the next call sees a newer version and reloads again.
+                self._value = self.load()
+                self._version = version
+        return self._value
+
+    def clear(self):
+        """Drop the process-local copy (next ``get`` reloads)."""
+        with self._lock:
+            self._version = None
+            self._value = None
+
+
+def _load_church_info():
+    """The ChurchInfo singleton, created with defaults if none exists."""
+    instance = ChurchInfo.objects.first()
+    if instance is None:
+        instance = ChurchInfo.objects.create()
+    return instance
+
+
+def _load_live_streams():
+    """All stream configurations, creating the default one if none exists."""
+    streams = tuple(LiveStream.objects.all())
+    if not streams:
+        streams = (LiveStream.objects.create(title="Sunday Service", status="offline"),)
+    return streams
+
+
+church_info = SingletonCache(ChurchInfo, _load_church_info)
+live_streams = SingletonCache(LiveStream, _load_live_streams)
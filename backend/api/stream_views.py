@@ -0,0 +1,56 @@
+"""
+Server-Sent Events endpoints for the New Gate Chapel API.
+
+API Endpoints:
+    /api/livestream/events/ - Live stream status, pushed whenever it changes
+
+Each event carries the same list of stream configurations as the
+``results`` of ``/api/livestream/``:
+
+    retry: 5000
+
+    data: [{"id": 1, "title": "Sunday Service", "status": "live", ...}]
+
+    : keepalive
+
+Streaming needs the ASGI application (``config/asgi.py``). Under WSGI a
+long-lived response would tie up a sync worker, so the endpoint answers
+503 and clients fall back to polling ``/api/livestream/``.
+"""
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .broadcaster import broadcaster
+
+# Reconnect delay (ms) browsers use after a dropped connection.
+RECONNECT_DELAY_MS = 5000
+
+
+@require_GET
+async def livestream_events(request):
+    """
+    Stream live stream status to the client (public, no caching).
+
+    Returns:
+        text/event-stream response, or 503 when not served over ASGI
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'detail': 'Live updates are unavailable; poll /api/livestream/ instead.'},
+            status=503,
+        )
+    response = StreamingHttpResponse(_event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+
+async def _event_stream():
+    yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+    async for payload in broadcaster.subscribe():
+        if payload is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"data: {payload}\n\n"
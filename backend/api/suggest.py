@@ -0,0 +1,235 @@
+"""
+In-memory type-ahead suggestions for the sermon archive.
+
+``/api/sermons/suggest/?q=`` answers every keystroke of the sermon search
+box. Running the full list endpoint for each one would cost a query,
+serialization and a whole page of JSON. Instead each worker keeps the
+distinct sermon titles, speakers and series in a sorted list of normalized
+keys (one key per word start, so ``"fai"`` finds ``"Walking in Faith"``)
+and answers with a ``bisect`` prefix scan, in a few microseconds.
+
+The index is revalidated like the singleton caches (``api/singletons.py``):
+one content-version lookup in the shared cache per request. After a sermon
+changes it is updated incrementally. The rows saved since the last sync and
+the current id list are read, and only the changed values are added or
+removed. ``QuerySet.update()`` does not touch ``updated_at``; rows changed
+that way are picked up by the next full rebuild (``SermonSuggestions.clear()``
+or a restart).
+"""
+
+import bisect
+import datetime
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+from .cache import get_versions
+from .models import Sermon
+
+
+# Sermon columns offered as suggestions (the suggestion ``type``).
+SUGGESTION_FIELDS = ('title', 'speaker', 'series')
+# Tie-break between equally ranked suggestions of different types.
+TYPE_ORDER = {'speaker': 0, 'series': 1, 'title': 2}
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# Index keys are truncated to this many characters (bounds memory; prefixes
+# typed into a search box are much shorter).
+KEY_LENGTH = 32
+# Words shorter than this do not start keys of their own ("in", "of").
+MIN_WORD_LENGTH = 3
+# Most keys examined per lookup.
+MAX_SCAN = 2000
+# Answers kept per index state. Short prefixes match thousands of keys, but
+# there are few of them and they repeat, so they are only ranked once.
+MEMO_SIZE = 4096
+
+# More new sermons than this since the last sync (an import): rebuild instead.
+REBUILD_ABOVE = 500
+
+# Rows saved up to this long before the previous sync are re-read, to cover
+# clock differences between workers (re-applying a row is a no-op).
+SYNC_SLACK = datetime.timedelta(seconds=5)
+
+_word_re = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Casefolded words of ``text`` without accents, separated by single spaces."""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_word_re.findall(text.casefold()))
+
+
+class SuggestionIndex:
+    """
+    Sorted prefix index of ``(kind, value)`` suggestions with usage counts.
+
+    Not thread-safe on its own; ``SermonSuggestions`` serializes writers.
+    """
+
+    def __init__(self):
+        self._keys = []  # sorted (key, kind, value, key starts at the first word)
+        self.counts = Counter()
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    @staticmethod
+    def _entry_keys(kind, value):
+        text = normalize(value)
+        starts = [match.start() for match in _word_re.finditer(text)
+                  if match.start() == 0 or len(match.group()) >= MIN_WORD_LENGTH]
+        return [(text[start:start + KEY_LENGTH], kind, value, start == 0) for start in starts]
+
+    def add(self, kind, value, count=1):
+        if not value:
+            return
+        self._memo = {}
+        self.counts[kind, value] += count
+        if self.counts[kind, value] == count:
+            for key in self._entry_keys(kind, value):
+                bisect.insort(self._keys, key)
+
+    def discard(self, kind, value, count=1):
+        if not value or (kind, value) not in self.counts:
+            return
+        self._memo = {}
+        self.counts[kind, value] -= count
+        if self.counts[kind, value] <= 0:
+            del self.counts[kind, value]
+            for key in self._entry_keys(kind, value):
+                position = bisect.bisect_left(self._keys, key)
+                if position < len(self._keys) and self._keys[position] == key:
+                    del self._keys[position]
+
+    def load(self, counts):
+        """Replace the contents with ``{(kind, value): count}`` (one sort instead of inserts)."""
+        self.counts = Counter({entry: count for entry, count in counts.items() if entry[1] and count > 0})
+        self._keys = sorted(key for kind, value in self.counts for key in self._entry_keys(kind, value))
+        self._memo = {}
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        """
+        Best ``limit`` suggestions whose words start with ``query``.
+
+        Values that start with the query come first, then the ones used by
+        the most sermons.
+
+        Returns:
+            List of ``(kind, value, count)``
+        """
+        prefix = normalize(query)[:KEY_LENGTH]
+        if not prefix:
+            return []
+        memo = self._memo
+        found = memo.get((prefix, limit))
+        if found is None:
+            if len(memo) >= MEMO_SIZE:
+                memo.clear()
+            found = memo[prefix, limit] = self._rank(prefix, limit)
+        return found
+
+    def _rank(self, prefix, limit):
+        keys = self._keys
+        start = bisect.bisect_left(keys, (prefix,))
+        best = {}
+        for position in range(start, min(start + MAX_SCAN, len(keys))):
+            key, kind, value, leading = keys[position]
+            if not key.startswith(prefix):
+                break
+            score = (not leading, -self.counts[kind, value], TYPE_ORDER[kind], value)
+            if (kind, value) not in best or score < best[kind, value]:
+                best[kind, value] = score
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        return [(kind, value, self.counts[kind, value]) for (kind, value), _ in ranked]
+
+
+class SermonSuggestions:
+    """Process-local ``SuggestionIndex`` of sermon titles, speakers and series."""
+
+    def __init__(self):
+        self.index = SuggestionIndex()
+        self._lock = threading.Lock()
+        self._version = None
+        self._rows = {}  # id -> values of SUGGESTION_FIELDS
+        self._synced_at = None  # newest updated_at seen
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        self.sync()
+        return self.index.lookup(query, limit)
+
+    def sync(self):
+        """Bring the index up to date with the current sermon content version."""
+        (version,) = get_versions(Sermon)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            if self._version is None:
+                self._rebuild()
+            else:
+                self._update()
+            self._version = version
+
+    def clear(self):
+        """Drop the index (next lookup rebuilds it)."""
+        with self._lock:
+            self.index = SuggestionIndex()
+            self._version = None
+            self._rows = {}
+            self._synced_at = None
+
+    def _rebuild(self):
+        counts = Counter()
+        rows = {}
+        for pk, updated_at, *values in Sermon.objects.values_list('id', 'updated_at', *SUGGESTION_FIELDS).iterator():
+            rows[pk] = tuple(values)
+            self._seen(updated_at)
+            for kind, value in zip(SUGGESTION_FIELDS, values):
+                counts[kind, value] += 1
+        self.index.load(counts)
+        self._rows = rows
+
+    def _update(self):
+        ids = set(Sermon.objects.values_list('id', flat=True))
+        added = ids - self._rows.keys()
+        if len(added) > REBUILD_ABOVE:
+            self._rebuild()
+            return
+        for pk in self._rows.keys() - ids:
+            self._apply(pk, None)
+        queryset = Sermon.objects.filter(pk__in=added)
+        if self._synced_at is not None:
+            queryset |= Sermon.objects.filter(updated_at__gte=self._synced_at - SYNC_SLACK)
+        for pk, updated_at, *values in queryset.values_list('id', 'updated_at', *SUGGESTION_FIELDS):
+            self._seen(updated_at)
+            self._apply(pk, tuple(values))
+
+    def _apply(self, pk, values):
+        """Replace the indexed values of sermon ``pk`` (None when it was deleted)."""
+        previous = self._rows.pop(pk, None)
+        if previous == values:
+            if values is not None:
+                self._rows[pk] = values
+            return
+        if previous is not None:
+            for kind, value in zip(SUGGESTION_FIELDS, previous):
+                self.index.discard(kind, value)
+        if values is not None:
+            self._rows[pk] = values
+            for kind, value in zip(SUGGESTION_FIELDS, values):
+                self.index.add(kind, value)
+
+    def _seen(self, updated_at):
+        if self._synced_at is None or updated_at > self._synced_at:
+            self._synced_at = updated_at
+
+
+sermon_suggestions = SermonSuggestions()
@@ -1,3 +1,1517 @@
-from django.test import TestCase
+"""
+Tests for the New Gate Chapel API.
 
-# Create your tests here.
+Each test class uses its own local-memory cache (``TEST_CACHES``), so cached
+responses, content versions and rebuild locks never leak between tests or
+into the development cache. Cache warming after invalidation is off: it
+would request the API from background threads while a test runs.
+
+Run with:
+    python manage.py test api
+"""
+
+import base64
+import json
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils.http import http_date
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .analytics import HitRecordingMiddleware, hit_buffer, write_rollups
+from .archive import archivable, archive, move_batch, prune
+from .broadcaster import broadcaster
+from .cache import (
+    REFRESH_FLAG, acquire_rebuild_lock, bump_version, cache_response, cached_count, fragment_stats,
+    get_or_build,
+)
+from .cache_backends import SQLiteCache
+from .renderers import FastJSONRenderer
+from .counters import COUNTERS, counter_values, exact_counts
+from .inbox import MAX_BULK_IDS, delete, run_bulk_action, select_messages
+from .journal import SubmissionJournal, deliver
+from .models import (
+    ArchivedContactMessage, ContactMessage, DailyHits, Event, GivingOption, HomeFeature,
+    JournalCheckpoint, Leadership, Ministry, Sermon, ServiceSchedule, Value,
+)
+from .pagination import CachedCountPaginator, estimated_count
+from .search import facet_counts
+from .serializers import EventSerializer, values_serializer
+from .singletons import church_info, live_streams
+from .suggest import SuggestionIndex, sermon_suggestions
+from .views import (
+    EventViewSet, GivingOptionViewSet, HomeFeatureViewSet, LeadershipViewSet, MinistryViewSet,
+    SermonViewSet, ServiceScheduleViewSet, ValueViewSet,
+)
+from .warming import warm_endpoints
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'newgate-tests',
+    }
+}
+
+
+def latest_migration(app_label='api'):
+    """``(app_label, name)`` of the app's newest migration."""
+    executor = MigrationExecutor(connection)
+    return next(node for node in executor.loader.graph.leaf_nodes() if node[0] == app_label)
+
+
+def migrate(*target):
+    """Migrate the test database to ``target`` (e.g. ``('api', None)`` for zero)."""
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate([target])
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class MigrationTests(TransactionTestCase):
+    """Data migrations must run on an empty database and on existing rows."""
+
+    def tearDown(self):
+        migrate(*latest_migration())
+
+    def test_migrate_from_empty_database(self):
+        migrate('api', None)
+        migrate(*latest_migration())
+
+        self.assertEqual(counter_values(), dict.fromkeys(COUNTERS, 0))
+
+    def test_counters_initialized_from_existing_rows(self):
+        migrate('api', '0014_daily_hits')
+        old_apps = MigrationExecutor(connection).loader.project_state(('api', '0014_daily_hits')).apps
+        messages = old_apps.get_model('api', 'ContactMessage')
+        for is_read in (True, False, False):
+            messages.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='Hello', is_read=is_read)
+
+        migrate(*latest_migration())
+
+        counts = counter_values()
+        self.assertEqual(counts['inquiries'], 3)
+        self.assertEqual(counts['unread_inquiries'], 2)
+        self.assertEqual(counts['archived_inquiries'], 0)
+        self.assertEqual(counts, exact_counts())
+
+    def test_search_index_built_from_existing_rows(self):
+        migrate('api', '0012_keyset_pagination_indexes')
+        self.assertNotIn('api_sermon_fts', connection.introspection.table_names())
+        old_apps = MigrationExecutor(connection).loader.project_state(('api', '0012_keyset_pagination_indexes')).apps
+        old_apps.get_model('api', 'Sermon').objects.create(
+            title='Faith and Works', date='2024-03-10', speaker='Pastor Ben', description='James 2.')
+
+        migrate(*latest_migration())
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM api_sermon_fts WHERE api_sermon_fts MATCH 'works'")
+            self.assertEqual(len(cursor.fetchall()), 1)
+
+
+def submission(number):
+    return {'name': f'Visitor {number}', 'email': f'visitor{number}@example.com',
+            'subject': 'Prayer request', 'message': 'Please pray for us.'}
+
+
+# =============================================================================
+# CONTACT JOURNAL
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class JournalDeliveryTests(TestCase):
+    """Journaled submissions reach ``ContactMessage`` exactly once."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal = SubmissionJournal(Path(directory.name) / 'journal.sqlite3')
+
+    def checkpoint(self):
+        return JournalCheckpoint.objects.get(journal_id=self.journal.id).last_seq
+
+    def test_delivers_each_entry_once(self):
+        seqs = [self.journal.append(submission(n)) for n in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal), 0)
+
+        self.assertEqual(ContactMessage.objects.count(), 3)
+        self.assertEqual(self.checkpoint(), seqs[-1])
+        self.assertEqual(self.journal.pending(), 0)
+        self.assertEqual(counter_values(), exact_counts())
+
+    def test_delivers_in_batches(self):
+        for n in range(5):
+            self.journal.append(submission(n))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal, limit=2), 2)
+        self.assertEqual(self.journal.pending(), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal, limit=10), 3)
+
+        names = sorted(ContactMessage.objects.values_list('name', flat=True))
+        self.assertEqual(names, [f'Visitor {n}' for n in range(5)])
+
+    def test_keeps_submission_time(self):
+        self.journal.append(submission(1))
+        (_, _, submitted_at), = self.journal.read_after(0, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver(self.journal)
+
+        self.assertEqual(ContactMessage.objects.get().created_at, submitted_at)
+
+    def test_crash_before_discard_does_not_redeliver(self):
+        self.journal.append(submission(1))
+
+        # The delivery commits, but the process dies before the on_commit
+        # callback removes the entry from the journal.
+        with self.captureOnCommitCallbacks(execute=False):
+            deliver(self.journal)
+        self.assertEqual(self.journal.pending(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal), 0)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(self.journal.pending(), 0)
+
+    def test_failed_delivery_leaves_entries_pending(self):
+        self.journal.append(submission(1))
+
+        with mock.patch('api.journal.adjust', side_effect=RuntimeError('database went away')):
+            with self.assertRaises(RuntimeError):
+                deliver(self.journal)
+
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(JournalCheckpoint.objects.filter(journal_id=self.journal.id, last_seq__gt=0).exists())
+        self.assertEqual(self.journal.pending(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(self.journal), 1)
+        self.assertEqual(self.journal.pending(), 0)
+
+    def test_new_journal_file_gets_its_own_checkpoint(self):
+        self.journal.append(submission(1))
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver(self.journal)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        other = SubmissionJournal(Path(directory.name) / 'journal.sqlite3')
+        other.append(submission(2))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(deliver(other), 1)
+
+        self.assertNotEqual(other.id, self.journal.id)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+
+# =============================================================================
+# DASHBOARD COUNTERS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class CounterTests(TestCase):
+    """Counters match ``COUNT(*)`` after every kind of inbox write."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user('staff', password='secret'))
+        self.messages = [
+            ContactMessage.objects.create(is_read=n % 3 == 0, **submission(n)) for n in range(12)
+        ]
+
+    def bulk(self, **data):
+        response = self.client.post('/api/contact-messages/bulk/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def assertCountersExact(self):
+        self.assertEqual(counter_values(), exact_counts())
+
+    def test_single_writes(self):
+        message = self.messages[1]
+        message.is_read = True
+        message.save()
+        self.messages[2].delete()
+
+        self.assertCountersExact()
+
+    def test_bulk_mark_read_and_unread(self):
+        result = self.bulk(action='mark_read', filter={'is_read': False})
+        self.assertEqual(result['affected'], 8)
+        self.assertEqual(result['unread'], 0)
+        self.assertCountersExact()
+
+        result = self.bulk(action='mark_unread', ids=[message.pk for message in self.messages[:4]])
+        self.assertEqual(result['affected'], 4)
+        self.assertEqual(result['unread'], 4)
+        self.assertCountersExact()
+
+    def test_bulk_delete(self):
+        result = self.bulk(action='delete', ids=[message.pk for message in self.messages[:5]])
+
+        self.assertEqual(result['affected'], 5)
+        self.assertEqual(counter_values()['inquiries'], 7)
+        self.assertCountersExact()
+
+    def test_bulk_delete_is_set_based(self):
+        # 1 aggregate, 1 DELETE, 1 UPDATE per counter, however many messages.
+        with self.assertNumQueries(4):
+            self.assertEqual(delete(select_messages(criteria={'email': 'visitor1@example.com'})), 1)
+        with self.assertNumQueries(4):
+            self.assertEqual(delete(select_messages(ids=[message.pk for message in self.messages[2:]])), 10)
+        self.assertCountersExact()
+
+    def test_bulk_action_invalidates_once(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            run_bulk_action('delete', select_messages(criteria={'is_read': False}))
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_bulk_archive(self):
+        result = self.bulk(action='archive', ids=[message.pk for message in self.messages[:5]])
+
+        self.assertEqual(result['affected'], 5)
+        self.assertEqual(ArchivedContactMessage.objects.count(), 5)
+        self.assertCountersExact()
+
+    def test_archive_and_prune(self):
+        ContactMessage.objects.filter(pk__lte=self.messages[5].pk).update(created_at=timezone.now() - timedelta(days=400))
+
+        self.assertEqual(archive(archivable(days=180), batch_size=1), 2)
+        self.assertEqual(set(ArchivedContactMessage.objects.values_list('pk', flat=True)),
+                         {self.messages[0].pk, self.messages[3].pk})
+        self.assertCountersExact()
+
+        self.assertEqual(prune(days=365, batch_size=1), 2)
+        self.assertFalse(ArchivedContactMessage.objects.exists())
+        self.assertCountersExact()
+
+    def test_archive_batch_is_set_based(self):
+        # SELECT, INSERT, DELETE, then 1 UPDATE per counter, however many messages.
+        with self.assertNumQueries(6):
+            self.assertEqual(move_batch(ContactMessage.objects.all()), 12)
+        self.assertCountersExact()
+
+    def test_prune_deletes_each_batch_with_one_statement(self):
+        archive(ContactMessage.objects.all())
+        ArchivedContactMessage.objects.update(created_at=timezone.now() - timedelta(days=400))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(prune(days=365, batch_size=5), 12)
+
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+        self.assertCountersExact()
+
+    def test_archive_command(self):
+        ContactMessage.objects.update(created_at=timezone.now() - timedelta(days=400))
+        read = ContactMessage.objects.filter(is_read=True).count()
+
+        call_command('archive_contact_messages', older_than=180, stdout=StringIO())
+
+        self.assertEqual(ArchivedContactMessage.objects.count(), read)
+        self.assertFalse(ContactMessage.objects.filter(is_read=True).exists())
+        self.assertCountersExact()
+
+    def test_inbox_lists_archived_messages_on_request(self):
+        archive(ContactMessage.objects.filter(pk__in=[message.pk for message in self.messages[:3]]))
+
+        inbox = self.client.get('/api/contact-messages/', {'page_size': 100}).data
+        merged = self.client.get('/api/contact-messages/', {'page_size': 100, 'include_archived': 'true'}).data
+
+        self.assertEqual(inbox['count'], 9)
+        self.assertEqual(merged['count'], 12)
+        archived = {row['id'] for row in merged['results'] if row['archived_at'] is not None}
+        self.assertEqual(archived, {message.pk for message in self.messages[:3]})
+
+
+# =============================================================================
+# KEYSET PAGINATION
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class KeysetPaginationTests(TestCase):
+    """``?pagination=cursor`` pages over the inbox by ``(-created_at, -id)``."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user('staff', password='secret'))
+        now = timezone.now()
+        # Three submissions per timestamp: pages must break ties by id.
+        ContactMessage.objects.bulk_create([
+            ContactMessage(created_at=now - timedelta(minutes=n // 3), **submission(n)) for n in range(8)
+        ])
+        self.expected = list(ContactMessage.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def page(self, link=None, **params):
+        """First page for ``params``, or the page a ``next``/``previous`` link points to."""
+        if link is None:
+            response = self.client.get('/api/contact-messages/', {'pagination': 'cursor', 'page_size': 3, **params})
+        else:
+            response = self.client.get(link)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def ids(self, page):
+        return [row['id'] for row in page['results']]
+
+    def cursor(self, position, reverse=False):
+        payload = json.dumps({'k': position, 'r': int(reverse)}).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    def test_walks_every_row_once(self):
+        page = self.page()
+        self.assertIsNone(page['previous'])
+        self.assertNotIn('count', page)
+        seen = self.ids(page)
+        while page['next']:
+            page = self.page(page['next'])
+            seen += self.ids(page)
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(self.ids(page)), 2)
+        self.assertIsNone(page['next'])
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.page()
+        second = self.page(first['next'])
+        third = self.page(second['next'])
+
+        self.assertEqual(self.ids(self.page(third['previous'])), self.ids(second))
+        self.assertEqual(self.ids(self.page(second['previous'])), self.ids(first))
+        self.assertIsNone(self.page(second['previous'])['previous'])
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        first = self.page()
+        ContactMessage.objects.create(**submission(99))
+
+        self.assertEqual(self.ids(self.page(first['next'])), self.expected[3:6])
+
+    def test_last_row_of_the_table(self):
+        last = ContactMessage.objects.get(pk=self.expected[-1])
+        page = self.page(cursor=self.cursor([last.created_at.isoformat(), last.pk]))
+
+        self.assertEqual(page['results'], [])
+        self.assertIsNone(page['next'])
+        self.assertIsNotNone(page['previous'])
+
+    def test_empty_list(self):
+        page = self.page(search='nobody')
+
+        self.assertEqual(page['results'], [])
+        self.assertIsNone(page['next'])
+        self.assertIsNone(page['previous'])
+
+    def test_invalid_cursors(self):
+        now = timezone.now().isoformat()
+        for cursor in ('not-base64!', self.cursor([now]), self.cursor(['yesterday', 1]),
+                       self.cursor([now, 'one']), base64.urlsafe_b64encode(b'[]').decode('ascii')):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/contact-messages/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class CountingView:
+    """View function that counts its calls and can be held inside the view."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return HttpResponse(f'render {calls}', content_type='text/plain')
+
+
+def run_concurrently(function, times):
+    """Call ``function()`` from ``times`` threads at once; return the results."""
+    barrier = threading.Barrier(times)
+    results = [None] * times
+
+    def _run(i):
+        barrier.wait()
+        results[i] = function()
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(times)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class SingleFlightTests(SimpleTestCase):
+    """Concurrent misses of one key run the build once."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_get_or_build_builds_once(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = run_concurrently(lambda: get_or_build('test:key', build, 60), 8)
+
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(cache.get('test:key'), 'value')
+
+    def test_get_or_build_releases_the_lock_when_the_build_fails(self):
+        def fail():
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            get_or_build('test:key', fail, 60)
+
+        self.assertEqual(get_or_build('test:key', lambda: 'value', 60), 'value')
+
+    def test_builds_itself_when_the_rebuild_stalls(self):
+        # Another worker took the lock and never finished: wait REBUILD_WAIT, then build.
+        acquire_rebuild_lock('test:key')
+
+        self.assertEqual(get_or_build('test:key', lambda: 'value', 60), 'value')
+
+    def test_cache_response_renders_once(self):
+        view = CountingView(delay=0.2)
+        cached = cache_response(60)(view)
+
+        responses = run_concurrently(lambda: cached(self.factory.get('/api/test/')), 8)
+
+        self.assertEqual(view.calls, 1)
+        self.assertEqual({response.content for response in responses}, {b'render 1'})
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class StaleWhileRevalidateTests(SimpleTestCase):
+    """Stale entries are served at once while one background refresh re-renders them."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.view = CountingView()
+        self.cached = cache_response(60, stale_timeout=60)(self.view)
+        self.cached(self.factory.get('/api/test/'))
+        patcher = mock.patch('api.warming.refresh_in_background')
+        self.refresh = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_later(self, seconds, **meta):
+        with mock.patch('time.time', return_value=time.time() + seconds):
+            return self.cached(self.factory.get('/api/test/', **meta))
+
+    def test_fresh_entry_does_not_refresh(self):
+        response = self.get_later(30)
+
+        self.assertEqual(response.content, b'render 1')
+        self.refresh.assert_not_called()
+
+    def test_stale_entry_is_served_and_refreshed_once(self):
+        responses = [self.get_later(90) for _ in range(3)]
+
+        self.assertEqual({response.content for response in responses}, {b'render 1'})
+        self.assertEqual(self.view.calls, 1)
+        self.refresh.assert_called_once()
+        self.assertEqual(self.refresh.call_args.kwargs['meta'], {REFRESH_FLAG: True})
+
+    def test_refresh_replaces_the_entry(self):
+        self.get_later(90)
+        on_done = self.refresh.call_args.kwargs['on_done']
+
+        # What the background refresh does: render with the refresh flag.
+        self.get_later(90, **{REFRESH_FLAG: True})
+        on_done()
+
+        self.assertEqual(self.get_later(90).content, b'render 2')
+        self.refresh.assert_called_once()
+
+    def test_next_stale_period_refreshes_again(self):
+        self.get_later(90)
+        self.refresh.call_args.kwargs['on_done']()
+        self.get_later(100)
+
+        self.assertEqual(self.refresh.call_count, 2)
+
+
+# =============================================================================
+# CONDITIONAL GET
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class ConditionalGetTests(TestCase):
+    """Revalidation is answered from content versions, before any query runs."""
+
+    url = '/api/values/'
+
+    def setUp(self):
+        cache.clear()
+        # A clock the tests move: Last-Modified depends on the current second.
+        self.now = int(time.time()) + 0.2
+        patcher = mock.patch('time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Value.objects.create(title='Faith', description='We believe.')
+        bump_version(Value)
+        self.client = APIClient()
+        self.now += 1
+        self.first = self.client.get(self.url)
+
+    def test_sets_validators(self):
+        self.assertEqual(self.first.status_code, 200)
+        self.assertTrue(self.first.has_header('ETag'))
+        self.assertTrue(self.first.has_header('Last-Modified'))
+
+    def test_matching_etag_is_not_modified(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.first['ETag'])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.first['ETag'])
+
+    def test_unchanged_since_last_modified_is_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=self.first['Last-Modified'])
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_last_modified_within_the_changed_second(self):
+        second = int(self.now)
+        bump_version(Value)
+        self.now += 0.3
+        during = self.client.get(self.url)
+        self.now += 0.3
+        bump_version(Value)  # same second: its HTTP date would be the same
+        self.now += 1
+        after = self.client.get(self.url)
+
+        self.assertFalse(during.has_header('Last-Modified'))
+        self.assertEqual(after['Last-Modified'], http_date(second))
+
+        self.now += 0.2
+        bump_version(Value)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=after['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_edit_changes_the_etag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Value.objects.create(title='Hope', description='We hope.')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.first['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], self.first['ETag'])
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_compressed_miss_and_hit_send_the_same_weak_etag(self):
+        Value.objects.bulk_create([Value(title=f'Value {n}', description='We believe. ' * 20) for n in range(5)])
+        cache.clear()  # new content version: the next request is a miss
+
+        miss = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        hit = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        plain = self.client.get(self.url)
+
+        self.assertEqual(miss['Content-Encoding'], 'gzip')
+        self.assertEqual(hit['Content-Encoding'], 'gzip')
+        self.assertTrue(miss['ETag'].startswith('W/"'))
+        self.assertEqual(hit['ETag'], miss['ETag'])
+        self.assertEqual(plain['ETag'], miss['ETag'][2:])
+        revalidated = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=miss['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_other_urls_have_other_etags(self):
+        response = self.client.get(self.url, {'page_size': 5}, HTTP_IF_NONE_MATCH=self.first['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+
+
+# =============================================================================
+# REQUEST ANALYTICS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class HitRecordingTests(TestCase):
+    """Hits are buffered in the process; only a started flusher writes them."""
+
+    def setUp(self):
+        cache.clear()
+        hit_buffer.drain()
+        self.addCleanup(hit_buffer.drain)
+        self.factory = RequestFactory()
+
+    def buffered(self):
+        counts = hit_buffer.drain()
+        return {name: hits for (_, kind, name), hits in counts.items() if kind == DailyHits.ENDPOINT}
+
+    def request(self, path, **extra):
+        request = self.factory.get(path, **extra)
+        request.resolver_match = resolve(path)
+        return request
+
+    def test_counts_anonymous_api_reads(self):
+        self.client.get('/api/values/')
+        self.client.get('/api/values/')
+        self.client.get('/api/values/', HTTP_AUTHORIZATION='Bearer staff')
+
+        self.assertEqual(self.buffered(), {'value-list': 2})
+
+    def test_recording_starts_no_flusher(self):
+        self.client.get('/api/values/')
+
+        self.assertIsNone(hit_buffer._pid)
+        self.assertNotIn('analytics-flusher', [thread.name for thread in threading.enumerate()])
+
+    def test_event_stream_is_not_counted(self):
+        middleware = HitRecordingMiddleware(lambda request: HttpResponse())
+
+        middleware(self.request('/api/livestream/events/'))
+        middleware(self.request('/api/values/'))
+
+        self.assertEqual(self.buffered(), {'value-list': 1})
+
+    def test_async_middleware(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = HitRecordingMiddleware(get_response)
+        response = async_to_sync(middleware)(self.request('/api/values/'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.buffered(), {'value-list': 1})
+
+    def test_flush_adds_to_stored_counts(self):
+        today = timezone.localdate()
+        write_rollups({(today, DailyHits.PAGE, '/'): 3})
+        hit_buffer.record(DailyHits.PAGE, '/')
+        hit_buffer.record(DailyHits.PAGE, '/')
+
+        # INSERT, SELECT, UPDATE, plus the SAVEPOINT/RELEASE of its atomic block.
+        with self.assertNumQueries(5):
+            self.assertEqual(hit_buffer.flush(), 2)
+        self.assertEqual(DailyHits.objects.get(day=today, kind=DailyHits.PAGE, name='/').hits, 5)
+
+
+# =============================================================================
+# READ-OPTIMIZED SERIALIZATION
+# =============================================================================
+
+# Viewsets serving reads from .values() rows, with one row that fills every
+# optional column and one that leaves them empty.
+VALUES_VIEWSETS = {
+    EventViewSet: [
+        {'title': 'Picnic', 'date': '2024-06-01', 'time': '10:00 AM', 'location': 'Park',
+         'category': 'Fellowship', 'description': 'Bring food.', 'image': 'events/picnic día.jpg'},
+        {'title': 'Vigil', 'date': '2024-12-31', 'time': None, 'location': 'Hall',
+         'category': 'Prayer', 'description': '', 'image': None},
+    ],
+    SermonViewSet: [
+        {'title': 'Hope', 'date': '2024-03-10', 'speaker': 'Pastor Ann', 'description': 'Romans 5.',
+         'series': 'Romans', 'category': 'Sunday', 'video_url': 'https://example.com/watch?v=1&t=2',
+         'image': 'sermons/hope.png'},
+        {'title': 'Grace', 'date': '2024-03-17', 'speaker': 'Pastor Ann', 'description': '',
+         'series': None, 'category': 'Sunday', 'video_url': None, 'image': ''},
+    ],
+    MinistryViewSet: [
+        {'title': 'Youth', 'description': 'Teens.', 'color': '#f00', 'icon_name': 'FaUsers',
+         'image': 'ministries/youth.webp', 'order': 2, 'is_active': True},
+        {'title': 'Choir', 'description': 'Songs.', 'color': '#0f0', 'icon_name': 'FaMusic',
+         'image': None, 'order': 1},
+    ],
+    ServiceScheduleViewSet: [
+        {'day': 'Sunday', 'time': '9:00 AM', 'type': 'Worship', 'description': 'Main service', 'order': 1},
+        {'day': 'Wednesday', 'time': '7:00 PM', 'type': 'Bible study', 'is_active': False},
+    ],
+    GivingOptionViewSet: [
+        {'title': 'Bank', 'description': 'Transfer', 'icon_name': 'FaBank', 'account_name': 'NGC',
+         'account_number': '0123456789', 'bank_name': 'First Bank'},
+        {'title': 'Mobile', 'description': 'Mobile money', 'icon_name': 'FaMobile', 'is_active': False},
+    ],
+    ValueViewSet: [
+        {'title': 'Faith', 'description': 'We believe. "Quoted" \u2014 and \\ escaped', 'order': 1},
+        {'title': 'Love', 'description': ''},
+    ],
+    LeadershipViewSet: [
+        {'name': 'Ann', 'role': 'Pastor', 'description': 'Leads.', 'image': 'leadership/ann.jpg',
+         'x_url': 'https://x.com/ann'},
+        {'name': 'Ben', 'role': 'Deacon', 'description': 'Serves.', 'image': None, 'x_url': None},
+    ],
+    HomeFeatureViewSet: [
+        {'title': 'Worship', 'description': 'Every Sunday', 'order': 1},
+        {'title': 'Community', 'description': 'Small groups'},
+    ],
+}
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False, TIME_ZONE='America/New_York')
+class ValuesSerializerTests(TestCase):
+    """``values_serializer`` renders the same JSON bytes as the ModelSerializer."""
+
+    def setUp(self):
+        self.request = APIClient().get('/api/values/').wsgi_request
+        self.renderer = FastJSONRenderer()
+
+    def render(self, data):
+        return self.renderer.render(data)
+
+    def test_rows_render_identically(self):
+        for viewset, rows in VALUES_VIEWSETS.items():
+            serializer_class = viewset.serializer_class
+            model = serializer_class.Meta.model
+            fast = values_serializer(serializer_class)
+            for row in rows:
+                with self.subTest(model=model.__name__, row=row):
+                    instance = model.objects.create(**row)
+                    instance.refresh_from_db()
+                    values = model.objects.values(*fast.sources).get(pk=instance.pk)
+
+                    expected = self.render(serializer_class(instance, context={'request': self.request}).data)
+                    self.assertEqual(self.render(fast.to_representation(values, self.request)), expected)
+                    self.assertEqual(self.render(fast.serialize([values], {'request': self.request})),
+                                     self.render([serializer_class(instance, context={'request': self.request}).data]))
+
+    def test_without_request(self):
+        instance = Leadership.objects.create(**VALUES_VIEWSETS[LeadershipViewSet][0])
+        fast = values_serializer(LeadershipViewSet.serializer_class)
+        values = Leadership.objects.values(*fast.sources).get(pk=instance.pk)
+
+        self.assertEqual(self.render(fast.to_representation(values)),
+                         self.render(LeadershipViewSet.serializer_class(instance).data))
+
+    def test_public_endpoints_match_model_serializers(self):
+        for viewset, rows in VALUES_VIEWSETS.items():
+            model = viewset.serializer_class.Meta.model
+            for row in rows:
+                model.objects.create(**row)
+        client = APIClient()
+        for prefix, viewset in (('events', EventViewSet), ('sermons', SermonViewSet),
+                                ('ministries', MinistryViewSet), ('leadership', LeadershipViewSet)):
+            model = viewset.serializer_class.Meta.model
+            for instance in model.objects.all():
+                with self.subTest(endpoint=prefix, pk=instance.pk):
+                    response = client.get(f'/api/{prefix}/{instance.pk}/')
+                    expected = viewset.serializer_class(instance, context={'request': response.wsgi_request}).data
+                    self.assertEqual(response.content, self.render(expected))
+
+
+# =============================================================================
+# PAGE BUNDLES
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class PageBundleTests(TestCase):
+    """Each bundle returns what the page's separate list requests would."""
+
+    def setUp(self):
+        cache.clear()
+        church_info.clear()
+        live_streams.clear()
+        self.client = APIClient()
+        for n in range(5):
+            Event.objects.create(title=f'Event {n}', date=f'2024-0{n + 1}-01', location='Hall',
+                                 category='Worship', description='')
+        HomeFeature.objects.create(title='Worship', description='Every Sunday', order=1)
+        Value.objects.create(title='Faith', description='We believe.', order=1)
+        Leadership.objects.create(name='Ann', role='Pastor', description='Leads.')
+        GivingOption.objects.create(title='Bank', description='Transfer', icon_name='FaBank')
+
+    def get(self, page):
+        response = self.client.get(f'/api/bundles/{page}/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def listed(self, url):
+        """A public list endpoint's rows, unwrapped from its page if paginated."""
+        data = self.client.get(url).json()
+        return data['results'] if isinstance(data, dict) else data
+
+    def test_members_match_list_endpoints(self):
+        pages = {
+            'home': {'livestream': '/api/livestream/', 'church_info': '/api/church-info/',
+                     'home_features': '/api/home-features/'},
+            'about': {'values': '/api/values/', 'leadership': '/api/leadership/',
+                      'church_info': '/api/church-info/'},
+            'giving': {'giving_options': '/api/giving-options/', 'church_info': '/api/church-info/'},
+        }
+        for page, members in pages.items():
+            bundle = self.get(page).json()
+            self.assertEqual(set(bundle), set(members) | ({'events'} if page == 'home' else set()))
+            for key, url in members.items():
+                with self.subTest(page=page, member=key):
+                    self.assertEqual(bundle[key], self.listed(url))
+
+    def test_home_lists_three_events(self):
+        events = self.get('home').json()['events']
+
+        self.assertEqual(events, self.listed('/api/events/')[:3])
+        self.assertEqual(len(events), 3)
+
+    def test_cached_until_a_member_changes(self):
+        first = self.get('about')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get('about').content, first.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Leadership.objects.create(name='Ben', role='Deacon', description='Serves.')
+
+        names = [leader['name'] for leader in self.get('about').json()['leadership']]
+        self.assertIn('Ben', names)
+
+
+# =============================================================================
+# SHARED CACHE BACKEND
+# =============================================================================
+
+class SQLiteCacheTests(SimpleTestCase):
+    """``SQLiteCache`` honours Django's cache contract across connections."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / 'cache.sqlite3')
+        self.cache = self.make_cache()
+        self.now = time.time()
+        patcher = mock.patch('time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_cache(self, **options):
+        """Another backend instance on the same file, like a second worker."""
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_set_get_and_expiry(self):
+        self.cache.set('a', {'n': 1}, 10)
+        self.cache.set('b', 2, None)
+
+        self.assertEqual(self.make_cache().get('a'), {'n': 1})
+        self.now += 11
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('a', 'gone'), 'gone')
+        self.assertFalse(self.cache.has_key('a'))
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'b': 2})
+
+    def test_add_only_stores_absent_or_expired_keys(self):
+        other = self.make_cache()
+
+        self.assertTrue(self.cache.add('lock', 1, 5))
+        self.assertFalse(other.add('lock', 2, 5))
+        self.assertEqual(other.get('lock'), 1)
+        self.now += 6
+        self.assertTrue(other.add('lock', 2, 5))
+        self.assertEqual(self.cache.get('lock'), 2)
+
+    def test_incr(self):
+        self.cache.set('hits', 1, None)
+
+        self.assertEqual(self.make_cache().incr('hits', 4), 5)
+        self.assertEqual(self.cache.get('hits'), 5)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        self.cache.set('short', 1, 1)
+        self.now += 2
+        with self.assertRaises(ValueError):
+            self.cache.incr('short')
+
+    def test_delete_touch_and_clear(self):
+        self.cache.set_many({'a': 1, 'b': 2, 'c': 3}, 5)
+
+        self.assertTrue(self.cache.touch('a', None))
+        self.assertTrue(self.cache.delete('b'))
+        self.assertFalse(self.cache.delete('b'))
+        self.now += 6
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_cull_drops_least_recently_used(self):
+        cache = self.make_cache(MAX_ENTRIES=4, CULL_FREQUENCY=2)
+        for n in range(5):
+            cache.set(n, n, None)
+            self.now += cache.ACCESS_RESOLUTION + 1
+        cache.get(0)  # refreshes its access time
+
+        cache._cull()
+
+        self.assertEqual(sorted(cache.get_many(range(5))), [0, 4])
+
+    def test_sqlite_errors_are_misses_and_failed_writes(self):
+        broken = SQLiteCache(tempfile.gettempdir(), {})  # a directory: cannot be opened
+
+        with self.assertLogs('api.cache_backends', 'WARNING'):
+            self.assertIsNone(broken.get('a'))
+            self.assertEqual(broken.get('a', 'default'), 'default')
+            self.assertEqual(broken.get_many(['a']), {})
+            self.assertIsNone(broken.set('a', 1))
+            self.assertEqual(broken.set_many({'a': 1}), ['a'])
+            self.assertFalse(broken.add('a', 1))
+            self.assertFalse(broken.has_key('a'))
+            self.assertFalse(broken.delete('a'))
+            with self.assertRaises(ValueError):
+                broken.incr('a')
+
+
+# =============================================================================
+# FRAGMENT CACHE
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class FragmentCacheTests(TestCase):
+    """List rows are served from per-object fragments keyed by ``updated_at``."""
+
+    def setUp(self):
+        cache.clear()
+        self.request = APIClient().get('/api/events/').wsgi_request
+        for n in range(3):
+            Event.objects.create(title=f'Event {n}', date=f'2024-0{n + 1}-01', location='Hall',
+                                 category='Worship', description='')
+
+    def render(self, queryset, **context):
+        serializer = EventSerializer(queryset, many=True, context={'request': self.request, **context})
+        return serializer.data, serializer
+
+    def expected(self):
+        return [EventSerializer(event, context={'request': self.request}).data for event in Event.objects.all()]
+
+    def test_second_render_is_all_hits(self):
+        first, serializer = self.render(Event.objects.all())
+        self.assertEqual((serializer.fragment_hits, serializer.fragment_misses), (0, 3))
+
+        second, serializer = self.render(Event.objects.all())
+
+        self.assertEqual((serializer.fragment_hits, serializer.fragment_misses), (3, 0))
+        self.assertEqual(second, first)
+        self.assertEqual(second, self.expected())
+        self.assertEqual(fragment_stats(), {'hits': 3, 'misses': 3})
+
+    def test_saved_row_misses(self):
+        self.render(Event.objects.all())
+        event = Event.objects.first()
+        event.title = 'Renamed'
+        event.save()
+
+        data, serializer = self.render(Event.objects.all())
+
+        self.assertEqual((serializer.fragment_hits, serializer.fragment_misses), (2, 1))
+        self.assertEqual(data, self.expected())
+
+    def test_deferred_misses_load_in_one_query(self):
+        with self.assertNumQueries(2):  # the deferred page, then the missing rows
+            data, _ = self.render(Event.objects.only('id', 'updated_at'))
+
+        self.assertEqual(data, self.expected())
+
+    def test_field_selection_is_its_own_fragment(self):
+        self.render(Event.objects.all())
+
+        data, serializer = self.render(Event.objects.all(), fields={'id', 'title'})
+
+        self.assertEqual(serializer.fragment_misses, 3)
+        self.assertEqual(data, [{'id': event.pk, 'title': event.title} for event in Event.objects.all()])
+
+
+# =============================================================================
+# LIVE STREAM EVENTS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class LivestreamEventsTests(TestCase):
+    """The SSE endpoint streams under ASGI and asks WSGI clients to poll."""
+
+    url = '/api/livestream/events/'
+
+    def test_wsgi_is_unavailable(self):
+        with self.assertLogs('django.request', 'ERROR'):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'detail': 'Live updates are unavailable; poll /api/livestream/ instead.'})
+
+    def test_get_only(self):
+        self.assertEqual(self.client.post(self.url).status_code, 405)
+
+    def test_asgi_streams_payloads_and_keepalives(self):
+        async def subscribe():
+            yield '[{"id": 1}]'
+            yield None
+
+        async def fetch():
+            response = await AsyncClient().get(self.url)
+            body = b''.join([chunk async for chunk in response.streaming_content])
+            return response, body
+
+        with mock.patch.object(broadcaster, 'subscribe', subscribe):
+            response, body = async_to_sync(fetch)()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(body, b'retry: 5000\n\ndata: [{"id": 1}]\n\n: keepalive\n\n')
+
+
+# =============================================================================
+# SPARSE FIELDSETS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class SparseFieldsetTests(TestCase):
+    """``?fields=`` and ``?omit=`` narrow list and detail responses."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.event = Event.objects.create(title='Picnic', date='2024-06-01', location='Park',
+                                          category='Fellowship', description='Bring food.')
+
+    def rows(self, query):
+        response = self.client.get(f'/api/events/?{query}')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return data['results'] if isinstance(data, dict) else data
+
+    def test_fields(self):
+        self.assertEqual(self.rows('fields=title,id'), [{'id': self.event.pk, 'title': 'Picnic'}])
+
+    def test_omit(self):
+        (full,) = self.rows('')
+        (row,) = self.rows('omit=description,image')
+
+        self.assertEqual(row, {name: value for name, value in full.items() if name not in ('description', 'image')})
+
+    def test_detail(self):
+        response = self.client.get(f'/api/events/{self.event.pk}/?fields=id,location')
+
+        self.assertEqual(response.json(), {'id': self.event.pk, 'location': 'Park'})
+
+    def test_selections_are_cached_separately(self):
+        self.assertEqual(self.rows('fields=id'), [{'id': self.event.pk}])
+        self.assertEqual(self.rows('fields=title'), [{'title': 'Picnic'}])
+
+    def test_unknown_fields_are_rejected(self):
+        for param in ('fields', 'omit'):
+            with self.subTest(param=param):
+                response = self.client.get(f'/api/events/?{param}=title,colour,venue')
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {param: 'Unknown field(s): colour, venue.'})
+
+
+# =============================================================================
+# LIST COUNTS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class CachedCountTests(TestCase):
+    """Page totals come from the count cache, or a planner estimate when enabled."""
+
+    def setUp(self):
+        cache.clear()
+        for n in range(5):
+            Event.objects.create(title=f'Event {n}', date='2024-06-01', location='Hall',
+                                 category='Worship' if n % 2 else 'Prayer', description='')
+
+    def test_cached_until_the_model_changes(self):
+        self.assertEqual(cached_count(Event.objects.all()), 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(Event.objects.order_by('-title')), 5)
+
+        Event.objects.create(title='Late', date='2024-07-01', location='Hall', category='Prayer', description='')
+        bump_version(Event)
+
+        self.assertEqual(cached_count(Event.objects.all()), 6)
+
+    def test_filters_have_their_own_count(self):
+        self.assertEqual(cached_count(Event.objects.filter(category='Worship')), 2)
+        self.assertEqual(cached_count(Event.objects.filter(category='Prayer')), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(Event.objects.none()), 0)
+
+    def test_response_reports_exact_count(self):
+        data = APIClient().get('/api/events/?category=Worship').json()
+
+        self.assertEqual((data['count'], data['count_exact']), (2, True))
+
+    def test_estimated_pages_look_ahead(self):
+        with mock.patch('api.pagination.estimated_count', return_value=2):
+            paginator = CachedCountPaginator(Event.objects.order_by('pk'), 2)
+            page = paginator.page(2)
+
+            self.assertFalse(paginator.count_exact)
+            self.assertEqual(paginator.count, 2)
+            self.assertTrue(page.has_next())  # the estimate is low, rows remain
+            self.assertFalse(paginator.page(3).has_next())
+            with self.assertRaises(EmptyPage):
+                paginator.page(4)
+
+    def test_estimates_only_on_postgresql(self):
+        with self.settings(PAGINATION_ESTIMATE_COUNT_ABOVE=1):
+            self.assertIsNone(estimated_count(Event.objects.all()))
+
+
+# =============================================================================
+# FULL-TEXT SEARCH
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class FullTextSearchTests(TestCase):
+    """``?search=`` matches word prefixes in the index, ranked and highlighted."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.in_description = Sermon.objects.create(
+            title='Sunday Service', date='2024-03-17', speaker='Pastor Ann', category='Sunday',
+            description='A message about faithfulness in small things.')
+        self.in_title = Sermon.objects.create(
+            title='Faith and Works', date='2024-03-10', speaker='Pastor Ben', category='Sunday',
+            description='James 2.')
+        Sermon.objects.create(title='Hope', date='2024-03-24', speaker='Pastor Ann', category='Sunday',
+                              description='Romans 5.')
+
+    def search(self, query):
+        response = self.client.get(f'/api/sermons/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_title_matches_rank_first(self):
+        results = self.search('search=faith')
+
+        self.assertEqual([row['id'] for row in results], [self.in_title.pk, self.in_description.pk])
+
+    def test_every_term_must_match_as_a_prefix(self):
+        self.assertEqual([row['id'] for row in self.search('search=past+ben')], [self.in_title.pk])
+        self.assertEqual(self.search('search=faith+romans'), [])
+
+    def test_snippets_highlight_matches(self):
+        rows = {row['id']: row for row in self.search('search=faith')}
+
+        self.assertIn('<mark>Faith</mark>', rows[self.in_title.pk]['snippet'])
+        self.assertIn('<mark>faithfulness</mark>', rows[self.in_description.pk]['snippet'])
+        self.assertNotIn('snippet', self.search('')[0])
+
+    def test_ordering_overrides_rank(self):
+        results = self.search('search=faith&ordering=-date')
+
+        self.assertEqual([row['id'] for row in results], [self.in_description.pk, self.in_title.pk])
+
+    def test_index_follows_writes(self):
+        Sermon.objects.filter(pk=self.in_title.pk).update(title='Works')
+        self.in_description.delete()
+        Sermon.objects.bulk_create([Sermon(title='Faithful', date='2024-04-01', speaker='Pastor Ann',
+                                           category='Sunday', description='')])
+        bump_version(Sermon)
+
+        self.assertEqual([row['title'] for row in self.search('search=faith')], ['Faithful'])
+
+
+# =============================================================================
+# SEARCH SUGGESTIONS
+# =============================================================================
+
+class SuggestionIndexTests(SimpleTestCase):
+    """Prefix lookups over word starts, ranked by position and usage."""
+
+    def setUp(self):
+        self.index = SuggestionIndex()
+        self.index.load({('title', 'Walking in Faith'): 1, ('series', 'Faith Alone'): 3,
+                         ('speaker', 'José Fairweather'): 1, ('title', 'Faithful Servants'): 1})
+
+    def test_leading_matches_then_usage(self):
+        self.assertEqual(self.index.lookup('fai'), [
+            ('series', 'Faith Alone', 3), ('title', 'Faithful Servants', 1),
+            ('speaker', 'José Fairweather', 1), ('title', 'Walking in Faith', 1),
+        ])
+
+    def test_accents_and_case_are_ignored(self):
+        self.assertEqual(self.index.lookup('JOSE F'), [('speaker', 'José Fairweather', 1)])
+        self.assertEqual(self.index.lookup('in'), [])  # short words start no keys
+        self.assertEqual(self.index.lookup('  '), [])
+
+    def test_limit_and_discard(self):
+        self.assertEqual(len(self.index.lookup('fai', limit=2)), 2)
+        self.index.discard('series', 'Faith Alone', 3)
+        self.index.add('title', 'Faithful Servants')
+
+        self.assertEqual(self.index.lookup('faith', limit=2),
+                         [('title', 'Faithful Servants', 2), ('title', 'Walking in Faith', 1)])
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class SuggestEndpointTests(TestCase):
+    """``/api/sermons/suggest/`` follows sermon writes through the content version."""
+
+    def setUp(self):
+        cache.clear()
+        sermon_suggestions.clear()
+        self.addCleanup(sermon_suggestions.clear)
+        self.client = APIClient()
+        self.sermon = Sermon.objects.create(title='Walking in Faith', date='2024-03-10', speaker='Pastor Ann',
+                                            series='Faith Alone', description='')
+
+    def suggest(self, query):
+        response = self.client.get('/api/sermons/suggest/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [(row['type'], row['value']) for row in response.json()['results']]
+
+    def test_suggestions(self):
+        self.assertEqual(self.suggest('fai'), [('series', 'Faith Alone'), ('title', 'Walking in Faith')])
+        self.assertEqual(self.suggest('past'), [('speaker', 'Pastor Ann')])
+
+    def test_edits_and_deletes_update_the_index(self):
+        self.suggest('fai')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sermon.title = 'Running the Race'
+            self.sermon.save()
+            Sermon.objects.create(title='Hope Rising', date='2024-03-17', speaker='Pastor Ben', description='')
+        self.assertEqual(self.suggest('r'), [('title', 'Running the Race'), ('title', 'Hope Rising')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sermon.delete()
+        self.assertEqual(self.suggest('fai'), [])
+        self.assertEqual(self.suggest('past'), [('speaker', 'Pastor Ben')])
+
+    def test_limit(self):
+        response = self.client.get('/api/sermons/suggest/', {'q': 'fai', 'limit': 1})
+
+        self.assertEqual(response.json(), {
+            'query': 'fai', 'results': [{'type': 'series', 'value': 'Faith Alone', 'count': 1}],
+        })
+
+
+# =============================================================================
+# FACETS
+# =============================================================================
+
+SERMON_ROWS = [
+    # (title, date, speaker, series, category)
+    ('Faith Alone', '2023-05-07', 'Pastor Ann', 'Romans', 'Sunday'),
+    ('Faith and Works', '2024-03-10', 'Pastor Ben', 'James', 'Sunday'),
+    ('Living Hope', '2024-03-17', 'Pastor Ann', 'Romans', 'Sunday'),
+    ('Faithful Prayer', '2024-03-20', 'Pastor Ann', None, 'Midweek'),
+    ('Grace', '2024-12-25', 'Pastor Ben', '', 'Special'),
+]
+
+
+def create_sermons():
+    Sermon.objects.bulk_create([
+        Sermon(title=title, date=date, speaker=speaker, series=series, category=category, description='')
+        for title, date, speaker, series, category in SERMON_ROWS
+    ])
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class FacetTests(TestCase):
+    """Facet counts agree with the list endpoint under the same filters."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        create_sermons()
+
+    def list_count(self, params):
+        response = self.client.get('/api/sermons/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['count']
+
+    def test_counts_match_filtered_lists(self):
+        for query in ({}, {'search': 'faith'}, {'speaker': 'Pastor Ann'}):
+            data = self.client.get('/api/sermons/facets/', query).json()
+            self.assertEqual(data['count'], self.list_count(query))
+            for name, values in data['facets'].items():
+                for facet in values:
+                    with self.subTest(query=query, facet=name, value=facet['value']):
+                        if name == 'year':
+                            year = facet['value']
+                            params = {'date_after': f'{year}-01-01', 'date_before': f'{year}-12-31'}
+                        else:
+                            params = {name: facet['value']}
+                        self.assertEqual(facet['count'], self.list_count({**query, **params}))
+
+    def test_shape(self):
+        facets = self.client.get('/api/sermons/facets/', {'limit': 1}).json()['facets']
+
+        self.assertEqual(facets['series'], [{'value': 'Romans', 'count': 2}])  # empty series left out
+        self.assertEqual(facets['speaker'], [{'value': 'Pastor Ann', 'count': 3}])
+        self.assertEqual(facets['year'], [{'value': 2024, 'count': 4}, {'value': 2023, 'count': 1}])
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            counts = facet_counts(Sermon.objects.all(), {'series': 'series', 'category': 'category'})
+
+        self.assertEqual(counts, {'series': {'Romans': 2, 'James': 1},
+                                  'category': {'Sunday': 3, 'Midweek': 1, 'Special': 1}})
+
+
+# =============================================================================
+# STRUCTURED FILTERS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class FieldFilterTests(TestCase):
+    """Exact, repeatable field filters and inclusive date ranges."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        create_sermons()
+        self.today = date(2024, 3, 17)
+        patcher = mock.patch('django.utils.timezone.localdate', side_effect=lambda: self.today)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/sermons/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['title'] for row in response.json()['results'])
+
+    def test_exact_and_repeated(self):
+        self.assertEqual(self.titles('speaker=Pastor+Ben'), ['Faith and Works', 'Grace'])
+        self.assertEqual(self.titles('series=Romans&series=James'), ['Faith Alone', 'Faith and Works', 'Living Hope'])
+        self.assertEqual(self.titles('series=Romans&speaker=Pastor+Ben'), [])
+
+    def test_date_range_is_inclusive(self):
+        self.assertEqual(self.titles('date_after=2024-03-10&date_before=2024-03-17'),
+                         ['Faith and Works', 'Living Hope'])
+
+    def test_upcoming_follows_the_date(self):
+        self.assertEqual(self.titles('upcoming=true'), ['Faithful Prayer', 'Grace', 'Living Hope'])
+        self.assertEqual(self.titles('upcoming=false'), ['Faith Alone', 'Faith and Works'])
+        self.assertEqual(self.titles('upcoming=true&date_after=2024-03-19'), ['Faithful Prayer', 'Grace'])
+
+        self.today = date(2024, 3, 18)  # yesterday's cached page has its own key
+        self.assertEqual(self.titles('upcoming=true'), ['Faithful Prayer', 'Grace'])
+
+    def test_invalid_values_are_rejected(self):
+        for query, error in (('date_after=17/03/2024', {'date_after': 'Date has wrong format. Use YYYY-MM-DD.'}),
+                             ('upcoming=soon', {'upcoming': 'Must be true or false.'})):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/sermons/?{query}')
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), error)
+
+
+# =============================================================================
+# BULK INBOX ACTIONS
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False)
+class BulkActionTests(TestCase):
+    """``POST /api/contact-messages/bulk/`` is staff-only and validates its selection."""
+
+    url = '/api/contact-messages/bulk/'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.messages = [ContactMessage.objects.create(**submission(n)) for n in range(4)]
+
+    def test_requires_authentication(self):
+        for action in ('mark_read', 'delete', 'archive'):
+            with self.subTest(action=action):
+                response = self.client.post(self.url, {'action': action, 'filter': {'is_read': False}}, format='json')
+
+                self.assertEqual(response.status_code, 401)
+        self.assertEqual(ContactMessage.objects.filter(is_read=False).count(), 4)
+        self.assertEqual(counter_values(), exact_counts())
+
+    def test_invalid_selections(self):
+        self.client.force_authenticate(get_user_model().objects.create_user('staff', password='secret'))
+        ids = [message.pk for message in self.messages]
+        for data in ({'action': 'mark_read'},
+                     {'action': 'mark_read', 'ids': ids, 'filter': {'is_read': False}},
+                     {'action': 'mark_read', 'filter': {}},
+                     {'action': 'mark_read', 'ids': []},
+                     {'action': 'mark_read', 'ids': list(range(1, MAX_BULK_IDS + 2))},
+                     {'action': 'purge', 'ids': ids}):
+            with self.subTest(data=data):
+                self.assertEqual(self.client.post(self.url, data, format='json').status_code, 400)
+        self.assertEqual(ContactMessage.objects.filter(is_read=False).count(), 4)
+
+    def test_criteria(self):
+        self.client.force_authenticate(get_user_model().objects.create_user('staff', password='secret'))
+        ContactMessage.objects.filter(pk=self.messages[0].pk).update(created_at=timezone.now() - timedelta(days=30))
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+
+        for criteria, affected in (({'created_before': yesterday}, 1),
+                                   ({'email': 'visitor1@example.com'}, 1),
+                                   ({'created_after': yesterday, 'is_read': False}, 2)):
+            with self.subTest(criteria=criteria):
+                response = self.client.post(self.url, {'action': 'mark_read', 'filter': criteria}, format='json')
+
+                self.assertEqual(response.data['affected'], affected)
+        self.assertEqual(response.data['unread'], 0)
+        self.assertEqual(counter_values(), exact_counts())
+
+
+# =============================================================================
+# CACHE WARMING
+# =============================================================================
+
+@override_settings(CACHES=TEST_CACHES, CACHE_WARM_AFTER_INVALIDATION=False, ALLOWED_HOSTS=['testserver'])
+class WarmCacheTests(TestCase):
+    """``warm_cache`` renders every endpoint, so its timings are cache misses."""
+
+    def setUp(self):
+        cache.clear()
+        Value.objects.create(title='Faith', description='We believe.')
+
+    def warm(self, **options):
+        with CaptureQueriesContext(connection) as queries:
+            results = list(warm_endpoints(hosts=['testserver'], scheme='http', models=[Value], **options))
+        return results, len(queries)
+
+    def test_refresh_renders_even_when_cached(self):
+        first, _ = self.warm()
+        second, queries = self.warm(refresh=True)
+
+        self.assertEqual([result.path for result in second], [result.path for result in first])
+        self.assertTrue(all(result.status == 200 for result in second))
+        self.assertGreater(queries, 0)
+
+    def test_background_warming_keeps_fresh_entries(self):
+        self.warm()
+
+        self.assertEqual(self.warm()[1], 0)
+
+    def test_stores_what_it_renders(self):
+        self.warm()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(APIClient().get('/api/values/').status_code, 200)
@@ -10,7 +10,9 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 from .auth_views import RegisterView
-from .analytics_views import AnalyticsView
+from .analytics_views import AnalyticsView, PageViewView
+from .bundle_views import HomeBundleView, AboutBundleView, GivingBundleView
+from .stream_views import livestream_events
 
 router = DefaultRouter()
 # ... existing registrations ...
@@ -27,9 +29,15 @@ router.register(r'home-features', HomeFeatureViewSet)
 router.register(r'contact-messages', ContactMessageViewSet)
 
 urlpatterns = [
+    # Before the router, which would route it to livestream-detail
+    path('livestream/events/', livestream_events, name='livestream_events'),
     path('', include(router.urls)),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('register/', RegisterView.as_view(), name='auth_register'),
     path('analytics/', AnalyticsView.as_view(), name='analytics'),
+    path('analytics/hit/', PageViewView.as_view(), name='analytics_hit'),
+    path('bundles/home/', HomeBundleView.as_view(), name='bundle_home'),
+    path('bundles/about/', AboutBundleView.as_view(), name='bundle_about'),
+    path('bundles/giving/', GivingBundleView.as_view(), name='bundle_giving'),
 ]
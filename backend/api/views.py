@@ -3,13 +3,17 @@ Django REST Framework ViewSets for the New Gate Chapel API.
 
 This module defines all API viewsets with:
 - Pagination for list endpoints
-- Caching for performance optimization
-- Search and filtering capabilities
+- Response caching, invalidated whenever the underlying models change
+- Conditional GET (ETag / Last-Modified -> 304) on public read endpoints
+- Search and filtering capabilities (full-text on events and sermons)
+- Sparse fieldsets (?fields= / ?omit=) on public reads
 - Permission-based access control (public read, authenticated write)
 
 API Endpoints:
     /api/events/ - Church events
     /api/sermons/ - Sermon recordings
+    /api/sermons/suggest/ - Sermon search type-ahead
+    /api/sermons/facets/ - Sermon counts per series, speaker, category, year
     /api/ministries/ - Ministry information
     /api/livestream/ - Live stream configuration
     /api/schedules/ - Service schedules
@@ -18,16 +22,33 @@ API Endpoints:
     /api/contact/ - Contact form submissions
 """
 
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.throttling import AnonRateThrottle
+from django.utils.cache import patch_cache_control
+from django.db import connections
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from .models import Event, Sermon, Ministry, LiveStream, ServiceSchedule, GivingOption, Value, Leadership, ChurchInfo, HomeFeature, ContactMessage
+from .archive import merged_inbox
+from .cache import cache_response, conditional_get
+from .filters import FieldFilter, date_cache_key
+from .counters import counter_values
+from .inbox import run_bulk_action, select_messages
+from .journal import journal_enabled, submit as journal_submit
+from .pagination import CachedCountPaginator, KeysetPagination
+from .search import SNIPPET, FullTextSearchFilter, RankedOrderingFilter, facet_counts, search_snippet, year_of
+from .models import Event, Sermon, Ministry, LiveStream, ServiceSchedule, GivingOption, Value, Leadership, ChurchInfo, HomeFeature, ContactMessage, ArchivedContactMessage
+from .singletons import church_info, live_streams
+from .suggest import DEFAULT_LIMIT as DEFAULT_SUGGESTIONS, MAX_LIMIT as MAX_SUGGESTIONS, sermon_suggestions
 from .serializers import (
+    values_serializer,
     EventSerializer, SermonSerializer, MinistrySerializer, LiveStreamSerializer, 
     ServiceScheduleSerializer, GivingOptionSerializer, ValueSerializer, LeadershipSerializer,
-    ChurchInfoSerializer, HomeFeatureSerializer, ContactMessageSerializer
+    ChurchInfoSerializer, HomeFeatureSerializer, ContactMessageSerializer, ContactMessageBulkSerializer,
+    ArchivedContactMessageSerializer
 )
 
 
@@ -43,38 +64,262 @@ class StandardResultsSetPagination(PageNumberPagination):
         - Default page size: 20 items
         - Client can request custom page size via ?page_size=N
         - Maximum page size: 100 items
+
+    Viewsets that set ``cursor_ordering`` (a unique, indexed key such as
+    ``('-date', '-id')``) also offer keyset pagination, selected per
+    request with ``?pagination=cursor`` (or any ``?cursor=``). Those pages
+    have no ``count``, skip the count query and cost the same at any depth;
+    ``?ordering=`` does not apply to them.
+
+    Page-number totals come from the count cache, or from a PostgreSQL
+    planner estimate for large unfiltered tables (see ``api/pagination.py``);
+    ``count_exact`` is false when the total is an estimate.
     """
+    django_paginator_class = CachedCountPaginator
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    mode_query_param = 'pagination'
+
+    keyset = None
+
+    def get_keyset(self, request, view):
+        """The ``KeysetPagination`` to use for this request, or None for page numbers."""
+        ordering = getattr(view, 'cursor_ordering', None)
+        params = request.query_params
+        if ordering and (params.get(self.mode_query_param) == 'cursor' or KeysetPagination.cursor_query_param in params):
+            return KeysetPagination(ordering, self.get_page_size(request))
+        return None
+
+    def get_key_fields(self, request, view):
+        """Columns list rows must include for the chosen pagination."""
+        keyset = self.get_keyset(request, view)
+        return keyset.fields if keyset is not None else ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.get_keyset(request, view)
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response({
+            'count': self.page.paginator.count,
+            'count_exact': self.page.paginator.count_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_exact'] = {'type': 'boolean', 'example': True}
+        return response_schema
+
+
+def pagination_key_fields(view):
+    """Columns the paginator needs on list rows (the keyset, in cursor mode)."""
+    get_key_fields = getattr(view.paginator, 'get_key_fields', None)
+    return tuple(get_key_fields(view.request, view)) if get_key_fields else ()
+
+
+def with_search_snippets(data, rows):
+    """Add each full-text search result's highlighted ``snippet`` to its representation."""
+    if not rows or search_snippet(rows[0]) is None:
+        return data
+    return [{**item, 'snippet': search_snippet(row)} for item, row in zip(data, rows)]
+
+
+def int_query_param(request, name, default, maximum):
+    """Integer query parameter clamped to ``1..maximum`` (400 if not a number)."""
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: 'A whole number is required.'})
+    return max(1, min(value, maximum))
+
+
+# =============================================================================
+# THROTTLING
+# =============================================================================
+
+class SuggestRateThrottle(AnonRateThrottle):
+    """Anonymous rate for type-ahead lookups, which arrive once per keystroke."""
+    scope = 'suggest'
+
+
+class PageViewRateThrottle(AnonRateThrottle):
+    """Anonymous rate for page-view beacons, sent on every client-side navigation."""
+    scope = 'pageview'
+
+
+# =============================================================================
+# READ-OPTIMIZED SERIALIZATION
+# =============================================================================
+
+class SparseFieldsetMixin:
+    """
+    Let clients pick the fields they need with ``?fields=`` or ``?omit=``.
+
+    Example queries:
+        GET /api/events/?fields=id,title,date,image,category
+        GET /api/sermons/?omit=description
+
+    The selection is validated against the serializer's fields (unknown
+    names are a 400) and passed to serializers as ``context['fields']``.
+    Response cache keys and ETags include the query string, so every
+    selection is cached separately.
+    """
+    fields_param = 'fields'
+    omit_param = 'omit'
+
+    def get_field_selection(self):
+        """Selected field names in serializer order, or None when all are requested."""
+        if '_field_selection' not in self.__dict__:
+            self._field_selection = self._parse_field_selection()
+        return self._field_selection
+
+    def _parse_field_selection(self):
+        params = self.request.query_params if self.request is not None else {}
+        fields = [name for name in params.get(self.fields_param, '').split(',') if name]
+        omit = [name for name in params.get(self.omit_param, '').split(',') if name]
+        if not fields and not omit:
+            return None
+        available = values_serializer(self.get_serializer_class()).field_names
+        unknown = set(fields + omit).difference(available)
+        if unknown:
+            raise ValidationError({
+                self.fields_param if set(fields) & unknown else self.omit_param:
+                    f"Unknown field(s): {', '.join(sorted(unknown))}."
+            })
+        return tuple(name for name in available if (not fields or name in fields) and name not in omit)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None and self.request.method in ('GET', 'HEAD'):
+            context['fields'] = self.get_field_selection()
+        return context
+
+
+class ValuesRetrieveMixin(SparseFieldsetMixin):
+    """
+    Serve ``retrieve`` from a ``.values()`` row.
+
+    The row is serialized by the compiled ``values_serializer`` of the
+    viewset's serializer class, which renders the same JSON as the
+    ModelSerializer without building a model instance. With a sparse
+    fieldset only the selected columns are read. Object-level permissions
+    are not checked, so only use this on viewsets whose read permissions
+    are not object-specific.
+    """
+
+    def get_values_serializer(self):
+        fast = values_serializer(self.get_serializer_class())
+        selection = self.get_field_selection()
+        return fast if selection is None else fast.narrow(selection)
+
+    def retrieve(self, request, *args, **kwargs):
+        fast = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset()).values(*fast.sources)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(fast.to_representation(row, request))
+
+
+class ValuesReadMixin(ValuesRetrieveMixin):
+    """
+    Serve ``list`` and ``retrieve`` from ``.values()`` rows (see ``ValuesRetrieveMixin``).
+
+    For viewsets without fragment caching; those list through
+    ``FragmentCacheMixin`` and only take ``ValuesRetrieveMixin``.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = [name for name in pagination_key_fields(self) if name not in fast.sources]
+        if SNIPPET in queryset.query.extra_select:
+            extra.append(SNIPPET)
+        queryset = queryset.values(*fast.sources, *extra)
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(with_search_snippets(fast.serialize(page, context), page))
+        rows = list(queryset)
+        return Response(with_search_snippets(fast.serialize(rows, context), rows))
+
+
+# =============================================================================
+# FRAGMENT CACHING
+# =============================================================================
+
+class FragmentCacheMixin:
+    """
+    List rows through the per-object fragment cache.
+
+    The list query only selects ``id`` and ``updated_at``; rows (limited to
+    the sparse fieldset, if any) are loaded in one query just for the
+    objects whose fragment is missing and serialized from ``.values()``
+    rows (``FragmentCachedListSerializer``, which the serializer must use).
+    The per-request counts are reported in the ``X-Fragment-Cache`` header.
+    Combine with ``ValuesRetrieveMixin`` (not ``ValuesReadMixin``, whose
+    ``list`` this one would replace).
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).only('id', 'updated_at', *pagination_key_fields(self))
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        serializer = self.get_serializer(rows, many=True)
+        data = with_search_snippets(serializer.data, rows)
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response(data)
+        response['X-Fragment-Cache'] = f"hits={serializer.fragment_hits}; misses={serializer.fragment_misses}"
+        return response
 
 
 # =============================================================================
 # CONTENT VIEWSETS - Public read, authenticated write
 # =============================================================================
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(FragmentCacheMixin, ValuesRetrieveMixin, viewsets.ModelViewSet):
     """
     API endpoint for church events.
     
     Provides full CRUD operations for events with:
     - Public read access (list, retrieve)
     - Authenticated write access (create, update, delete)
-    - Search by title, description, category, location
+    - Full-text search (ranked, with snippets) over title, description, category, location
     - Ordering by date, title, or created_at
-    - 5-minute response caching for list view
+    - Filtering by category, date range, and upcoming/past
+    - 6-hour response caching for list view (invalidated on change)
+    - Per-event fragment caching for uncached list renders
+    - Retrieve (and fragment-cache misses) serialized from .values() rows
     - Pagination (20 items per page)
     
     Example queries:
         GET /api/events/?search=christmas
         GET /api/events/?ordering=-date
+        GET /api/events/?upcoming=true&ordering=date
+        GET /api/events/?category=Youth&date_after=2024-01-01&date_before=2024-12-31
         GET /api/events/?page=2&page_size=10
+        GET /api/events/?fields=id,title,date,image,category
+        GET /api/events/?pagination=cursor&page_size=50
     """
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     pagination_class = StandardResultsSetPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'category', 'location']
+    cursor_ordering = ('-date', '-id')  # ?pagination=cursor
+    filter_backends = [FieldFilter, FullTextSearchFilter, RankedOrderingFilter]
+    filter_fields = ['category']  # index (-date, category)
+    date_filter_field = 'date'
+    search_fields = ['title', 'description', 'category', 'location']  # fallback off SQLite/PostgreSQL
     ordering_fields = ['date', 'title', 'created_at']
     ordering = ['-date']
 
@@ -84,48 +329,127 @@ class EventViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    @method_decorator(conditional_get(Event, vary=date_cache_key))
+    @method_decorator(cache_response(60 * 60 * 6, Event, vary=date_cache_key))  # Cache for 6 hours
     def list(self, request, *args, **kwargs):
-        """Cache list responses for 5 minutes to reduce database load."""
+        """Cache list responses until an event changes (at most 6 hours)."""
         return super().list(request, *args, **kwargs)
 
+    @method_decorator(conditional_get(Event))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class SermonViewSet(viewsets.ModelViewSet):
+
+class SermonViewSet(FragmentCacheMixin, ValuesRetrieveMixin, viewsets.ModelViewSet):
     """
     API endpoint for sermon recordings.
     
     Provides full CRUD operations for sermons with:
     - Public read access (list, retrieve)
     - Authenticated write access (create, update, delete)
-    - Search by title, speaker, description, series
+    - Full-text search (ranked, with snippets) over title, speaker, description, series
     - Ordering by date, title, or speaker
-    - 5-minute response caching for list view
+    - Filtering by speaker, series, category, date range, and upcoming/past
+    - 6-hour response caching for list view (invalidated on change)
+    - Per-sermon fragment caching for uncached list renders
+    - Retrieve (and fragment-cache misses) serialized from .values() rows
     - Pagination (20 items per page)
+    - Type-ahead suggestions (/api/sermons/suggest/?q=)
+    - Facet counts for filter sidebars (/api/sermons/facets/)
     
     Example queries:
         GET /api/sermons/?search=faith
         GET /api/sermons/?ordering=-date&search=Pastor John
+        GET /api/sermons/?speaker=Pastor John&date_after=2024-01-01
+        GET /api/sermons/?series=Foundations&series=Hope
+        GET /api/sermons/?omit=description
+        GET /api/sermons/?pagination=cursor
+        GET /api/sermons/suggest/?q=fai
+        GET /api/sermons/facets/?search=faith
     """
     queryset = Sermon.objects.all()
     serializer_class = SermonSerializer
     pagination_class = StandardResultsSetPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'speaker', 'description', 'series']
+    cursor_ordering = ('-date', '-id')  # ?pagination=cursor
+    filter_backends = [FieldFilter, FullTextSearchFilter, RankedOrderingFilter]
+    filter_fields = ['speaker', 'series', 'category']  # indexes (-date, speaker), (series, -date)
+    date_filter_field = 'date'
+    search_fields = ['title', 'speaker', 'description', 'series']  # fallback off SQLite/PostgreSQL
     ordering_fields = ['date', 'title', 'speaker']
     ordering = ['-date']
 
     def get_permissions(self):
         """Public read access, authenticated write access."""
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'suggest', 'facets']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    @method_decorator(conditional_get(Sermon, vary=date_cache_key))
+    @method_decorator(cache_response(60 * 60 * 6, Sermon, vary=date_cache_key))  # Cache for 6 hours
     def list(self, request, *args, **kwargs):
-        """Cache list responses for 5 minutes to reduce database load."""
+        """Cache list responses until a sermon changes (at most 6 hours)."""
         return super().list(request, *args, **kwargs)
 
-class MinistryViewSet(viewsets.ModelViewSet):
+    @method_decorator(conditional_get(Sermon))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @method_decorator(conditional_get(Sermon))
+    @action(detail=False, methods=['get'], throttle_classes=[SuggestRateThrottle])
+    def suggest(self, request):
+        """
+        Type-ahead suggestions from the in-memory index (``api/suggest.py``).
+
+        GET /api/sermons/suggest/?q=fai&limit=5
+        -> {"query": "fai", "results": [{"type": "title", "value": "Walking in Faith", "count": 1}]}
+        """
+        query = request.query_params.get('q', '')
+        limit = int_query_param(request, 'limit', DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS)
+        results = [
+            {'type': kind, 'value': value, 'count': count}
+            for kind, value, count in sermon_suggestions.lookup(query, limit)
+        ]
+        response = Response({'query': query, 'results': results})
+        # Browsers and CDNs may reuse answers briefly; the ETag revalidates them after that.
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
+    @method_decorator(conditional_get(Sermon, vary=date_cache_key))
+    @method_decorator(cache_response(60 * 60 * 6, Sermon, vary=date_cache_key))  # Cache for 6 hours
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Sermon counts per series, speaker, category and year, in one query.
+
+        Counts respect ``?search=`` and the other list filters. Series,
+        speakers and categories are the ``?limit=`` (default 20) most common;
+        years are all listed, newest first.
+
+        GET /api/sermons/facets/?search=faith
+        -> {"count": 12, "facets": {"series": [{"value": "Faith Alone", "count": 4}, ...],
+                                    "speaker": [...], "category": [...], "year": [{"value": 2024, "count": 7}]}}
+        """
+        limit = int_query_param(request, 'limit', 20, 100)
+        queryset = self.filter_queryset(self.get_queryset())
+        counts = facet_counts(queryset, {
+            'series': 'series',
+            'speaker': 'speaker',
+            'category': 'category',
+            'year': year_of('date', connections[queryset.db]),
+        })
+        facets = {
+            name: [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts[name].items(), key=lambda item: (-item[1], item[0]))[:limit]
+            ]
+            for name in ('series', 'speaker', 'category')
+        }
+        years = sorted(((int(year), count) for year, count in counts['year'].items()), reverse=True)
+        facets['year'] = [{'value': year, 'count': count} for year, count in years]
+        # Every sermon has a date, so the year counts add up to the total.
+        return Response({'count': sum(counts['year'].values()), 'facets': facets})
+
+class MinistryViewSet(FragmentCacheMixin, ValuesRetrieveMixin, viewsets.ModelViewSet):
     """
     API endpoint for church ministries.
     
@@ -135,7 +459,9 @@ class MinistryViewSet(viewsets.ModelViewSet):
     - Only active ministries shown in list (is_active=True)
     - Search by title and description
     - Manual ordering by 'order' field
-    - 2-minute response caching (shorter for quicker updates)
+    - 6-hour response caching (invalidated on change)
+    - Per-ministry fragment caching for uncached list renders
+    - Retrieve (and fragment-cache misses) serialized from .values() rows
     
     Note: Inactive ministries are filtered out from public view.
     """
@@ -153,11 +479,16 @@ class MinistryViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-    @method_decorator(cache_page(60 * 2))  # Cache for 2 minutes (reduced for faster updates)
+    @method_decorator(conditional_get(Ministry))
+    @method_decorator(cache_response(60 * 60 * 6, Ministry))  # Cache for 6 hours
     def list(self, request, *args, **kwargs):
-        """Cache list responses for 2 minutes to balance performance and freshness."""
+        """Cache list responses until a ministry changes (at most 6 hours)."""
         return super().list(request, *args, **kwargs)
 
+    @method_decorator(conditional_get(Ministry))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 # =============================================================================
 # CONFIGURATION VIEWSETS - Live stream and schedules
@@ -173,11 +504,14 @@ class LiveStreamViewSet(viewsets.ModelViewSet):
     Behavior:
         - Returns all stream configurations
         - Auto-creates default "Sunday Service" if empty
-        - No caching (needs real-time status updates)
+        - No response caching (needs real-time status updates); rows are
+          kept in process memory and reloaded only after a change
+        - Conditional GET, so polling clients get 304 until the status changes
     """
     queryset = LiveStream.objects.all()
     serializer_class = LiveStreamSerializer
 
+    @method_decorator(conditional_get(LiveStream))
     def list(self, request, *args, **kwargs):
         """
         Get stream configuration, creating default if none exists.
@@ -185,11 +519,17 @@ class LiveStreamViewSet(viewsets.ModelViewSet):
         Returns:
             List of stream configurations (typically one item)
         """
-        if not LiveStream.objects.exists():
-            LiveStream.objects.create(title="Sunday Service", status="offline")
-        return super().list(request, *args, **kwargs)
+        streams = live_streams.get()
+        page = self.paginate_queryset(streams)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(streams, many=True).data)
 
-class ServiceScheduleViewSet(viewsets.ModelViewSet):
+    @method_decorator(conditional_get(LiveStream))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+class ServiceScheduleViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """
     API endpoint for service schedules.
     
@@ -197,8 +537,9 @@ class ServiceScheduleViewSet(viewsets.ModelViewSet):
     - Public read access (list, retrieve)
     - Authenticated write access (create, update, delete)
     - Only active schedules shown (is_active=True)
-    - 30-minute caching (schedules rarely change)
+    - 24-hour caching (invalidated on change)
     - Ordered by manual 'order' field then day
+    - Read-optimized serialization from .values() rows
     """
     queryset = ServiceSchedule.objects.filter(is_active=True)
     serializer_class = ServiceScheduleSerializer
@@ -211,29 +552,52 @@ class ServiceScheduleViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-    @method_decorator(cache_page(60 * 30))  # Cache for 30 minutes
+    @method_decorator(conditional_get(ServiceSchedule))
+    @method_decorator(cache_response(60 * 60 * 24, ServiceSchedule))  # Cache for 24 hours
     def list(self, request, *args, **kwargs):
-        """Cache list responses for 30 minutes (schedules change infrequently)."""
+        """Cache list responses until a schedule changes (at most 24 hours)."""
         return super().list(request, *args, **kwargs)
 
+    @method_decorator(conditional_get(ServiceSchedule))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 # =============================================================================
 # CONTENT MANAGEMENT VIEWSETS - Site content and configuration
 # =============================================================================
 
-class GivingOptionViewSet(viewsets.ModelViewSet):
+class GivingOptionViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """API endpoint for giving/donation methods. Full CRUD with authentication."""
     queryset = GivingOption.objects.all()
     serializer_class = GivingOptionSerializer
 
+    @method_decorator(conditional_get(GivingOption))
+    @method_decorator(cache_response(60 * 60 * 24, GivingOption))  # Cache for 24 hours
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator(conditional_get(GivingOption))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class ValueViewSet(viewsets.ModelViewSet):
+
+class ValueViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """API endpoint for church core values. Full CRUD with authentication."""
     queryset = Value.objects.all()
     serializer_class = ValueSerializer
 
+    @method_decorator(conditional_get(Value))
+    @method_decorator(cache_response(60 * 60 * 24, Value))  # Cache for 24 hours
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
-class LeadershipViewSet(viewsets.ModelViewSet):
+    @method_decorator(conditional_get(Value))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class LeadershipViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """
     API endpoint for church leadership/staff.
     
@@ -248,6 +612,15 @@ class LeadershipViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
+    @method_decorator(conditional_get(Leadership))
+    @method_decorator(cache_response(60 * 60 * 24, Leadership))  # Cache for 24 hours
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator(conditional_get(Leadership))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 class ChurchInfoViewSet(viewsets.ModelViewSet):
     """
@@ -260,11 +633,13 @@ class ChurchInfoViewSet(viewsets.ModelViewSet):
     Behavior:
         - Always returns exactly one item in list
         - Auto-creates with defaults if empty
+        - 24-hour caching (invalidated on change)
     """
     queryset = ChurchInfo.objects.all()
     serializer_class = ChurchInfoSerializer
 
-    @method_decorator(cache_page(60 * 60))  # Cache for 1 hour
+    @method_decorator(conditional_get(ChurchInfo))
+    @method_decorator(cache_response(60 * 60 * 24, ChurchInfo))  # Cache for 24 hours
     def list(self, request, *args, **kwargs):
         """
         Get singleton church info, creating default if none exists.
@@ -272,23 +647,28 @@ class ChurchInfoViewSet(viewsets.ModelViewSet):
         Returns:
             List containing single ChurchInfo instance
         """
-        if not ChurchInfo.objects.exists():
-            ChurchInfo.objects.create()
-        
-        instance = ChurchInfo.objects.first()
-        serializer = self.get_serializer(instance)
+        serializer = self.get_serializer(church_info.get())
         return Response([serializer.data])
 
+    @method_decorator(conditional_get(ChurchInfo))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
-class HomeFeatureViewSet(viewsets.ModelViewSet):
+class HomeFeatureViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """API endpoint for homepage features. Full CRUD with authentication."""
     queryset = HomeFeature.objects.all()
     serializer_class = HomeFeatureSerializer
 
-    @method_decorator(cache_page(60 * 30))  # Cache for 30 minutes
+    @method_decorator(conditional_get(HomeFeature))
+    @method_decorator(cache_response(60 * 60 * 24, HomeFeature))  # Cache for 24 hours
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @method_decorator(conditional_get(HomeFeature))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 # =============================================================================
 # USER INTERACTION VIEWSETS - Contact forms and submissions
@@ -305,12 +685,80 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     Usage:
         POST /api/contact/ - Submit contact form (public)
         GET /api/contact/ - View all messages (admin only)
+        GET /api/contact-messages/?pagination=cursor - Inbox pages by cursor (admin only)
+        POST /api/contact-messages/bulk/ - Mark read/unread, delete or archive many messages (admin only)
+        GET /api/contact-messages/?search=smith&include_archived=true - Search inbox and archive (admin only)
+
+    With ``CONTACT_INGEST_MODE = 'journal'``, submissions are answered with
+    202 Accepted once they are in the durable journal, and reach the table
+    in batches shortly after (see ``api/journal.py``).
+
+    Old read messages move to ``ArchivedContactMessage`` (``api/archive.py``).
+    Lists leave them out unless ``?include_archived=true`` is given; that
+    list is a UNION of both tables, uses page numbers, and carries
+    ``archived_at`` (null for inbox messages).
     """
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    pagination_class = StandardResultsSetPagination
+    search_fields = ['name', 'email', 'subject']
 
     def get_permissions(self):
         """Allow public creation, require authentication for everything else."""
         if self.action == 'create':
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
+
+    @property
+    def include_archived(self):
+        """Whether this is a list request with ``?include_archived=true``."""
+        if self.action != 'list':
+            return False
+        return bool(FieldFilter.parse_bool(self.request.query_params, 'include_archived'))
+
+    @property
+    def cursor_ordering(self):
+        """Keyset for ``?pagination=cursor``; none for the merged list (a UNION cannot be filtered)."""
+        return None if self.include_archived else ('-created_at', '-id')
+
+    def get_serializer_class(self):
+        if self.include_archived:
+            return ArchivedContactMessageSerializer
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.include_archived:
+            return queryset
+        archived = super().filter_queryset(ArchivedContactMessage.objects.all())
+        return merged_inbox(queryset, archived)
+
+    def create(self, request, *args, **kwargs):
+        if not journal_enabled():
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        journal_submit(serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Apply one action to many messages with set-based queries (``api/inbox.py``).
+
+        POST /api/contact-messages/bulk/ {"action": "mark_read", "filter": {"is_read": false}}
+        -> {"action": "mark_read", "affected": 42, "unread": 0}
+
+        ``affected`` counts the messages that changed; ``unread`` is the
+        inbox's unread total afterwards.
+        """
+        serializer = ContactMessageBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        queryset = select_messages(ids=data.get('ids'), criteria=data.get('filter'))
+        affected = run_bulk_action(data['action'], queryset)
+        return Response({
+            'action': data['action'],
+            'affected': affected,
+            'unread': counter_values()['unread_inquiries'],
+        })
@@ -0,0 +1,234 @@
+"""
+Cache warming for the New Gate Chapel API.
+
+Renders every public list endpoint (and the page bundles) in-process so the
+first visitors after a deploy, a worker restart or an invalidation get cache
+hits instead of paying for the queries and serialization.
+
+Requests are dispatched straight to the views with throttling disabled, and
+built for the public host(s) so the cache keys match real traffic.
+``warm_cache`` requests skip stored responses (like a stale-while-revalidate
+refresh), so every endpoint is re-rendered and stored and the reported
+timings are those of a response cache miss. Background warms keep fresh
+entries, so workers booting after the first one only see cache hits.
+
+Entry points:
+    warm_endpoints() - Warm synchronously and yield per-request timings
+    warm_in_background() - Coalescing background warm, used after invalidations
+    refresh_in_background() - Re-render one URL, used by stale-while-revalidate
+    python manage.py warm_cache - CLI wrapper with a timing report
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .cache import REFRESH_FLAG
+
+logger = logging.getLogger(__name__)
+
+WarmResult = namedtuple('WarmResult', ['path', 'host', 'status', 'elapsed_ms'])
+
+# Registered resources whose list is private (contact messages) or
+# deliberately uncached (live stream status).
+SKIP_PREFIXES = ('contact-messages', 'livestream')
+
+BUNDLE_URL_NAMES = ('bundle_home', 'bundle_about', 'bundle_giving')
+
+
+def default_hosts():
+    """
+    Hosts to warm for: ``CACHE_WARM_HOSTS``, else the concrete ALLOWED_HOSTS.
+
+    Cache keys include the host because image URLs are absolute, so warming
+    ``localhost`` does nothing for visitors of the public domain.
+    """
+    hosts = getattr(settings, 'CACHE_WARM_HOSTS', None)
+    if hosts:
+        return list(hosts)
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts or ['localhost:8000']
+
+
+def default_scheme():
+    """Scheme public requests arrive with (affects absolute image URLs)."""
+    return 'https' if getattr(settings, 'SECURE_SSL_REDIRECT', False) else 'http'
+
+
+def internal_view(path):
+    """Resolve ``path`` to its view with throttling disabled."""
+    func = resolve(path).func
+    initkwargs = dict(func.initkwargs, throttle_classes=())
+    if getattr(func, 'actions', None):
+        return func.cls.as_view(func.actions, **initkwargs)
+    return func.cls.as_view(**initkwargs)
+
+
+def warm_targets(models=None):
+    """
+    Return ``(path, view, sizable)`` for every public cached endpoint.
+
+    ``sizable`` is True when the endpoint honours ``?page_size=``.
+
+    Args:
+        models: Optional iterable of models; only endpoints built from at
+            least one of them are returned.
+    """
+    from .urls import router
+
+    models = set(models) if models else None
+    targets = []
+    for prefix, viewset, basename in router.registry:
+        if prefix in SKIP_PREFIXES:
+            continue
+        if models is not None and viewset.queryset.model not in models:
+            continue
+        view = viewset.as_view({'get': 'list'}, throttle_classes=())
+        sizable = getattr(viewset.pagination_class, 'page_size_query_param', None) is not None
+        targets.append((reverse(f'{basename}-list'), view, sizable))
+
+    for name in BUNDLE_URL_NAMES:
+        path = reverse(name)
+        if models is not None and not models.intersection(resolve(path).func.cls.models):
+            continue
+        targets.append((path, internal_view(path), False))
+    return targets
+
+
+def warm_endpoints(hosts=None, scheme=None, pages=1, page_sizes=(), models=None, refresh=False):
+    """
+    Render public endpoints into the cache, yielding a ``WarmResult`` per request.
+
+    Page 1 is requested without a ``page`` parameter, exactly like the
+    frontend does. Further pages are only requested while the previous page
+    reports a ``next`` link.
+
+    Args:
+        hosts: Hosts to build requests for (default: ``default_hosts()``)
+        scheme: 'http' or 'https' (default: ``default_scheme()``)
+        pages: Number of pages to warm per page size
+        page_sizes: Extra ``page_size`` values to warm besides the default
+        models: Restrict warming to endpoints built from these models
+        refresh: Re-render and store responses that are already cached
+            (``elapsed_ms`` is then always a render time)
+    """
+    factory = RequestFactory()
+    hosts = hosts or default_hosts()
+    secure = (scheme or default_scheme()) == 'https'
+    sizes = [None] + [size for size in page_sizes if size]
+    meta = {REFRESH_FLAG: True} if refresh else {}
+
+    for path, view, sizable in warm_targets(models):
+        for host in hosts:
+            for size in (sizes if sizable else [None]):
+                for page in range(1, pages + 1):
+                    params = {}
+                    if size:
+                        params['page_size'] = size
+                    if page > 1:
+                        params['page'] = page
+                    request = factory.get(path, params, HTTP_HOST=host, secure=secure, **meta)
+                    started = time.perf_counter()
+                    response = view(request)
+                    if hasattr(response, 'render'):
+                        response.render()
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    yield WarmResult(request.get_full_path(), host, response.status_code, elapsed_ms)
+                    if not _has_next_page(response):
+                        break
+
+
+def _has_next_page(response):
+    """True when ``response`` is a paginated page with a ``next`` link."""
+    if response.status_code != 200:
+        return False
+    payload = json.loads(response.content)
+    return isinstance(payload, dict) and bool(payload.get('next'))
+
+
+# =============================================================================
+# BACKGROUND WARMING
+# =============================================================================
+
+_state_lock = threading.Lock()
+_pending = set()
+_running = False
+_ALL = object()
+
+
+def warm_in_background(models=None):
+    """
+    Re-warm endpoints for ``models`` (or everything) on a daemon thread.
+
+    Bursts of invalidations are coalesced: while a warm is running, further
+    calls only add to the pending set, which the running thread drains.
+    """
+    global _running
+    with _state_lock:
+        _pending.update(models if models else [_ALL])
+        if _running:
+            return
+        _running = True
+    threading.Thread(target=_drain, name='cache-warmer', daemon=True).start()
+
+
+def _drain():
+    global _running
+    while True:
+        with _state_lock:
+            if not _pending:
+                _running = False
+                break
+            models = None if _ALL in _pending else set(_pending)
+            _pending.clear()
+        try:
+            results = list(warm_endpoints(models=models))
+            logger.info("Warmed %d cached responses", len(results))
+        except Exception:
+            logger.exception("Cache warming failed")
+    close_old_connections()
+
+
+# =============================================================================
+# STALE-WHILE-REVALIDATE REFRESHES
+# =============================================================================
+
+# Small fixed pool: refreshes are rare (one per stale entry) and must not
+# compete with request handling for the worker's CPU.
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+
+
+def refresh_in_background(full_path, host, secure, meta=None, on_done=None):
+    """
+    Re-render ``full_path`` on a background thread.
+
+    Args:
+        full_path: Path including the query string
+        host: Host header the original request used
+        secure: Whether the original request was HTTPS
+        meta: Extra WSGI environ entries for the internal request
+        on_done: Called (on the background thread) when rendering finished
+            or failed
+    """
+    def _refresh():
+        try:
+            request = RequestFactory().get(full_path, HTTP_HOST=host, secure=secure, **(meta or {}))
+            response = internal_view(request.path)(request)
+            if hasattr(response, 'render'):
+                response.render()
+        except Exception:
+            logger.exception("Background refresh of %s failed", full_path)
+        finally:
+            if on_done is not None:
+                on_done()
+            close_old_connections()
+
+    _refresh_executor.submit(_refresh)
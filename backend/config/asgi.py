@@ -3,6 +3,14 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is the application served in production (gunicorn with uvicorn workers,
+see ``start.sh``): besides the regular API it streams live stream status as
+Server-Sent Events (``/api/livestream/events/``), which needs an async server.
+
+Sync views keep running in threads, one per request: Django's ASGIHandler
+gives each request its own ``ThreadSensitiveContext``, so a slow request
+does not hold up the others in its worker. SSE streams hold no thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
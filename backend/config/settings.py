@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import environ
 import dj_database_url
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -69,6 +70,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.analytics.HitRecordingMiddleware',  # buffered request counts for the dashboard
 ]
 
 REST_FRAMEWORK = {
@@ -85,7 +87,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',  # orjson when installed
     ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
@@ -93,7 +95,9 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        'suggest': '2000/hour',  # search box type-ahead (api/sermons/suggest/)
+        'pageview': '2000/hour',  # frontend page-view beacon (api/analytics/hit/)
     }
 }
 
@@ -153,25 +157,69 @@ except Exception:
     }
 
 # Caching configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        # For production, use Redis:
-        # 'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        # 'LOCATION': env('REDIS_URL', default='redis://127.0.0.1:6379/1'),
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-        },
-        'TIMEOUT': 300,  # 5 minutes default
+# All gunicorn workers on a host must share one cache, otherwise every worker
+# renders its own copy of each page and invalidations only reach one worker.
+# Redis is used when REDIS_URL is set (docker-compose); otherwise entries live
+# in a shared SQLite file in WAL mode (api/cache_backends.py).
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,  # 5 minutes default
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'api.cache_backends.SQLiteCache',
+            'LOCATION': env('CACHE_LOCATION', default=os.path.join(tempfile.gettempdir(), 'newgate-cache.sqlite3')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 5000,
+                'CULL_FREQUENCY': 4,
+            },
+            'TIMEOUT': 300,  # 5 minutes default
+        }
     }
-}
 
 # Cache time settings
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 300
 CACHE_MIDDLEWARE_KEY_PREFIX = 'newgate'
 
+# Cache warming (python manage.py warm_cache, gunicorn.conf.py)
+# Hosts public requests arrive on; cache keys include the host.
+CACHE_WARM_HOSTS = env.list('CACHE_WARM_HOSTS', default=[])
+# Warm the cache when workers boot, and re-warm endpoints after edits.
+CACHE_WARM_ON_STARTUP = env.bool('CACHE_WARM_ON_STARTUP', default=True)
+CACHE_WARM_AFTER_INVALIDATION = env.bool('CACHE_WARM_AFTER_INVALIDATION', default=True)
+
+# Paginated list counts (api/pagination.py)
+# On PostgreSQL, unfiltered lists of tables the planner estimates above this
+# many rows report the estimate instead of running COUNT(*). 0 disables.
+PAGINATION_ESTIMATE_COUNT_ABOVE = env.int('PAGINATION_ESTIMATE_COUNT_ABOVE', default=0)
+
+# Request analytics (api/analytics.py)
+# Buffered hits are written to the daily rollups this often (seconds), or
+# sooner once this many are waiting in a worker.
+ANALYTICS_FLUSH_INTERVAL = env.int('ANALYTICS_FLUSH_INTERVAL', default=30)
+ANALYTICS_FLUSH_THRESHOLD = env.int('ANALYTICS_FLUSH_THRESHOLD', default=1000)
+
+# Contact form ingestion (api/journal.py)
+# 'direct' inserts each submission; 'journal' acknowledges it from a durable
+# local journal and inserts submissions in batches shortly after.
+CONTACT_INGEST_MODE = env.str('CONTACT_INGEST_MODE', default='direct')
+CONTACT_JOURNAL_PATH = env.str('CONTACT_JOURNAL_PATH', default=str(BASE_DIR / 'contact_journal.sqlite3'))
+# Seconds to collect a burst of submissions before inserting them.
+CONTACT_JOURNAL_FLUSH_DELAY = env.float('CONTACT_JOURNAL_FLUSH_DELAY', default=1.0)
+
+# Contact message archive (api/archive.py, manage.py archive_contact_messages)
+# Read messages older than this many days move to the archive table;
+# archived ones older than the retention are deleted (0 keeps them).
+CONTACT_ARCHIVE_AFTER_DAYS = env.int('CONTACT_ARCHIVE_AFTER_DAYS', default=180)
+CONTACT_ARCHIVE_RETENTION_DAYS = env.int('CONTACT_ARCHIVE_RETENTION_DAYS', default=0)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -218,6 +266,9 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Scheme and host media URLs are built with (e.g. https://cdn.example.org);
+# default: the host of each request.
+MEDIA_ORIGIN = env('MEDIA_ORIGIN', default='')
 
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[])
 CORS_ALLOW_CREDENTIALS = True
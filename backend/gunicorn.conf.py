@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for the New Gate Chapel backend.
+
+Picked up automatically when gunicorn is started from this directory.
+Command-line flags (e.g. ``--workers`` in the Dockerfile) take precedence.
+"""
+
+
+def post_worker_init(worker):
+    """
+    Start the background work of each freshly booted worker.
+
+    Warms the cache: after a deploy the shared cache starts empty, so the
+    first visitors would otherwise pay for every render. Once one worker has
+    warmed it, the others only see cache hits, so repeated warming is cheap;
+    with a per-process backend (LocMemCache) every worker fills its own copy.
+
+    Starts the thread that writes buffered request analytics, and in
+    journal ingestion mode delivers contact submissions left in the journal
+    by a previous worker.
+    """
+    from django.conf import settings
+
+    if getattr(settings, 'CACHE_WARM_ON_STARTUP', False):
+        from api.warming import warm_in_background
+        warm_in_background()
+
+    from api.analytics import hit_buffer
+    hit_buffer.start()
+
+    # Deliver contact submissions journaled before a restart or crash.
+    from api.journal import journal_enabled, journal_flusher
+    if journal_enabled():
+        journal_flusher.notify()
+
+
+def worker_exit(server, worker):
+    """Write the worker's buffered request analytics before it exits."""
+    from api.analytics import hit_buffer
+
+    hit_buffer.flush()
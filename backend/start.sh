@@ -14,5 +14,7 @@ fi
 python manage.py seed_initial_data
 python manage.py populate_data
 
-# Start Gunicorn
-gunicorn config.wsgi:application
+# Start Gunicorn with ASGI workers (live status is streamed over SSE);
+# each worker warms its cache on boot, see gunicorn.conf.py.
+# Set WEB_CONCURRENCY to about the number of CPU cores (see DEPLOYMENT.md).
+gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker --workers "${WEB_CONCURRENCY:-3}"
@@ -29,6 +29,7 @@ import { AuthProvider } from './hooks/useAuth';
 import ProtectedRoute from './components/common/ProtectedRoute';
 import BackgroundBlobs from './components/common/BackgroundBlobs';
 import ScrollToTop from './components/common/ScrollToTop';
+import PageViewTracker from './components/common/PageViewTracker';
 import Loader from './components/Loader';
 import { useLoader } from './hooks/useLoader';
 import { HelmetProvider } from 'react-helmet-async';
@@ -87,6 +88,7 @@ const router = createBrowserRouter([
       <Layout>
         <BackgroundBlobs />
         <ScrollToTop />
+        <PageViewTracker />
         <Suspense fallback={<PageLoader />}>
           <Outlet />
         </Suspense>
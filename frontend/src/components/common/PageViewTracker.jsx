@@ -0,0 +1,19 @@
+import { useEffect } from 'react';
+import { useLocation } from 'react-router-dom';
+import api from '../../services/api.js';
+
+/**
+ * Reports each public page view to the backend's buffered analytics
+ * (shown as visitor trends on the admin dashboard).
+ */
+const PageViewTracker = () => {
+  const { pathname } = useLocation();
+
+  useEffect(() => {
+    api.recordPageView(pathname);
+  }, [pathname]);
+
+  return null;
+};
+
+export default PageViewTracker;
@@ -52,18 +52,18 @@ const About = () => {
   const [loading, setLoading] = useState(true);
 
   /**
-   * Fetches about page data on component mount.
+   * Fetches about page data on component mount via the about page bundle.
    * Includes values (with icon mapping), leadership, and church info.
    */
   useEffect(() => {
     const fetchData = async () => {
       setLoading(true);
       try {
-        const [valuesData, leadershipData, infoData] = await Promise.all([
-          api.getValues(),
-          api.getLeadership(),
-          api.getChurchInfo()
-        ]);
+        const {
+          values: valuesData,
+          leadership: leadershipData,
+          church_info: infoData
+        } = await api.getPageBundle('about');
         
         // Map values with dynamic icons from backend
         const mappedValues = (valuesData?.results || valuesData || []).map(v => ({
@@ -32,7 +32,7 @@ const Events = () => {
   useEffect(() => {
     const fetchEvents = async () => {
       try {
-        const data = await api.getEvents();
+        const data = await api.getEvents({ upcoming: true, ordering: 'date' });
         const eventsList = data?.results || data || [];
         if (eventsList.length > 0) {
           setEvents(eventsList);
@@ -41,15 +41,15 @@ const Giving = () => {
 
   /**
    * Fetches giving options and church information on component mount.
-   * Uses Promise.all for parallel API calls to improve performance.
+   * Uses the giving page bundle so both arrive in a single request.
    */
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [optionsData, infoData] = await Promise.all([
-          api.getGivingOptions(),
-          api.getChurchInfo()
-        ]);
+        const {
+          giving_options: optionsData,
+          church_info: infoData
+        } = await api.getPageBundle('giving');
 
         // Handle paginated or array response for options
         if (optionsData && optionsData.results) setOptions(optionsData.results);
@@ -57,9 +57,9 @@ const Home = () => {
   const [upcomingEvents, setUpcomingEvents] = useState([]);
 
   /**
-   * Fetches all homepage data on component mount.
+   * Fetches all homepage data on component mount via the home page bundle.
    * 
-   * Data fetched:
+   * Data fetched (single request):
    * - Live stream status to show/hide live banner
    * - Church info for hero section customization
    * - Features for "Why Choose" section
@@ -70,12 +70,12 @@ const Home = () => {
   useEffect(() => {
     const fetchHomeData = async () => {
       try {
-        const [liveData, infoData, featuresData, eventsData] = await Promise.all([
-          api.getLiveStream(),
-          api.getChurchInfo(),
-          api.getHomeFeatures(),
-          api.getEvents()
-        ]);
+        const {
+          livestream: liveData,
+          church_info: infoData,
+          home_features: featuresData,
+          events: eventsData
+        } = await api.getPageBundle('home');
 
         // Process live stream data
         if (liveData && (liveData.results || liveData).length > 0) {
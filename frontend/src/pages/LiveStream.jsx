@@ -10,7 +10,8 @@
  * - Recent streams archive section
  * 
  * Data Sources:
- * - Live stream status from `/api/livestream/`
+ * - Live stream status from `/api/livestream/`, then pushed live from
+ *   `/api/livestream/events/` (polling fallback, see api.subscribeLiveStream)
  * - Service schedule from `/api/service-schedule/`
  * 
  * @component
@@ -38,7 +39,8 @@ const LiveStream = () => {
 
   /**
    * Fetches live stream and schedule data on component mount.
-   * Determines if stream is live and shows appropriate UI.
+   * Determines if stream is live and shows appropriate UI, then
+   * subscribes to status changes for as long as the page is open.
    */
   useEffect(() => {
     const fetchLiveStreamData = async () => {
@@ -80,6 +82,22 @@ const LiveStream = () => {
     };
 
     fetchLiveStreamData();
+
+    // Go live (or offline) as soon as the status changes, without a reload
+    const unsubscribe = api.subscribeLiveStream((streams) => {
+      const activeStream = streams[0];
+      if (!activeStream) return;
+      setIsLive(activeStream.status === 'live' || activeStream.is_live);
+      setStreamUrl(convertToEmbedUrl(activeStream.embed_url || ''));
+      if (activeStream.title) {
+        setNextService({
+          title: activeStream.title,
+          day: activeStream.date || '',
+          time: activeStream.description || ''
+        });
+      }
+    });
+    return unsubscribe;
   }, []);
 
   /**
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Row, Col, Card, Table, Button, Badge, Modal, Form } from 'react-bootstrap';
-import { FaEye, FaTrash, FaEnvelopeOpen, FaEnvelope, FaExclamationCircle } from 'react-icons/fa';
+import { FaEye, FaTrash, FaEnvelopeOpen, FaEnvelope, FaExclamationCircle, FaArchive } from 'react-icons/fa';
 import { motion, AnimatePresence } from 'framer-motion';
 import api from '../../../services/api';
 import SEO from '../../../components/common/SEO';
@@ -85,6 +85,37 @@ const MessagesManagement = () => {
     }
   };
 
+  const handleMarkAllRead = async () => {
+    try {
+      await api.bulkContactMessages('mark_read', { filter: { is_read: false } });
+      setMessages(messages.map(m => ({ ...m, is_read: true })));
+    } catch (err) {
+      console.error('Failed to mark messages as read', err);
+    }
+  };
+
+  const handleDeleteRead = async () => {
+    if (window.confirm('Delete all messages that have been read?')) {
+      try {
+        await api.bulkContactMessages('delete', { filter: { is_read: true } });
+        setMessages(messages.filter(m => !m.is_read));
+      } catch (err) {
+        console.error('Failed to delete read messages', err);
+      }
+    }
+  };
+
+  const handleArchiveRead = async () => {
+    if (window.confirm('Move all read messages to the archive?')) {
+      try {
+        await api.bulkContactMessages('archive', { filter: { is_read: true } });
+        setMessages(messages.filter(m => !m.is_read));
+      } catch (err) {
+        console.error('Failed to archive read messages', err);
+      }
+    }
+  };
+
   if (loading) {
     return (
       <div className="d-flex justify-content-center align-items-center" style={{ height: '400px' }}>
@@ -104,9 +135,20 @@ const MessagesManagement = () => {
           <h2 className="fw-bold mb-1 text-white">Guest Inquiries</h2>
           <p className="text-white opacity-50 small mb-0">Manage messages from your website's contact form.</p>
         </div>
-        <Button variant="outline-primary" onClick={fetchMessages} className="glass-panel text-white hover-lift">
-          Refresh Inbox
-        </Button>
+        <div className="d-flex gap-2">
+          <Button variant="outline-primary" onClick={handleMarkAllRead} className="glass-panel text-white hover-lift">
+            <FaEnvelopeOpen className="me-2" />Mark All Read
+          </Button>
+          <Button variant="outline-secondary" onClick={handleArchiveRead} className="glass-panel text-white hover-lift">
+            <FaArchive className="me-2" />Archive Read
+          </Button>
+          <Button variant="outline-danger" onClick={handleDeleteRead} className="glass-panel text-white hover-lift">
+            <FaTrash className="me-2" />Delete Read
+          </Button>
+          <Button variant="outline-primary" onClick={fetchMessages} className="glass-panel text-white hover-lift">
+            Refresh Inbox
+          </Button>
+        </div>
       </div>
 
       {error && (
@@ -128,18 +128,20 @@ export default {
     },
     // Events
     /**
-     * Fetches all events with caching.
+     * Fetches events with caching, optionally filtered on the server.
+     * @param {object} [params] - Query filters, e.g. { upcoming: true, category: 'Youth', ordering: 'date' }.
      * @returns {Promise<Array>}
      */
-    getEvents: async () => {
-        const cacheKey = 'events_all';
+    getEvents: async (params = {}) => {
+        const query = new URLSearchParams(params).toString();
+        const cacheKey = query ? `events_${query}` : 'events_all';
         const cached = apiCache.get(cacheKey);
 
         if (cached && !cached.isStale) {
             return cached.data;
         }
 
-        const response = await api.get('/events/');
+        const response = await api.get('/events/', { params });
         apiCache.set(cacheKey, response.data, 300000); // Cache for 5 minutes
         return response.data;
     },
@@ -215,6 +217,21 @@ export default {
         return response.data;
     },
 
+    /**
+     * Fetches type-ahead suggestions (titles, speakers, series) for a search box.
+     * Much cheaper than searching the sermon list on every keystroke.
+     * @param {string} query - The text typed so far
+     * @param {number} [limit=8] - Maximum number of suggestions (1-20)
+     * @returns {Promise<Array>} Array of { type, value, count } objects
+     */
+    suggestSermons: async (query, limit = 8) => {
+        if (!query.trim()) {
+            return [];
+        }
+        const response = await api.get('/sermons/suggest/', { params: { q: query, limit } });
+        return response.data.results;
+    },
+
     /**
      * Creates a new sermon.
      * @param {object} data - The sermon data
@@ -355,6 +372,54 @@ export default {
         apiCache.set(cacheKey, response.data, 60000); // Cache for 1 minute (live status changes)
         return response.data;
     },
+    /**
+     * Subscribes to live stream status changes.
+     * Uses the Server-Sent Events stream (`/livestream/events/`) and falls back
+     * to polling `/livestream/` if the stream is unavailable.
+     * @param {function} onUpdate - Called with the list of stream configurations.
+     * @param {number} [pollInterval=30000] - Fallback polling interval in ms.
+     * @returns {function} Unsubscribe function.
+     */
+    subscribeLiveStream: (onUpdate, pollInterval = 30000) => {
+        let pollTimer = null;
+        let source = null;
+
+        const deliver = (streams) => {
+            apiCache.set('livestream_status', { results: streams }, 60000);
+            onUpdate(streams);
+        };
+
+        const startPolling = () => {
+            if (pollTimer) return;
+            pollTimer = setInterval(async () => {
+                try {
+                    const response = await api.get('/livestream/');
+                    deliver(response.data.results || response.data);
+                } catch (error) {
+                    // Keep polling; the next tick may succeed
+                }
+            }, pollInterval);
+        };
+
+        if (typeof EventSource === 'undefined') {
+            startPolling();
+        } else {
+            source = new EventSource(`${API_BASE_URL}/livestream/events/`);
+            source.onmessage = (event) => deliver(JSON.parse(event.data));
+            source.onerror = () => {
+                // Transient drops reconnect on their own; a closed stream
+                // (e.g. 503 from a WSGI server) means polling from now on.
+                if (source.readyState === EventSource.CLOSED) {
+                    startPolling();
+                }
+            };
+        }
+
+        return () => {
+            if (source) source.close();
+            if (pollTimer) clearInterval(pollTimer);
+        };
+    },
     /**
      * Creates/Updates live stream configuration.
      * @param {object} data - The stream data.
@@ -494,11 +559,40 @@ export default {
         await api.delete(`/home-features/${id}/`);
     },
 
+    // Page Bundles
+    /**
+     * Fetches everything a public page needs in a single request.
+     * Bundles exist for 'home', 'about' and 'giving'; each key in the
+     * response mirrors the matching list endpoint (e.g. church_info, events).
+     * @param {string} page - The page name.
+     * @returns {Promise<object>}
+     */
+    getPageBundle: async (page) => {
+        const cacheKey = `bundle_${page}`;
+        const cached = apiCache.get(cacheKey);
+
+        if (cached && !cached.isStale) {
+            return cached.data;
+        }
+
+        const response = await api.get(`/bundles/${page}/`);
+        apiCache.set(cacheKey, response.data, 60000); // Cache for 1 minute (server invalidates on change)
+        return response.data;
+    },
+
     // Analytics
     getAnalytics: async () => {
         const response = await api.get('/analytics/');
         return response.data;
     },
+    /**
+     * Reports a public page view for the dashboard's visitor trends.
+     * Failures are ignored; analytics must never break navigation.
+     * @param {string} path - The page path, e.g. '/sermons'
+     */
+    recordPageView: (path) => {
+        api.post('/analytics/hit/', { path }).catch(() => {});
+    },
 
     // Contact
     /**
@@ -513,10 +607,11 @@ export default {
 
     /**
      * Fetches all contact form messages (Admin only).
+     * @param {object} [params] - Query parameters, e.g. { search: 'smith', include_archived: true }.
      * @returns {Promise<Array>}
      */
-    getContactMessages: async () => {
-        const response = await api.get('/contact-messages/');
+    getContactMessages: async (params = {}) => {
+        const response = await api.get('/contact-messages/', { params });
         // Handle pagination response structure
         return response.data.results || response.data;
     },
@@ -541,6 +636,17 @@ export default {
         await api.delete(`/contact-messages/${id}/`);
     },
 
+    /**
+     * Applies one action to many contact messages in a single request.
+     * @param {string} action - 'mark_read', 'mark_unread', 'delete' or 'archive'.
+     * @param {object} selection - Either { ids: [...] } or { filter: { is_read, email, created_after, created_before } }.
+     * @returns {Promise<object>} { action, affected, unread }
+     */
+    bulkContactMessages: async (action, selection) => {
+        const response = await api.post('/contact-messages/bulk/', { action, ...selection });
+        return response.data;
+    },
+
     // Cache Management Utilities
     /**
      * Invalidates the ministries cache to force fresh data fetch